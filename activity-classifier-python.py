@@ -0,0 +1,116 @@
+"""
+SHARED ACTIVITY CLASSIFIER (PYTHON)
+Single source of the activity keyword tables and classifier used by the Python
+engines of Phase 3 (faculty assignment), Phase 7 (Phase7Validator) and Phase 8
+(EmergencyCoverageEngine.assess_criticality).
+
+n8n Code nodes cannot import repository files, so the block between the
+SHARED ACTIVITY CLASSIFIER markers below is pasted verbatim into:
+- phase3-enhanced-faculty-assignment-python.py
+- workflows/archive/phase7-python-powered.json ("Python Validation Engine")
+- workflows/archive/phase8-python-powered-orchestrator-compatible.json
+  ("Python Emergency Coverage Engine")
+tests/archive/test_activity_classifier.py fails if any copy drifts.
+
+    python activity-classifier-python.py "Vasectomy Clinic" "FM Inpatient"
+
+Dependencies: None (uses only Python standard library)
+"""
+
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Optional, Sequence, Tuple
+
+# -----------------------------------------------------------------------------
+# SHARED ACTIVITY CLASSIFIER (source: activity-classifier-python.py)
+# -----------------------------------------------------------------------------
+# Uses re, functools.lru_cache and typing Any, Optional, Sequence, Tuple,
+# imported at the top of each file that carries this block
+
+# Distinct activity strings are few (a few dozen per year); the bound only
+# guards against free-text activities growing the cache without limit
+ACTIVITY_CACHE_SIZE = 1024
+
+# Rule tables: (label, keywords) in priority order. The first rule with any
+# keyword contained in the activity (case-insensitive) wins.
+ACTIVITY_TYPE_RULES = (
+    ('procedure', ('procedure', 'vasectomy', 'botox')),
+    ('clinic', ('clinic', 'continuity')),
+    ('inpatient', ('inpatient', 'hospital'))
+)
+
+DUTY_CATEGORY_RULES = (
+    ('sports', ('sports medicine',)),
+    ('clinic', ('clinic', 'continuity')),
+    ('gme', ('conference', 'education', 'didactic', 'grand rounds')),
+    ('dfm', ('admin', 'leadership'))
+)
+
+# CRITICAL services need 24/7/365 coverage
+CRITICALITY_RULES = (
+    ('CRITICAL', ('family medicine inpatient', 'inpatient team', 'overnight call',
+                  'emergency', 'procedure', 'surgery', 'trauma')),
+    ('HIGH', ('clinic', 'continuity', 'specialty')),
+    ('MEDIUM', ('conference', 'education', 'didactic', 'grand rounds'))
+)
+
+
+class ActivityClassifier:
+    """
+    Keyword classifier compiled into one regex, memoized per activity string.
+
+    Every keyword becomes an alternative inside a lookahead, ordered by rule
+    priority, so a single finditer() pass sees the best rule matching at each
+    position (including overlapping keywords). Results are cached with an LRU
+    bound.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]], default: Any = None,
+                 cache_size: Optional[int] = ACTIVITY_CACHE_SIZE):
+        self.labels = [label for label, _ in rules]
+        self.default = default
+        self._priority = {}
+        alternatives = []
+        for priority, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), priority)
+                alternatives.append(re.escape(keyword.lower()))
+        self._pattern = re.compile('(?=(' + '|'.join(alternatives) + '))', re.IGNORECASE) if alternatives else None
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, activity: Optional[str]) -> Any:
+        if not activity or self._pattern is None:
+            return self.default
+        best = None
+        for match in self._pattern.finditer(activity):
+            priority = self._priority[match.group(1).lower()]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+        return self.default if best is None else self.labels[best]
+
+    def cache_info(self):
+        """functools cache statistics (hits, misses, maxsize, currsize)."""
+        return self.classify.cache_info()
+
+
+# -----------------------------------------------------------------------------
+# END SHARED ACTIVITY CLASSIFIER
+# -----------------------------------------------------------------------------
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    activity_types = ActivityClassifier(ACTIVITY_TYPE_RULES, default='clinic')
+    duty_categories = ActivityClassifier(DUTY_CATEGORY_RULES)
+    criticality = ActivityClassifier(CRITICALITY_RULES, default='LOW')
+
+    for activity in argv or []:
+        print(f'{activity!r}: type={activity_types.classify(activity)}, '
+              f'duty={duty_categories.classify(activity)}, '
+              f'criticality={criticality.classify(activity)}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,898 @@
+"""
+AIRTABLE BULK WRITER (PYTHON)
+Rate-limited bulk create/update stage for Airtable, replacing the fixed
+"Batch Records" (10 items) -> "Wait (Rate Limiting)" (1 s) -> one-record POST
+chain that phase3-processing-subworkflow.json used to write faculty
+assignments with (3,000 assignments spent over five minutes sleeping).
+
+- Records are packed 10 per request (Airtable's per-request maximum)
+- A token bucket keeps requests at Airtable's 5 requests/second per base
+- Requests are pipelined over a thread pool, so latency overlaps the rate limit
+- 429 and 5xx responses (and network errors) are retried with full-jitter
+  exponential backoff, honouring Retry-After when Airtable sends it
+
+Write time is bounded by the rate limit: ceil(records / 10) / 5 seconds.
+
+Reruns go through the diff writer (sync): the target records are listed once,
+matched to the desired records by logical key (halfDayId, facultyId for
+faculty assignments) and content hash, and only the creates, updates and
+deletes for what changed are sent - a rerun after one leave change writes
+tens of records instead of re-creating thousands.
+
+AirtableStub is a local Airtable-compatible HTTP server (list, create, update,
+upsert and delete, 10-record limit, per-base rate limit, injected failures)
+for tests and the benchmark below, so nothing here needs a real base:
+
+    python airtable-bulk-writer-python.py            # 500 records against the stub
+    python airtable-bulk-writer-python.py 3000       # custom size
+
+n8n Code nodes have no network access, so inside the workflow the same
+diff, packing and rate are applied by the "Diff Airtable Assignments" and
+"Pack Airtable Batches" nodes and the batching option of the HTTP Request node.
+
+Dependencies: None (uses only Python standard library)
+"""
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+import hashlib
+import json
+import re
+import math
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+AIRTABLE_API_URL = 'https://api.airtable.com/v0'
+MAX_RECORDS_PER_REQUEST = 10
+PAGE_SIZE = 100
+REQUESTS_PER_SECOND = 5
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Legacy n8n chain: one record per POST, 1 s wait per batch of 10 items
+LEGACY_BATCH_SIZE = 10
+LEGACY_WAIT_SECONDS = 1.0
+
+
+# =============================================================================
+# RATE LIMITING AND RETRIES
+# =============================================================================
+
+def chunk_records(records: List[Dict], size: int = MAX_RECORDS_PER_REQUEST) -> List[List[Dict]]:
+    """Split records into request-sized batches, keeping their order."""
+    return [records[start:start + size] for start in range(0, len(records), size)]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: rate tokens per second, at most capacity banked.
+
+    capacity defaults to 1 so requests are spaced evenly (1 / rate apart); a
+    full bucket of rate tokens would allow a burst of up to 2 x rate requests
+    in the first second.
+    """
+
+    # Refills are float sums, so a full token can come out as 0.9999999999999998;
+    # without the tolerance a fake clock would never advance far enough
+    EPSILON = 1e-9
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1 - self.EPSILON:
+                self.tokens = max(0.0, self.tokens - 1)
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1 - self.EPSILON:
+                    self.tokens = max(0.0, self.tokens - 1)
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(max(wait, self.EPSILON))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0,
+                  retry_after: Optional[float] = None, rng: Optional[random.Random] = None) -> float:
+    """Full-jitter exponential backoff for retry attempt 0, 1, ...; never shorter than Retry-After."""
+    delay = (rng or random).uniform(0, min(cap, base * 2 ** attempt))
+    return max(delay, retry_after) if retry_after is not None else delay
+
+
+# =============================================================================
+# BULK WRITER
+# =============================================================================
+
+Response = Tuple[int, Dict[str, str], Dict[str, Any]]
+
+
+class AirtableError(RuntimeError):
+    """A request that still failed after its retries."""
+
+    def __init__(self, status: int, payload: Dict[str, Any]):
+        super().__init__(f'Airtable request failed with status {status}: {payload.get("error")}')
+        self.status = status
+        self.payload = payload
+
+
+def urllib_send(method: str, url: str, token: str, body: Optional[Dict], timeout: float) -> Response:
+    """Send one JSON request; returns (status, headers, payload) for HTTP errors too."""
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, method=method, headers={
+        'Authorization': f'Bearer {token}',
+        'Content-Type': 'application/json'
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, dict(response.headers), json.loads(response.read() or b'{}')
+    except urllib.error.HTTPError as error:
+        try:
+            payload = json.loads(error.read() or b'{}')
+        except ValueError:
+            payload = {}
+        return error.code, dict(error.headers), payload
+
+
+class AirtableBulkWriter:
+    """
+    Write records to one Airtable table in 10-record requests at the base's
+    rate limit, pipelined over concurrency threads, retrying 429/5xx.
+    """
+
+    def __init__(self, base_id: str, table: str, token: str, api_url: str = AIRTABLE_API_URL,
+                 rate: float = REQUESTS_PER_SECOND, concurrency: int = REQUESTS_PER_SECOND,
+                 max_retries: int = 5, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 typecast: bool = False, timeout: float = 30.0,
+                 send: Callable[..., Response] = urllib_send, seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.url = f'{api_url.rstrip("/")}/{base_id}/{table}'
+        self.token = token
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate, clock=clock, sleep=sleep)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.typecast = typecast
+        self.timeout = timeout
+        self.send = send
+        self.rng = random.Random(seed)
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def create(self, records: List[Dict]) -> Dict[str, Any]:
+        """Create records (field dicts, or {'fields': ...} items)."""
+        return self.write(records, method='POST')
+
+    def update(self, records: List[Dict]) -> Dict[str, Any]:
+        """Update records given as {'id': ..., 'fields': ...}."""
+        return self.write(records, method='PATCH')
+
+    def upsert(self, records: List[Dict], merge_on: Sequence[str]) -> Dict[str, Any]:
+        """
+        Update-or-create with performUpsert: records with an id are updated,
+        the rest are matched on the merge_on fields (which must identify one
+        record and cannot be linked-record fields) or created.
+        """
+        return self.write(records, method='PATCH', merge_on=merge_on)
+
+    def delete(self, record_ids: Iterable[str]) -> Dict[str, Any]:
+        """Delete records by id, 10 per request."""
+        return self._run(chunk_records(list(record_ids)), lambda batch: self._request(
+            'DELETE', f'{self.url}?{urlencode([("records[]", record_id) for record_id in batch])}', None))
+
+    def list_records(self, filter_formula: Optional[str] = None,
+                     fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Every record matching filter_formula, following Airtable's pagination offset."""
+        records, offset = [], None
+        self._reset_stats()
+        while True:
+            params = [('pageSize', str(PAGE_SIZE))]
+            if filter_formula:
+                params.append(('filterByFormula', filter_formula))
+            params.extend(('fields[]', name) for name in fields or ())
+            if offset:
+                params.append(('offset', offset))
+
+            status, payload = self._request('GET', f'{self.url}?{urlencode(params)}', None)
+            if not 200 <= status < 300:
+                raise AirtableError(status, payload)
+            records.extend(payload.get('records', []))
+            offset = payload.get('offset')
+            if not offset:
+                return records
+
+    def sync(self, desired: List[Dict], key_fields: Sequence[str], filter_formula: Optional[str] = None,
+             merge_on: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Make the records matching filter_formula equal to desired: list them
+        once, plan_diff them against desired by key_fields and send only the
+        creates, updates and deletes. With merge_on, creates and updates go
+        out together as performUpsert requests, so a create that races
+        another writer updates its record instead of duplicating it.
+        """
+        started = time.perf_counter()
+        existing = self.list_records(filter_formula, fields=None)
+        listed = self.stats['requests']
+        plan = plan_diff(desired, existing, key_fields)
+
+        if merge_on:
+            results = [self.upsert(plan['update'] + [{'fields': fields} for fields in plan['create']], merge_on)]
+        else:
+            results = [self.create(plan['create']), self.update(plan['update'])]
+        results.append(self.delete(plan['delete']))
+
+        return {
+            'existing': len(existing),
+            'created': len(plan['create']),
+            'updated': len(plan['update']),
+            'deleted': len(plan['delete']),
+            'unchanged': plan['unchanged'],
+            'failed': [batch for result in results for batch in result['failed']],
+            'requests': listed + sum(result['requests'] for result in results),
+            'seconds': time.perf_counter() - started
+        }
+
+    def write(self, records: List[Dict], method: str = 'POST',
+              merge_on: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Returns {'records': Airtable records in input order, 'failed': batches
+        that ran out of retries, 'requests', 'retries', 'seconds'}.
+        """
+        records = [record if 'fields' in record else {'fields': record} for record in records]
+        return self._run(chunk_records(records), lambda batch: self._send_batch(method, batch, merge_on))
+
+    def _run(self, batches: List[List], send: Callable[[List], Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self._reset_stats()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            results = list(pool.map(send, batches))
+
+        written, failed = [], []
+        for batch, (status, payload) in zip(batches, results):
+            if 200 <= status < 300:
+                written.extend(payload.get('records', []))
+            else:
+                failed.append({'status': status, 'error': payload.get('error'), 'records': batch})
+
+        return {
+            'records': written,
+            'failed': failed,
+            'requests': self.stats['requests'],
+            'retries': self.stats['retries'],
+            'statuses': dict(sorted(self.stats['statuses'].items())),
+            'backoffSeconds': self.stats['delays'],
+            'seconds': time.perf_counter() - started
+        }
+
+    def _reset_stats(self) -> None:
+        self.stats = {'requests': 0, 'retries': 0, 'statuses': {}, 'delays': []}
+
+    def _send_batch(self, method: str, batch: List[Dict],
+                    merge_on: Optional[Sequence[str]] = None) -> Tuple[int, Dict[str, Any]]:
+        body = {'records': batch}
+        if merge_on:
+            body['performUpsert'] = {'fieldsToMergeOn': list(merge_on)}
+        if self.typecast:
+            body['typecast'] = True
+        return self._request(method, self.url, body)
+
+    def _request(self, method: str, url: str, body: Optional[Dict]) -> Tuple[int, Dict[str, Any]]:
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                status, headers, payload = self.send(method, url, self.token, body, self.timeout)
+            except (urllib.error.URLError, OSError) as error:
+                status, headers, payload = 0, {}, {'error': {'type': 'NETWORK_ERROR', 'message': str(error)}}
+
+            with self._stats_lock:
+                self.stats['requests'] += 1
+                self.stats['statuses'][status] = self.stats['statuses'].get(status, 0) + 1
+            if status not in RETRY_STATUSES and status != 0:
+                return status, payload
+            if attempt == self.max_retries:
+                break
+
+            with self._stats_lock:
+                self.stats['retries'] += 1
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap,
+                                      self._retry_after(headers), self.rng)
+                self.stats['delays'].append(delay)
+            self.sleep(delay)
+
+        return status, payload
+
+    @staticmethod
+    def _retry_after(headers: Dict[str, str]) -> Optional[float]:
+        value = next((v for k, v in headers.items() if k.lower() == 'retry-after'), None)
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+# =============================================================================
+# DIFF WRITER
+# =============================================================================
+
+def _is_empty(value: Any) -> bool:
+    # Airtable leaves empty cells (and unchecked checkboxes) out of the records it returns
+    return value is None or value is False or value == '' or value == []
+
+
+def normalize_fields(fields: Dict[str, Any], managed: Iterable[str]) -> Dict[str, Any]:
+    """The managed fields as Airtable reads them back: empty values dropped, 2.0 read as 2."""
+    normalized = {}
+    for name in managed:
+        value = fields.get(name)
+        if _is_empty(value):
+            continue
+        normalized[name] = int(value) if isinstance(value, float) and value.is_integer() else value
+    return normalized
+
+
+def content_hash(fields: Dict[str, Any]) -> str:
+    """Stable hash of already-normalized fields."""
+    canonical = json.dumps(fields, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def record_key(fields: Dict[str, Any], key_fields: Sequence[str]) -> Tuple:
+    """Logical key of a record; linked-record fields contribute their first record id."""
+    key = []
+    for name in key_fields:
+        value = fields.get(name)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        key.append(value)
+    return tuple(key)
+
+
+def plan_diff(desired: List[Dict], existing: List[Dict], key_fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Operations that turn existing Airtable records ({'id', 'fields'}) into the
+    desired records (field dicts, or {'fields': ...}), comparing only the
+    fields the desired records manage.
+
+    Returns {'create': [fields], 'update': [{'id', 'fields'}], 'delete': [ids],
+    'unchanged': count}. A key may hold several records (a faculty member
+    supervising two pools on one half-day): identical ones are matched first,
+    the rest are paired in order as updates, and leftovers are created or
+    deleted, which also removes duplicates left by earlier runs.
+    """
+    desired = [record['fields'] if 'fields' in record else record for record in desired]
+    managed = sorted({name for fields in desired for name in fields})
+
+    existing_by_key = defaultdict(list)
+    for record in existing:
+        existing_by_key[record_key(record.get('fields', {}), key_fields)].append(record)
+    desired_by_key = defaultdict(list)
+    for fields in desired:
+        desired_by_key[record_key(fields, key_fields)].append(fields)
+
+    plan = {'create': [], 'update': [], 'delete': [], 'unchanged': 0}
+    for key, wanted in desired_by_key.items():
+        have = [(record, normalize_fields(record.get('fields', {}), managed))
+                for record in existing_by_key.pop(key, [])]
+        hashes = defaultdict(list)
+        for index, (_, normalized) in enumerate(have):
+            hashes[content_hash(normalized)].append(index)
+
+        matched, pending = set(), []
+        for fields in wanted:
+            normalized = normalize_fields(fields, managed)
+            candidates = hashes.get(content_hash(normalized))
+            if candidates:
+                matched.add(candidates.pop(0))
+                plan['unchanged'] += 1
+            else:
+                pending.append(normalized)
+
+        leftovers = [entry for index, entry in enumerate(have) if index not in matched]
+        for normalized, (record, current) in zip(pending, leftovers):
+            changed = {name: normalized.get(name) for name in managed
+                       if normalized.get(name) != current.get(name)}
+            plan['update'].append({'id': record['id'], 'fields': changed})
+        plan['create'].extend(pending[len(leftovers):])
+        plan['delete'].extend(record['id'] for record, _ in leftovers[len(pending):])
+
+    # Keys nothing wants any more
+    plan['delete'].extend(record['id'] for records in existing_by_key.values() for record in records)
+    return plan
+
+
+# =============================================================================
+# FILTER FORMULAS
+# =============================================================================
+
+class FormulaError(ValueError):
+    """A filterByFormula this evaluator does not support."""
+
+
+_BLANK = object()
+_FORMULA_TOKEN = re.compile(r"\s*(?:(\{[^}]*\})|'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"|(\d+(?:\.\d+)?)"
+                            r"|([A-Z_]+)\s*\(|(!=|>=|<=|[=<>(),]))")
+
+
+def _tokenize(formula: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    formula = formula.strip()
+    while position < len(formula):
+        match = _FORMULA_TOKEN.match(formula, position)
+        if not match:
+            raise FormulaError(f'Unsupported formula at {formula[position:position + 20]!r}')
+        field, single, double, number, function, symbol = match.groups()
+        if field is not None:
+            tokens.append(('field', field[1:-1]))
+        elif single is not None or double is not None:
+            tokens.append(('value', single if single is not None else double))
+        elif number is not None:
+            tokens.append(('value', float(number)))
+        elif function is not None:
+            tokens.append(('call', function))
+        else:
+            tokens.append(('symbol', symbol))
+        position = match.end()
+    return tokens
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    if isinstance(value, str) and value:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    return None
+
+
+def _comparable(value: Any) -> Any:
+    # Airtable compares lookups by their displayed text and checkboxes as 1/0
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _compare(operator: str, left: Any, right: Any) -> bool:
+    if left is _BLANK or right is _BLANK:
+        blank = _is_empty(right if left is _BLANK else left)
+        if operator in ('=', '!='):
+            return blank if operator == '=' else not blank
+        raise FormulaError('BLANK() only supports = and !=')
+    left, right = _comparable(left), _comparable(right)
+    if isinstance(left, (int, float)) != isinstance(right, (int, float)):
+        try:
+            left, right = float(left or 0), float(right or 0)
+        except (TypeError, ValueError):
+            left, right = str(left if left is not None else ''), str(right if right is not None else '')
+    elif left is None or right is None:
+        left, right = left or '', right or ''
+    return {'=': left == right, '!=': left != right, '>': left > right,
+            '<': left < right, '>=': left >= right, '<=': left <= right}[operator]
+
+
+def compile_formula(formula: str, field_ids: Optional[Dict[str, str]] = None) -> Callable[..., bool]:
+    """
+    Evaluate the filterByFormula subset the phase workflows use: field
+    references, strings and numbers, = != < > <= >=, AND/OR/NOT, BLANK(),
+    TRUE()/FALSE() and IS_AFTER/IS_BEFORE with LAST_MODIFIED_TIME(). field_ids
+    maps field ids used in formulas to field names. Returns
+    predicate(fields, modified=None); raises FormulaError for anything else.
+    """
+    field_ids = field_ids or {}
+    tokens = _tokenize(formula.lstrip('='))
+    position = 0
+
+    def expect(symbol: str) -> None:
+        nonlocal position
+        if position >= len(tokens) or tokens[position] != ('symbol', symbol):
+            raise FormulaError(f'Expected {symbol!r} in {formula!r}')
+        position += 1
+
+    def parse_arguments() -> List[Callable]:
+        nonlocal position
+        arguments = []
+        if tokens[position:position + 1] == [('symbol', ')')]:
+            position += 1
+            return arguments
+        while True:
+            arguments.append(parse_expression())
+            if tokens[position:position + 1] == [('symbol', ',')]:
+                position += 1
+                continue
+            expect(')')
+            return arguments
+
+    def parse_primary() -> Callable:
+        nonlocal position
+        if position >= len(tokens):
+            raise FormulaError(f'Unexpected end of {formula!r}')
+        kind, value = tokens[position]
+        position += 1
+        if kind == 'field':
+            name = field_ids.get(value, value)
+            return lambda fields, modified: fields.get(name)
+        if kind == 'value':
+            return lambda fields, modified: value
+        if kind == 'symbol' and value == '(':
+            inner = parse_expression()
+            expect(')')
+            return inner
+        if kind != 'call':
+            raise FormulaError(f'Unexpected {value!r} in {formula!r}')
+
+        arguments = parse_arguments()
+        if value == 'AND':
+            return lambda fields, modified: all(bool(_comparable(a(fields, modified))) for a in arguments)
+        if value == 'OR':
+            return lambda fields, modified: any(bool(_comparable(a(fields, modified))) for a in arguments)
+        if value == 'NOT' and len(arguments) == 1:
+            return lambda fields, modified: not _comparable(arguments[0](fields, modified))
+        if value == 'BLANK':
+            if arguments:
+                return lambda fields, modified: _is_empty(arguments[0](fields, modified))
+            return lambda fields, modified: _BLANK
+        if value in ('TRUE', 'FALSE') and not arguments:
+            return lambda fields, modified: value == 'TRUE'
+        if value == 'LAST_MODIFIED_TIME' and not arguments:
+            return lambda fields, modified: _to_datetime(modified)
+        if value in ('IS_AFTER', 'IS_BEFORE') and len(arguments) == 2:
+            def is_after(fields, modified, after=value == 'IS_AFTER'):
+                left, right = (_to_datetime(a(fields, modified)) for a in arguments)
+                if left is None or right is None:
+                    return False
+                return left > right if after else left < right
+            return is_after
+        raise FormulaError(f'Unsupported function {value}() in {formula!r}')
+
+    def parse_expression() -> Callable:
+        nonlocal position
+        left = parse_primary()
+        if position < len(tokens) and tokens[position][0] == 'symbol' and \
+                tokens[position][1] in ('=', '!=', '>', '<', '>=', '<='):
+            operator = tokens[position][1]
+            position += 1
+            right = parse_primary()
+            return lambda fields, modified: _compare(operator, left(fields, modified), right(fields, modified))
+        return left
+
+    if not tokens:
+        return lambda fields, modified=None: True
+    expression = parse_expression()
+    if position != len(tokens):
+        raise FormulaError(f'Unexpected trailing input in {formula!r}')
+    return lambda fields, modified=None: bool(_comparable(expression(fields, modified)))
+
+
+# =============================================================================
+# LOCAL AIRTABLE STUB
+# =============================================================================
+
+class AirtableStub:
+    """
+    Local Airtable-compatible endpoint at /v0/<base>/<table>: GET lists
+    records in pages (filterByFormula as far as compile_formula goes, with
+    LAST_MODIFIED_TIME() tracked per record), POST creates, PATCH updates or
+    performUpserts and DELETE removes up to 10 records. A token bucket per
+    base (rate_limit requests/second, burst requests banked, default one
+    second's worth) answers 429 above the limit, and fail_first / fail_rate
+    inject 503s. seed() loads records without going through HTTP.
+
+        with AirtableStub() as stub:
+            writer = AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url)
+    """
+
+    def __init__(self, rate_limit: float = REQUESTS_PER_SECOND, latency: float = 0.0,
+                 fail_first: int = 0, fail_rate: float = 0.0, seed: int = 0,
+                 burst: Optional[float] = None, field_ids: Optional[Dict[str, str]] = None):
+        self.rate_limit = rate_limit
+        self.burst = rate_limit if burst is None else burst
+        self.latency = latency
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.field_ids = field_ids or {}
+        self.tables: Dict[Tuple[str, str], Dict[str, Dict]] = {}
+        self.modified: Dict[str, float] = {}
+        self.requests: List[Dict[str, Any]] = []
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._admitted = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v0'
+
+    def start(self) -> 'AirtableStub':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._handle(self, 'GET')
+
+            def do_DELETE(self):
+                stub._handle(self, 'DELETE')
+
+            def do_POST(self):
+                stub._handle(self, 'POST')
+
+            def do_PATCH(self):
+                stub._handle(self, 'PATCH')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'AirtableStub':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def records(self, base_id: str, table: str) -> List[Dict]:
+        return list(self.tables.get((base_id, table), {}).values())
+
+    def seed(self, base_id: str, table: str, records: List[Dict]) -> List[str]:
+        """Store field dicts directly; returns their new record ids."""
+        with self._lock:
+            stored = self.tables.setdefault((base_id, table), {})
+            ids = []
+            for fields in records:
+                ids.append(self._store(stored, None, fields)['id'])
+            return ids
+
+    def _store(self, table: Dict[str, Dict], record_id: Optional[str], fields: Dict[str, Any]) -> Dict:
+        if record_id is None:
+            self._next_id += 1
+            record_id = f'rec{self._next_id:014d}'
+            table[record_id] = {'id': record_id, 'createdTime': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime()),
+                                'fields': {}}
+        stored = table[record_id]
+        # Writing an empty value clears the cell
+        for name, value in fields.items():
+            if _is_empty(value):
+                stored['fields'].pop(name, None)
+            else:
+                stored['fields'][name] = value
+        self.modified[record_id] = time.time()
+        return stored
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        url = urlsplit(handler.path)
+        parts = url.path.strip('/').split('/')
+        query = parse_qs(url.query)
+        body = json.loads(handler.rfile.read(int(handler.headers.get('Content-Length', 0))) or b'{}')
+        base_id = parts[1] if len(parts) == 3 and parts[0] == 'v0' else None
+        records = query.get('records[]', []) if method == 'DELETE' else body.get('records', [])
+
+        with self._lock:
+            self.requests.append({'method': method, 'path': handler.path, 'time': time.monotonic(),
+                                  'records': len(records)})
+            bucket = self._buckets.setdefault(base_id, TokenBucket(self.rate_limit, capacity=self.burst))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if base_id is None:
+            return self._reply(handler, 404, {'error': 'NOT_FOUND'})
+        if not handler.headers.get('Authorization', '').startswith('Bearer '):
+            return self._reply(handler, 401, {'error': {'type': 'AUTHENTICATION_REQUIRED',
+                                                        'message': 'Authentication required'}})
+        if not bucket.try_acquire():
+            return self._reply(handler, 429, {'error': {'type': 'RATE_LIMIT_REACHED',
+                                                        'message': 'Rate limit exceeded'}}, {'Retry-After': '0'})
+
+        # Failures are injected into requests that got past the rate limit
+        with self._lock:
+            self._admitted += 1
+            fail = self._admitted <= self.fail_first or self.rng.random() < self.fail_rate
+        if fail:
+            return self._reply(handler, 503, {'error': {'type': 'SERVICE_UNAVAILABLE',
+                                                        'message': 'Injected failure'}})
+
+        if method == 'GET':
+            return self._list(handler, base_id, parts[2], query)
+        if not records or len(records) > MAX_RECORDS_PER_REQUEST:
+            return self._reply(handler, 422, {'error': {'type': 'INVALID_RECORDS',
+                                                        'message': f'1 to {MAX_RECORDS_PER_REQUEST} records per request'}})
+
+        merge_on = (body.get('performUpsert') or {}).get('fieldsToMergeOn') if method == 'PATCH' else None
+        with self._lock:
+            table = self.tables.setdefault((base_id, parts[2]), {})
+            ids = records if method == 'DELETE' else [record.get('id') for record in records if 'id' in record]
+            if (method in ('PATCH', 'DELETE') and any(record_id not in table for record_id in ids)
+                    or method == 'PATCH' and not merge_on and len(ids) < len(records)):
+                return self._reply(handler, 404, {'error': {'type': 'ROW_DOES_NOT_EXIST',
+                                                            'message': 'Record not found'}})
+            if method == 'DELETE':
+                for record_id in records:
+                    del table[record_id]
+                return self._reply(handler, 200, {'records': [{'id': record_id, 'deleted': True}
+                                                              for record_id in records]})
+
+            written, created = [], []
+            for record in records:
+                record_id = record.get('id')
+                if record_id is None and merge_on:
+                    matches = [stored['id'] for stored in table.values()
+                               if all(stored['fields'].get(name) == record.get('fields', {}).get(name)
+                                      for name in merge_on)]
+                    if len(matches) > 1:
+                        return self._reply(handler, 422, {'error': {'type': 'INVALID_VALUE_FOR_COLUMN',
+                                                                    'message': 'Merge fields match several records'}})
+                    record_id = matches[0] if matches else None
+                stored = self._store(table, record_id, record.get('fields', {}))
+                if record_id is None:
+                    created.append(stored['id'])
+                written.append(json.loads(json.dumps(stored)))
+
+        payload = {'records': written}
+        if merge_on:
+            payload['createdRecords'] = created
+            payload['updatedRecords'] = [record['id'] for record in written if record['id'] not in created]
+        self._reply(handler, 200, payload)
+
+    def _list(self, handler: BaseHTTPRequestHandler, base_id: str, table_id: str,
+              query: Dict[str, List[str]]) -> None:
+        try:
+            matches = compile_formula(query.get('filterByFormula', [''])[0], self.field_ids)
+        except FormulaError as error:
+            return self._reply(handler, 422, {'error': {'type': 'INVALID_FILTER_BY_FORMULA', 'message': str(error)}})
+
+        fields = query.get('fields[]')
+        with self._lock:
+            matching = [record for record in self.tables.get((base_id, table_id), {}).values()
+                        if matches(record['fields'], self.modified.get(record['id']))]
+            start = int(query.get('offset', ['0'])[0])
+            size = min(int(query.get('pageSize', [str(PAGE_SIZE)])[0]), PAGE_SIZE)
+            page = [json.loads(json.dumps(record)) for record in matching[start:start + size]]
+
+        for record in page:
+            if fields is not None:
+                record['fields'] = {name: value for name, value in record['fields'].items() if name in fields}
+        payload = {'records': page}
+        if start + size < len(matching):
+            payload['offset'] = str(start + size)
+        self._reply(handler, 200, payload)
+
+    @staticmethod
+    def _reply(handler: BaseHTTPRequestHandler, status: int, payload: Dict,
+               headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode()
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+# =============================================================================
+# STUB BENCHMARK
+# =============================================================================
+
+def legacy_wait_seconds(record_count: int) -> float:
+    """Seconds the Batch Records -> Wait chain spends sleeping for record_count records."""
+    return math.ceil(record_count / LEGACY_BATCH_SIZE) * LEGACY_WAIT_SECONDS
+
+
+FACULTY_ASSIGNMENT_KEY = ('Half-Day of the Week of Blocks', 'Faculty')
+
+
+def synthetic_assignments(record_count: int) -> List[Dict]:
+    return [{'Faculty': [f'rec_fac_{index % 12:03d}'], 'Half-Day of the Week of Blocks': [f'rec_hd_{index:05d}'],
+             'Supervision Type': 'Direct', 'Assignment Type': 'Enhanced Faculty Supervision'}
+            for index in range(record_count)]
+
+
+def benchmark(record_count: int, latency: float = 0.1) -> Dict[str, Any]:
+    """Write synthetic faculty assignments to a stub with Airtable's limits and latency."""
+    records = synthetic_assignments(record_count)
+
+    with AirtableStub(latency=latency) as stub:
+        writer = AirtableBulkWriter('appBenchmark', 'tblFacultyAssignments', 'benchmark-token', api_url=stub.url)
+        result = writer.create(records)
+        stored = len(stub.records('appBenchmark', 'tblFacultyAssignments'))
+
+    return {
+        'records': record_count,
+        'stored': stored,
+        'requests': result['requests'],
+        'retries': result['retries'],
+        'seconds': result['seconds'],
+        'rateLimitSeconds': math.ceil(record_count / MAX_RECORDS_PER_REQUEST) / REQUESTS_PER_SECOND,
+        'legacyRequests': record_count,
+        'legacyWaitSeconds': legacy_wait_seconds(record_count)
+    }
+
+
+def rerun_benchmark(record_count: int, latency: float = 0.1) -> Dict[str, Any]:
+    """
+    Rerun after one faculty member's leave moves their assignments to a
+    colleague: the diff writer against re-creating every record.
+    """
+    records = synthetic_assignments(record_count)
+    rerun = [dict(fields, Faculty=['rec_fac_999']) if fields['Faculty'] == ['rec_fac_000'] and index < 120
+             else fields for index, fields in enumerate(records)]
+
+    with AirtableStub(latency=latency) as stub:
+        writer = AirtableBulkWriter('appBenchmark', 'tblFacultyAssignments', 'benchmark-token', api_url=stub.url)
+        writer.create(records)
+        result = writer.sync(rerun, FACULTY_ASSIGNMENT_KEY)
+        stored = len(stub.records('appBenchmark', 'tblFacultyAssignments'))
+
+    return dict(result, stored=stored, records=record_count,
+                writes=result['created'] + result['updated'] + result['deleted'],
+                legacyRequests=record_count)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    sizes = [int(arg) for arg in (argv or [])] or [500]
+
+    print('=== AIRTABLE BULK WRITER vs BATCH-OF-10 + 1 s WAIT (local stub, 100 ms latency) ===')
+    for size in sizes:
+        result = benchmark(size)
+        print(f"{result['records']:>6} records: {result['requests']} requests "
+              f"({result['retries']} retries) in {result['seconds']:.1f} s, "
+              f"rate-limit bound {result['rateLimitSeconds']:.1f} s, stored {result['stored']}; "
+              f"legacy chain {result['legacyRequests']} requests + {result['legacyWaitSeconds']:.0f} s of waits")
+
+    print()
+    print('=== RERUN AFTER ONE LEAVE CHANGE: DIFF WRITER vs RE-CREATING EVERY RECORD ===')
+    for size in sizes:
+        result = rerun_benchmark(size)
+        print(f"{result['records']:>6} records: {result['writes']} writes ({result['created']} created, "
+              f"{result['updated']} updated, {result['deleted']} deleted, {result['unchanged']} unchanged) "
+              f"in {result['requests']} requests / {result['seconds']:.1f} s, stored {result['stored']}; "
+              f"legacy rerun {result['legacyRequests']} POSTs and duplicates for Phase 6")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
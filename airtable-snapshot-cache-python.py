@@ -0,0 +1,319 @@
+"""
+AIRTABLE SNAPSHOT CACHE (PYTHON)
+Local snapshots of the Airtable tables the phases read, so one orchestrator
+run scans each table once instead of every phase re-fetching Faculty
+(tblmgzodmqTsJ5inf), Faculty Leave (tblJvewumPqMBl6Ut) and Master
+Assignments (tbl17gcDUtXc14Rjv) page by page.
+
+- A snapshot is one compact gzip JSON file per base/table/filter
+- The first fetch is a full scan; later refreshes send one delta query per
+  table, IS_AFTER(LAST_MODIFIED_TIME(), <last refresh>), and re-apply each
+  snapshot's filter locally to the changed records (compile_formula), so
+  records that stop matching leave the snapshot
+- Every snapshot is refreshed at most once per SnapshotCache, so all phases
+  of one orchestrator run are served from the same data
+- LAST_MODIFIED_TIME() misses hard deletes and computed-field changes, so a
+  snapshot older than max_age gets a full scan again
+
+PHASE_FETCHES lists the search nodes of Phases 0, 3, 7 and 8 (table and
+filterByFormula, as configured in the workflow JSONs):
+
+    python airtable-snapshot-cache-python.py              # benchmark against the local stub
+    python airtable-snapshot-cache-python.py --prefetch DIR
+        # refresh every phase snapshot in DIR (AIRTABLE_TOKEN from the environment)
+
+n8n Code nodes can neither reach Airtable nor keep files between runs, so
+the snapshot refresh runs before the orchestrator (for example from an
+Execute Command node on a self-hosted instance) and the phases read DIR.
+
+Dependencies: None (uses only Python standard library and
+airtable-bulk-writer-python.py from this directory)
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+_WRITER_PATH = Path(__file__).resolve().parent / 'airtable-bulk-writer-python.py'
+_spec = importlib.util.spec_from_file_location('airtable_bulk_writer', _WRITER_PATH)
+airtable = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(airtable)
+
+BASE_ID = 'appDgFtrU7njCKDW5'
+SNAPSHOT_VERSION = 1
+MAX_AGE_SECONDS = 6 * 3600
+# Delta windows overlap by this much so clock skew between here and Airtable
+# cannot drop a change; re-applying an unchanged record is harmless
+OVERLAP_SECONDS = 60.0
+
+# Field ids the Phase 3 filters use, by field name (see FIELD_IDS in the Phase 2 engine)
+FIELD_IDS = {
+    'fldResidentFromRBS': 'Resident (from Residency Block Schedule)',
+    'fldProcessingPhase': 'Processing Phase'
+}
+
+ACTIVE_FACULTY = "AND({Faculty} != 'Van Brunt', {Faculty} != 'Napierala', {Faculty Status} != 'Inactive')"
+PHASE_FETCHES = {
+    'Phase 0': [
+        ('Fetch Approved Faculty Leave', 'tblJvewumPqMBl6Ut',
+         'AND({Leave Approved Residency} = TRUE(), {Leave Approved Army} = TRUE(), '
+         '{Leave Start} != BLANK(), {Leave End} != BLANK())'),
+        ('Fetch Approved Resident Absences', 'tblQl3C95p0UE6F0P',
+         'AND({Absence Approved} = TRUE(), {Absence Start} != BLANK(), {Absence End} != BLANK())'),
+        ('Fetch Active Faculty Reference', 'tblmgzodmqTsJ5inf', ACTIVE_FACULTY),
+        ('Fetch Resident Reference', 'tbl3TfpZSGYGxLCIG', 'NOT(BLANK({Resident}))')
+    ],
+    'Phase 3': [
+        ('Fetch Phase 2 Output (Orchestrator)', 'tbl17gcDUtXc14Rjv',
+         "AND(NOT(BLANK({fldResidentFromRBS})), {fldProcessingPhase} = 'Phase 2 - Smart Association')"),
+        ('Fetch Faculty (Orchestrator)', 'tblmgzodmqTsJ5inf', ACTIVE_FACULTY),
+        ('Fetch Clinic Templates (Orchestrator)', 'tblLUzjfad4B1GQ1a', "{Category} = 'Attending'")
+    ],
+    'Phase 7': [
+        ('Fetch Final Master Assignments', 'tbl17gcDUtXc14Rjv', 'NOT(BLANK({Resident (from Residency Block Schedule)}))'),
+        ('Fetch Final Faculty Assignments', 'tbloGnXnu0mC6y83L', 'NOT(BLANK({Faculty}))'),
+        ('Fetch Final Call Assignments', 'tbl15U9cF0uig9IEo', 'NOT(BLANK({Faculty}))'),
+        ('Fetch Active Faculty Data', 'tblmgzodmqTsJ5inf', ACTIVE_FACULTY),
+        ('Fetch Resident Data', 'tbl3TfpZSGYGxLCIG', 'NOT(BLANK({Resident}))'),
+        ('Fetch Primary Duties', 'tbltYT3HMWxGCcCfo', 'NOT(BLANK({Faculty}))')
+    ],
+    'Phase 8': [
+        ('Fetch Master Assignments', 'tbl17gcDUtXc14Rjv', 'NOT(BLANK({Resident (from Residency Block Schedule)}))'),
+        ('Fetch Faculty Assignments', 'tbloGnXnu0mC6y83L', 'NOT(BLANK({Faculty}))'),
+        ('Fetch Call Assignments', 'tbl15U9cF0uig9IEo', 'NOT(BLANK({Faculty}))'),
+        ('Fetch Active Faculty', 'tblmgzodmqTsJ5inf', ACTIVE_FACULTY),
+        ('Fetch Faculty Leave Data', 'tblJvewumPqMBl6Ut', 'NOT(BLANK({Faculty}))')
+    ]
+}
+
+
+def airtable_timestamp(seconds: float) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + f'.{int(seconds % 1 * 1000):03d}Z'
+
+
+# =============================================================================
+# SNAPSHOT CACHE
+# =============================================================================
+
+class SnapshotCache:
+    """
+    Snapshots of filtered Airtable tables in directory, refreshed at most
+    once per instance: create one per orchestrator run.
+
+        cache = SnapshotCache('snapshots', lambda base, table: AirtableBulkWriter(base, table, token))
+        faculty = cache.get(BASE_ID, 'tblmgzodmqTsJ5inf', ACTIVE_FACULTY)
+    """
+
+    def __init__(self, directory, writer_factory: Callable[[str, str], Any],
+                 max_age: float = MAX_AGE_SECONDS, overlap: float = OVERLAP_SECONDS,
+                 field_ids: Optional[Dict[str, str]] = None, clock: Callable[[], float] = time.time):
+        self.directory = Path(directory)
+        self.writer_factory = writer_factory
+        self.max_age = max_age
+        self.overlap = overlap
+        self.field_ids = FIELD_IDS if field_ids is None else field_ids
+        self.clock = clock
+        self._served: Dict[Tuple[str, str, str], List[Dict]] = {}
+        # (base, table) -> (since, changed records, fetched at), shared by every filter on the table
+        self._deltas: Dict[Tuple[str, str], Tuple[float, List[Dict], float]] = {}
+        self._writers: Dict[Tuple[str, str], Any] = {}
+        # First access of each table in this run; every snapshot of the table
+        # records it as its refresh time, so the next run needs one delta per table
+        self._table_started: Dict[Tuple[str, str], float] = {}
+        self.stats = {'full': 0, 'delta': 0, 'served': 0, 'requests': 0}
+
+    def get(self, base_id: str, table: str, formula: str = '') -> List[Dict]:
+        """Records ({'id', 'fields'}) of table matching formula, from this run's snapshot."""
+        formula = formula.lstrip('=')
+        key = (base_id, table, formula)
+        if key in self._served:
+            self.stats['served'] += 1
+            return self._served[key]
+
+        snapshot = self._load(key)
+        now = self.clock()
+        started = self._table_started.setdefault((base_id, table), now)
+        try:
+            matches = airtable.compile_formula(formula, self.field_ids)
+        except airtable.FormulaError:
+            # Membership of changed records cannot be decided locally
+            matches = None
+
+        if snapshot is None or matches is None or now - snapshot['fullRefreshAt'] > self.max_age:
+            records = self._list(base_id, table, formula)
+            snapshot = {'version': SNAPSHOT_VERSION, 'base': base_id, 'table': table, 'formula': formula,
+                        'refreshedAt': started, 'fullRefreshAt': now,
+                        'records': {record['id']: record['fields'] for record in records}}
+            self.stats['full'] += 1
+        else:
+            for record in self._delta(base_id, table, snapshot['refreshedAt'] - self.overlap):
+                if matches(record['fields']):
+                    snapshot['records'][record['id']] = record['fields']
+                else:
+                    snapshot['records'].pop(record['id'], None)
+            snapshot['refreshedAt'] = self._deltas[(base_id, table)][2]
+
+        self._save(key, snapshot)
+        records = [{'id': record_id, 'fields': fields} for record_id, fields in snapshot['records'].items()]
+        self._served[key] = records
+        return records
+
+    def path(self, base_id: str, table: str, formula: str = '') -> Path:
+        digest = hashlib.sha1(formula.lstrip('=').encode()).hexdigest()[:12]
+        return self.directory / f'{base_id}-{table}-{digest}.json.gz'
+
+    def _delta(self, base_id: str, table: str, since: float) -> List[Dict]:
+        cached = self._deltas.get((base_id, table))
+        if cached is None or since < cached[0]:
+            fetched_at = self.clock()
+            changed = self._list(base_id, table, f"IS_AFTER(LAST_MODIFIED_TIME(), '{airtable_timestamp(since)}')")
+            self._deltas[(base_id, table)] = cached = (since, changed, fetched_at)
+            self.stats['delta'] += 1
+        return cached[1]
+
+    def _list(self, base_id: str, table: str, formula: str) -> List[Dict]:
+        writer = self._writers.get((base_id, table))
+        if writer is None:
+            writer = self._writers[(base_id, table)] = self.writer_factory(base_id, table)
+        records = writer.list_records(formula or None)
+        self.stats['requests'] += writer.stats['requests']
+        return records
+
+    def _load(self, key: Tuple[str, str, str]) -> Optional[Dict]:
+        path = self.path(*key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                snapshot = json.load(handle)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        if snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('formula') != key[2]:
+            return None
+        return snapshot
+
+    def _save(self, key: Tuple[str, str, str], snapshot: Dict) -> None:
+        path = self.path(*key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix('.tmp')
+        with gzip.open(temporary, 'wt', encoding='utf-8') as handle:
+            json.dump(snapshot, handle, separators=(',', ':'))
+        os.replace(temporary, path)
+
+
+def prefetch(cache: SnapshotCache, phases: Sequence[str] = tuple(PHASE_FETCHES),
+             base_id: str = BASE_ID) -> Dict[str, Dict[str, List[Dict]]]:
+    """Serve every search node of phases from cache: {phase: {node name: records}}."""
+    return {phase: {node: cache.get(base_id, table, formula) for node, table, formula in PHASE_FETCHES[phase]}
+            for phase in phases}
+
+
+# =============================================================================
+# STUB BENCHMARK
+# =============================================================================
+
+def seed_synthetic_base(stub, base_id: str = BASE_ID, faculty_count: int = 30,
+                        leave_count: int = 400, assignment_count: int = 4000) -> Dict[str, List[str]]:
+    """Tables with the fields the PHASE_FETCHES filters look at."""
+    faculty = stub.seed(base_id, 'tblmgzodmqTsJ5inf', [
+        {'Faculty': f'Faculty {index:02d}', 'Faculty Status': 'Inactive' if index % 10 == 9 else 'Active'}
+        for index in range(faculty_count)])
+    residents = stub.seed(base_id, 'tbl3TfpZSGYGxLCIG', [{'Resident': f'Resident {index:02d}'} for index in range(36)])
+    leave = stub.seed(base_id, 'tblJvewumPqMBl6Ut', [
+        {'Faculty': [faculty[index % faculty_count]], 'Leave Approved Residency': index % 4 != 0,
+         'Leave Approved Army': True, 'Leave Start': '2026-07-01', 'Leave End': '2026-07-03'}
+        for index in range(leave_count)])
+    stub.seed(base_id, 'tblQl3C95p0UE6F0P', [
+        {'Resident': [residents[index % 36]], 'Absence Approved': True, 'Absence Start': '2026-07-01',
+         'Absence End': '2026-07-02'} for index in range(leave_count // 2)])
+    stub.seed(base_id, 'tblLUzjfad4B1GQ1a', [{'Name': f'Template {index}', 'Category': 'Attending'
+                                              if index % 2 else 'Resident'} for index in range(60)])
+    stub.seed(base_id, 'tbl17gcDUtXc14Rjv', [
+        {'Resident (from Residency Block Schedule)': [residents[index % 36]],
+         'Processing Phase': 'Phase 2 - Smart Association'} for index in range(assignment_count)])
+    for table in ('tbloGnXnu0mC6y83L', 'tbl15U9cF0uig9IEo', 'tbltYT3HMWxGCcCfo'):
+        stub.seed(base_id, table, [{'Faculty': [faculty[index % faculty_count]]}
+                                   for index in range(assignment_count // 4)])
+    return {'faculty': faculty, 'leave': leave}
+
+
+def benchmark(directory, latency: float = 0.0) -> Dict[str, Any]:
+    """API requests of the Phase 0/3/7/8 fetches: uncached, cold cache, and a rerun after a few edits."""
+    with airtable.AirtableStub(rate_limit=1000, latency=latency, field_ids=FIELD_IDS) as stub:
+        ids = seed_synthetic_base(stub)
+
+        def factory(base_id, table):
+            return airtable.AirtableBulkWriter(base_id, table, 'benchmark-token', api_url=stub.url, rate=1000)
+
+        uncached = 0
+        for fetches in PHASE_FETCHES.values():
+            for _, table, formula in fetches:
+                writer = factory(BASE_ID, table)
+                writer.list_records(formula)
+                uncached += writer.stats['requests']
+
+        cold = SnapshotCache(directory, factory)
+        started = time.perf_counter()
+        prefetch(cold)
+        cold_seconds = time.perf_counter() - started
+
+        # A leave approval, a new leave request and a faculty member going inactive
+        time.sleep(0.01)
+        writer = factory(BASE_ID, 'tblJvewumPqMBl6Ut')
+        writer.update([{'id': ids['leave'][0], 'fields': {'Leave Approved Residency': True}}])
+        writer.create([{'Faculty': [ids['faculty'][0]], 'Leave Approved Residency': True, 'Leave Approved Army': True,
+                        'Leave Start': '2026-08-01', 'Leave End': '2026-08-02'}])
+        factory(BASE_ID, 'tblmgzodmqTsJ5inf').update([{'id': ids['faculty'][1], 'fields': {'Faculty Status': 'Inactive'}}])
+
+        warm = SnapshotCache(directory, factory, overlap=0.0)
+        started = time.perf_counter()
+        served = prefetch(warm)
+        warm_seconds = time.perf_counter() - started
+
+        fresh = factory(BASE_ID, 'tblJvewumPqMBl6Ut').list_records(PHASE_FETCHES['Phase 0'][0][2])
+
+    return {
+        'fetches': sum(len(fetches) for fetches in PHASE_FETCHES.values()),
+        'uncachedRequests': uncached,
+        'coldRequests': cold.stats['requests'],
+        'coldSeconds': cold_seconds,
+        'warmRequests': warm.stats['requests'],
+        'warmDeltaQueries': warm.stats['delta'],
+        'warmFullScans': warm.stats['full'],
+        'warmSeconds': warm_seconds,
+        'consistent': sorted(r['id'] for r in served['Phase 0']['Fetch Approved Faculty Leave']) ==
+        sorted(r['id'] for r in fresh)
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = list(argv or [])
+    if argv[:1] == ['--prefetch']:
+        directory = argv[1] if len(argv) > 1 else 'airtable-snapshots'
+        token = os.environ['AIRTABLE_TOKEN']
+        cache = SnapshotCache(directory, lambda base_id, table: airtable.AirtableBulkWriter(base_id, table, token))
+        served = prefetch(cache)
+        for phase, nodes in served.items():
+            print(f"{phase}: " + ', '.join(f'{node} {len(records)}' for node, records in nodes.items()))
+        print(f"{cache.stats['full']} full scans, {cache.stats['delta']} delta queries, "
+              f"{cache.stats['requests']} requests")
+        return
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        result = benchmark(directory)
+
+    print('=== SNAPSHOT CACHE vs PER-PHASE FETCHES (Phases 0, 3, 7, 8; local stub) ===')
+    print(f"{result['fetches']} search nodes: {result['uncachedRequests']} requests uncached, "
+          f"{result['coldRequests']} with a cold cache ({result['coldSeconds']:.2f} s)")
+    print(f"Rerun after 3 edits: {result['warmRequests']} requests ({result['warmDeltaQueries']} delta queries, "
+          f"{result['warmFullScans']} full scans) in {result['warmSeconds']:.2f} s; "
+          f"consistent with a fresh scan: {result['consistent']}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,429 @@
+"""
+AIRTABLE FIELD PROJECTION (PYTHON)
+Per-phase projection manifest for the Airtable search nodes of Phases 0, 3,
+7 and 8, and a checker that the phase engines only read projected fields.
+
+Without options.fields a search returns every field of every record: long
+text, attachment metadata and lookup arrays with hundreds of linked record
+IDs that no engine reads, and the merged payload is then converted into
+Pyodide in full. PROJECTIONS lists, per search node, only the fields its
+engine reads (FIELD_MAP in the Phase 0 Absence Processing Engine,
+EnhancedFacultyAssignmentEngine and its input separation in Phase 3,
+Phase7Validator, EmergencyCoverageEngine). The engines separate merged
+records by their envelope (record-envelopes-python.py), so no field is
+projected only to tell record types apart.
+
+- check_workflows() compares PROJECTIONS with the options.fields of each
+  search node; filterByFormula fields are evaluated server-side and need no
+  projection
+- ProjectionAudit.project() returns records as a projected search would
+  (ProjectedRecord), remembering every engine read of a field the
+  projection dropped; check() raises ProjectionError listing them. Reads
+  through iteration or dict(record) copies are not tracked
+
+    python field-projection-python.py          # payload benchmark on a synthetic base
+    python field-projection-python.py --check  # exit 1 if a workflow drifted from PROJECTIONS
+
+Dependencies: None (uses only Python standard library and
+airtable-snapshot-cache-python.py from this directory)
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from datetime import date, timedelta
+import importlib.util
+import json
+import random
+import sys
+import time
+
+REPO_ROOT = Path(__file__).resolve().parent
+_CACHE_PATH = REPO_ROOT / 'airtable-snapshot-cache-python.py'
+_spec = importlib.util.spec_from_file_location('airtable_snapshot_cache', _CACHE_PATH)
+snapshots = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(snapshots)
+airtable = snapshots.airtable
+
+# Airtable search output carries these next to the fields, projected or not
+RECORD_KEYS = ('id', 'createdTime')
+
+# =============================================================================
+# PROJECTION MANIFEST
+# =============================================================================
+
+# Phase 0: Absence Processing Engine (FIELD_MAP entries it reads)
+FACULTY_LEAVE_FIELDS = ('Faculty', 'Leave Start', 'Leave End', 'Leave Type', 'Leave Request', 'Comments',
+                        'Leave Comments')
+RESIDENT_ABSENCE_FIELDS = ('Resident', 'Absence Start', 'Absence End', 'Absence Type', 'Comments')
+FACULTY_REFERENCE_FIELDS = ('Faculty', 'Last Name', 'First Name', 'Faculty Status')
+RESIDENT_REFERENCE_FIELDS = ('Resident', 'Resident Name', 'PGY Level')
+ABSENCE_TEMPLATE_FIELDS = ('Name', 'Category')
+
+# Phase 3: input separation and EnhancedFacultyAssignmentEngine
+PHASE3_MASTER_FIELDS = ('Half-Day of the Week of Blocks', 'Resident (from Residency Block Schedule)',
+                        'PGY Link (from Residency Block Schedule)', 'Activity (from Rotation Templates)',
+                        'Date (from Half-Day of the Week of Blocks)',
+                        'Time of Day (from Half-Day of the Week of Blocks)')
+PHASE3_FACULTY_FIELDS = ('Faculty', 'Last Name', 'Primary Duty', 'Performs Procedure', 'Specialties',
+                         'Available Monday', 'Available Tuesday', 'Available Wednesday', 'Available Thursday',
+                         'Available Friday', 'Total Inpatient Weeks')
+PHASE3_TEMPLATE_FIELDS = ('Name', 'Category', 'Activity Type', 'Requires Specialty Credentials')
+
+# Phase 7: Phase7Validator
+PHASE7_MASTER_FIELDS = ('Resident (from Residency Block Schedule)', 'PGY Link (from Residency Block Schedule)',
+                        'Half-Day of the Week of Blocks', 'Date (from Half-Day of the Week of Blocks)')
+PHASE7_FACULTY_ASSIGNMENT_FIELDS = ('Faculty', 'Attending Clinic Templates', 'Half-Day of the Week of Blocks',
+                                    'Date (from Half-Day of the Week of Blocks)')
+PHASE7_CALL_FIELDS = ('Faculty', 'Call Date')
+PHASE7_FACULTY_FIELDS = ('Faculty', 'Last Name')
+PHASE7_RESIDENT_FIELDS = ('Resident',)
+PRIMARY_DUTY_FIELDS = ('Faculty', 'Primary Duty',
+                       'Clinic Minimum Half-Days Per Week', 'Clinic Maximum Half-Days Per Week',
+                       'Sports Medicine Minimum Half-Days Per Week copy',
+                       'Sports Medicine Maximum Half-Days Per Week',
+                       'Minimum Graduate Medical Education Half-Day Per Week',
+                       'Maximum Graduate Medical Education Half-Days Per Week',
+                       'Department of Family Medicine Minimum Half-Days Per Week',
+                       'Department of Family Medicine Maximum Half-Days Per Week')
+
+# Phase 8: input separation and EmergencyCoverageEngine
+PHASE8_MASTER_FIELDS = ('Resident (from Residency Block Schedule)', 'Activity (from Rotation Templates)')
+PHASE8_FACULTY_ASSIGNMENT_FIELDS = ('Faculty', 'Attending Clinic Templates', 'Activity (from Rotation Templates)')
+PHASE8_CALL_FIELDS = ('Faculty', 'Call Date')
+PHASE8_FACULTY_FIELDS = ('Faculty', 'Subspecialty', 'Performs Procedures', 'Available Monday',
+                         'Available Tuesday', 'Available Wednesday', 'Available Thursday', 'Available Friday')
+PHASE8_LEAVE_FIELDS = ('Faculty', 'Leave Start', 'Leave End', 'Leave Type', 'Leave Approved Residency', 'Comments')
+
+PHASE_WORKFLOWS = {
+    'Phase 0': 'UPDATED-phase0-absence-loader.json',
+    'Phase 3': 'phase3-main-v4.json',
+    'Phase 7': 'workflows/archive/phase7-python-powered.json',
+    'Phase 8': 'workflows/archive/phase8-python-powered-orchestrator-compatible.json'
+}
+
+# Phase -> search node -> (table, projected fields)
+PROJECTIONS: Dict[str, Dict[str, Tuple[str, Tuple[str, ...]]]] = {
+    'Phase 0': {
+        'Fetch Approved Faculty Leave': ('tblJvewumPqMBl6Ut', FACULTY_LEAVE_FIELDS),
+        'Fetch Approved Resident Absences': ('tblQl3C95p0UE6F0P', RESIDENT_ABSENCE_FIELDS),
+        'Fetch Active Faculty Reference': ('tblmgzodmqTsJ5inf', FACULTY_REFERENCE_FIELDS),
+        'Fetch Resident Reference': ('tbl3TfpZSGYGxLCIG', RESIDENT_REFERENCE_FIELDS),
+        'Fetch Absence Templates': ('tblLUzjfad4B1GQ1a', ABSENCE_TEMPLATE_FIELDS)
+    },
+    'Phase 3': {
+        'Fetch Phase 2 Output (Orchestrator)': ('tbl17gcDUtXc14Rjv', PHASE3_MASTER_FIELDS),
+        'Fetch Faculty (Orchestrator)': ('tblmgzodmqTsJ5inf', PHASE3_FACULTY_FIELDS),
+        'Fetch Clinic Templates (Orchestrator)': ('tblLUzjfad4B1GQ1a', PHASE3_TEMPLATE_FIELDS),
+        'Fetch Master Assignments (Standalone)': ('tbl17gcDUtXc14Rjv', PHASE3_MASTER_FIELDS),
+        'Fetch Faculty (Standalone)': ('tblmgzodmqTsJ5inf', PHASE3_FACULTY_FIELDS),
+        'Fetch Clinic Templates (Standalone)': ('tblLUzjfad4B1GQ1a', PHASE3_TEMPLATE_FIELDS)
+    },
+    'Phase 7': {
+        'Fetch Final Master Assignments': ('tbl17gcDUtXc14Rjv', PHASE7_MASTER_FIELDS),
+        'Fetch Final Faculty Assignments': ('tbloGnXnu0mC6y83L', PHASE7_FACULTY_ASSIGNMENT_FIELDS),
+        'Fetch Final Call Assignments': ('tbl15U9cF0uig9IEo', PHASE7_CALL_FIELDS),
+        'Fetch Active Faculty Data': ('tblmgzodmqTsJ5inf', PHASE7_FACULTY_FIELDS),
+        'Fetch Resident Data': ('tbl3TfpZSGYGxLCIG', PHASE7_RESIDENT_FIELDS),
+        'Fetch Primary Duties': ('tbltYT3HMWxGCcCfo', PRIMARY_DUTY_FIELDS)
+    },
+    'Phase 8': {
+        'Fetch Master Assignments': ('tbl17gcDUtXc14Rjv', PHASE8_MASTER_FIELDS),
+        'Fetch Faculty Assignments': ('tbloGnXnu0mC6y83L', PHASE8_FACULTY_ASSIGNMENT_FIELDS),
+        'Fetch Call Assignments': ('tbl15U9cF0uig9IEo', PHASE8_CALL_FIELDS),
+        'Fetch Active Faculty': ('tblmgzodmqTsJ5inf', PHASE8_FACULTY_FIELDS),
+        'Fetch Faculty Leave Data': ('tblJvewumPqMBl6Ut', PHASE8_LEAVE_FIELDS)
+    }
+}
+
+
+def load_workflow(phase: str, root: Path = REPO_ROOT) -> Dict[str, Any]:
+    return json.loads((Path(root) / PHASE_WORKFLOWS[phase]).read_text())
+
+
+def search_nodes(workflow: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {node['name']: node for node in workflow['nodes']
+            if node['type'] == 'n8n-nodes-base.airtable' and node['parameters'].get('operation') == 'search'}
+
+
+def check_workflows(root: Path = REPO_ROOT) -> List[str]:
+    """Differences between PROJECTIONS and the search nodes' options.fields; empty when in sync."""
+    problems = []
+    for phase, fetches in PROJECTIONS.items():
+        nodes = search_nodes(load_workflow(phase, root))
+        for name in sorted(set(nodes) - set(fetches)):
+            problems.append(f'{phase}: search node {name!r} has no projection')
+        for name, (table, fields) in fetches.items():
+            node = nodes.get(name)
+            if node is None:
+                problems.append(f'{phase}: search node {name!r} not found')
+                continue
+            parameters = node['parameters']
+            if parameters['table']['value'] != table:
+                problems.append(f"{phase}: {name!r} searches {parameters['table']['value']}, manifest says {table}")
+            projected = parameters.get('options', {}).get('fields')
+            if projected != list(fields):
+                problems.append(f'{phase}: {name!r} projects {projected}, manifest says {list(fields)}')
+    return problems
+
+
+# =============================================================================
+# READ CHECKER
+# =============================================================================
+
+class ProjectionError(RuntimeError):
+    """An engine read a field its search node does not project."""
+
+
+class ProjectedRecord(dict):
+    """
+    A record as a projected search returns it. Reads of a field the
+    projection dropped (record[...], .get, `in`) are logged to the audit:
+    with the projection live they would see a missing field.
+    """
+
+    def __init__(self, record: Dict[str, Any], fields: Iterable[str], source: str, audit: 'ProjectionAudit'):
+        keep = set(fields).union(RECORD_KEYS)
+        super().__init__((key, value) for key, value in record.items() if key in keep)
+        self.hidden = frozenset(record) - keep
+        self.source = source
+        self.audit = audit
+
+    def _read(self, key):
+        if key in self.hidden:
+            self.audit.unprojected.add((self.source, key))
+
+    def __getitem__(self, key):
+        self._read(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self._read(key)
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self._read(key)
+        return super().__contains__(key)
+
+
+class ProjectionAudit:
+    """
+    Feeds an engine projected records and collects its unprojected reads.
+
+        audit = ProjectionAudit('Phase 7')
+        items = audit.project('Fetch Primary Duties', full_records) + ...
+        run_engine(items)
+        audit.check()
+    """
+
+    def __init__(self, phase: str, projections: Optional[Dict[str, Dict[str, Tuple[str, Sequence[str]]]]] = None):
+        self.phase = phase
+        self.fetches = (PROJECTIONS if projections is None else projections)[phase]
+        self.unprojected: Set[Tuple[str, str]] = set()
+
+    def project(self, node: str, records: Iterable[Dict[str, Any]]) -> List[ProjectedRecord]:
+        fields = self.fetches[node][1]
+        return [ProjectedRecord(record, fields, node, self) for record in records]
+
+    def violations(self) -> Dict[str, List[str]]:
+        """Search node -> fields its engine read but the node does not project"""
+        found: Dict[str, List[str]] = {}
+        for node, field in sorted(self.unprojected):
+            found.setdefault(node, []).append(field)
+        return found
+
+    def check(self) -> None:
+        violations = self.violations()
+        if violations:
+            raise ProjectionError(f'{self.phase} engine reads unprojected fields: ' + '; '.join(
+                f"{node}: {', '.join(fields)}" for node, fields in violations.items()))
+
+
+# =============================================================================
+# SYNTHETIC BASE AND BENCHMARK
+# =============================================================================
+
+ACTIVITIES = ('Continuity Clinic', 'FM Inpatient Team', 'Sports Medicine Clinic', 'Procedure Clinic',
+              'Didactics', 'Night Float', 'Colposcopy Clinic', 'Newborn Nursery')
+PRIMARY_DUTIES = ('Core Faculty', 'Program Director', 'Sports Medicine', 'Department Chief')
+
+
+def _notes(rng: random.Random, words: int) -> str:
+    vocabulary = ('coverage', 'swap', 'approved', 'clinic', 'pending', 'orders', 'requested', 'per', 'PD',
+                  'confirm', 'with', 'chief', 'resident', 'block', 'call', 'template', 'updated', 'see')
+    return ' '.join(rng.choice(vocabulary) for _ in range(words))
+
+
+def _links(rng: random.Random, prefix: str, count: int) -> List[str]:
+    return [f'rec{prefix}{rng.randrange(16 ** 10):010x}' for _ in range(count)]
+
+
+def synthetic_base(start: date = date(2026, 7, 6), weeks: int = 4, faculty_count: int = 30,
+                   resident_count: int = 36, seed: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Table -> full search output ({'id', 'createdTime', **fields}): every field
+    PROJECTIONS names plus the unprojected long text, lookups and link
+    arrays real records carry.
+    """
+    rng = random.Random(seed)
+    created = '2026-01-05T12:00:00.000Z'
+
+    def record(table_key: str, index: int, **fields) -> Dict[str, Any]:
+        return {'id': f'rec{table_key}{index:05d}', 'createdTime': created, **fields}
+
+    weekdays = [start + timedelta(days=offset) for offset in range(weeks * 7) if (start + timedelta(days=offset)).weekday() < 5]
+    half_days = [(f'rechd{index:05d}', day, slot) for index, (day, slot) in
+                 enumerate((day, slot) for day in weekdays for slot in ('AM', 'PM'))]
+
+    faculty = [record('fac', index, **{
+        'Faculty': f'Faculty{index:02d}', 'Last Name': f'Faculty{index:02d}', 'First Name': f'First{index:02d}',
+        'Faculty Status': 'Active', 'Primary Duty': PRIMARY_DUTIES[index % len(PRIMARY_DUTIES)],
+        'Performs Procedure': index % 3 == 0, 'Performs Procedures': index % 3 == 0,
+        'Subspecialty': 'Sports Medicine' if index % 5 == 0 else 'Family Medicine',
+        'Specialties': ['Sports Medicine'] if index % 5 == 0 else [],
+        'Available Monday': True, 'Available Tuesday': True, 'Available Wednesday': index % 4 != 0,
+        'Available Thursday': True, 'Available Friday': index % 6 != 0, 'Total Inpatient Weeks': index % 8,
+        'Email': f'faculty{index:02d}@example.mil', 'Phone': f'555-01{index:02d}',
+        'Bio': _notes(rng, 80), 'Faculty Assignments': _links(rng, 'fa', 60), 'Call Schedule': _links(rng, 'cs', 20),
+        'Leave Requests': _links(rng, 'lv', 8), 'Primary Duties': _links(rng, 'pd', 1)})
+        for index in range(faculty_count)]
+    faculty_ids = [f['id'] for f in faculty]
+
+    residents = [record('res', index, **{
+        'Resident': [f'recperson{index:05d}'], 'Resident Name': f'Resident{index:02d}',
+        'Block Number': 1 + index % 13, 'PGY Level': f'PGY-{1 + index % 3}', 'Name': f'Resident{index:02d} Block',
+        'Rotation': ACTIVITIES[index % len(ACTIVITIES)], 'Notes': _notes(rng, 40),
+        'Start Date': start.isoformat(), 'End Date': (start + timedelta(days=27)).isoformat(),
+        'Half-Day Assignments': _links(rng, 'ma', 40)})
+        for index in range(resident_count)]
+
+    templates = [record('tpl', index, **{
+        'Name': name, 'Category': category, 'Activity Type': name, 'Requires Specialty Credentials': 'Sports' in name,
+        'Abbreviation': name[:4].upper(), 'Description': _notes(rng, 30), 'Master Assignments': _links(rng, 'ma', 120)})
+        for index, (name, category) in enumerate(
+            [(activity, 'Attending') for activity in ACTIVITIES] +
+            [(activity, 'Resident') for activity in ACTIVITIES] +
+            [(name, 'Absence') for name in ('TDY', 'Medical Leave', 'Personal Leave', 'OFF AM', 'OFF PM',
+                                            'Leave AM', 'Leave PM')])]
+
+    master = []
+    for resident_index, resident in enumerate(residents):
+        for hd_id, day, slot in half_days:
+            activity = ACTIVITIES[(resident_index + day.toordinal()) % len(ACTIVITIES)]
+            master.append(record('ma', len(master), **{
+                'Name': f"{resident['Resident Name']} {day.isoformat()} {slot}",
+                'Half-Day of the Week of Blocks': [hd_id], 'Resident (from Residency Block Schedule)': resident['Resident'],
+                'PGY Link (from Residency Block Schedule)': [resident['PGY Level']],
+                'Activity (from Rotation Templates)': [activity], 'Date (from Half-Day of the Week of Blocks)': [day.isoformat()],
+                'Time of Day (from Half-Day of the Week of Blocks)': [slot],
+                'Processing Phase': 'Phase 2 - Smart Association', 'Residency Block Schedule': [resident['id']],
+                'Rotation Templates': _links(rng, 'tpl', 1), 'Block (from Residency Block Schedule)': [resident['Block Number']],
+                'Notes': _notes(rng, 25)}))
+
+    faculty_assignments = []
+    for hd_id, day, slot in half_days:
+        for offset in range(3):
+            faculty_id = faculty_ids[(day.toordinal() * 2 + offset) % faculty_count]
+            faculty_assignments.append(record('fa', len(faculty_assignments), **{
+                'Faculty': [faculty_id], 'Attending Clinic Templates': [templates[offset]['id']],
+                'Half-Day of the Week of Blocks': [hd_id], 'Date (from Half-Day of the Week of Blocks)': [day.isoformat()],
+                'Activity (from Rotation Templates)': [ACTIVITIES[offset]],
+                'Processing Phase': 'Phase 3 - Pyodide Enhanced', 'Supervised Residents': _links(rng, 'res', 4),
+                'Notes': _notes(rng, 20)}))
+
+    calls = [record('call', index, **{
+        'Call Date': (start + timedelta(days=index)).isoformat(), 'Faculty': [faculty_ids[index % faculty_count]],
+        'Call Type': 'Weekend' if (start + timedelta(days=index)).weekday() >= 5 else 'Weeknight',
+        'Post-Call Clinic': _links(rng, 'fa', 2), 'Notes': _notes(rng, 20)})
+        for index in range(weeks * 7)]
+
+    leave = [record('lv', index, **{
+        'Faculty': [faculty_ids[index % faculty_count]],
+        'Leave Start': (start + timedelta(days=index % 25)).isoformat(),
+        'Leave End': (start + timedelta(days=index % 25 + 1 + index % 3)).isoformat(),
+        'Leave Type': ('TDY', 'Conference', 'Personal Leave')[index % 3], 'Leave Request': f'Request {index}',
+        'Comments': _notes(rng, 15), 'Leave Comments': _notes(rng, 15), 'Time of Day': 'All Day',
+        'Leave Approved Residency': True, 'Leave Approved Army': True,
+        'Orders': _notes(rng, 60), 'Approver Notes': _notes(rng, 30)})
+        for index in range(faculty_count * 2)]
+
+    absences = [record('ra', index, **{
+        'Resident': residents[index % resident_count]['Resident'],
+        'Absence Start': (start + timedelta(days=index % 25)).isoformat(),
+        'Absence End': (start + timedelta(days=index % 25 + 1)).isoformat(),
+        'Absence Type': ('Medical Leave', 'Personal Leave')[index % 2], 'Comments': _notes(rng, 15),
+        'Absence Approved': True, 'Notes': _notes(rng, 40)})
+        for index in range(resident_count)]
+
+    duties = [record('pd', index, **{
+        'Faculty': [faculty_id], 'Primary Duty': PRIMARY_DUTIES[index % len(PRIMARY_DUTIES)],
+        'Clinic Minimum Half-Days Per Week': 2, 'Clinic Maximum Half-Days Per Week': 6,
+        'Sports Medicine Minimum Half-Days Per Week copy': 0, 'Sports Medicine Maximum Half-Days Per Week': 2,
+        'Minimum Graduate Medical Education Half-Day Per Week': 0,
+        'Maximum Graduate Medical Education Half-Days Per Week': 2,
+        'Department of Family Medicine Minimum Half-Days Per Week': 0,
+        'Department of Family Medicine Maximum Half-Days Per Week': 2, 'Description': _notes(rng, 60)})
+        for index, faculty_id in enumerate(faculty_ids)]
+
+    return {
+        'tblmgzodmqTsJ5inf': faculty, 'tbl3TfpZSGYGxLCIG': residents, 'tblLUzjfad4B1GQ1a': templates,
+        'tbl17gcDUtXc14Rjv': master, 'tbloGnXnu0mC6y83L': faculty_assignments, 'tbl15U9cF0uig9IEo': calls,
+        'tblJvewumPqMBl6Ut': leave, 'tblQl3C95p0UE6F0P': absences, 'tbltYT3HMWxGCcCfo': duties
+    }
+
+
+def search(base: Dict[str, List[Dict[str, Any]]], phase: str, root: Path = REPO_ROOT) -> Dict[str, List[Dict]]:
+    """Search node -> full records of base matching its filterByFormula, as the unprojected node returns them."""
+    results = {}
+    for name, node in search_nodes(load_workflow(phase, root)).items():
+        parameters = node['parameters']
+        matches = airtable.compile_formula(parameters.get('filterByFormula') or 'TRUE()', snapshots.FIELD_IDS)
+        results[name] = [record for record in base.get(parameters['table']['value'], [])
+                         if matches({key: value for key, value in record.items() if key not in RECORD_KEYS})]
+    return results
+
+
+def benchmark(base: Optional[Dict[str, List[Dict[str, Any]]]] = None, rounds: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Merged payload per phase, full vs projected: JSON bytes and a JSON round
+    trip standing in for the to_py() conversion into Pyodide.
+    """
+    base = synthetic_base() if base is None else base
+    results = {}
+    for phase in PROJECTIONS:
+        fetched = search(base, phase)
+        full = [record for records in fetched.values() for record in records]
+        fetches = PROJECTIONS[phase]
+        projected = [{key: value for key, value in record.items() if key in fetches[name][1] or key in RECORD_KEYS}
+                     for name, records in fetched.items() for record in records]
+
+        timings = []
+        for payload in (full, projected):
+            text = json.dumps(payload)
+            started = time.perf_counter()
+            for _ in range(rounds):
+                json.loads(json.dumps(payload))
+            timings.append((len(text.encode()), (time.perf_counter() - started) / rounds))
+        results[phase] = {'records': len(full), 'fullBytes': timings[0][0], 'projectedBytes': timings[1][0],
+                          'fullSeconds': timings[0][1], 'projectedSeconds': timings[1][1]}
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = list(argv or [])
+    if argv[:1] == ['--check']:
+        problems = check_workflows()
+        for problem in problems:
+            print(problem)
+        print(f"{len(problems)} projection mismatches in {len(PROJECTIONS)} phase workflows")
+        sys.exit(1 if problems else 0)
+
+    print('=== FIELD PROJECTION: MERGED SEARCH PAYLOAD PER PHASE (synthetic 4-week base) ===')
+    for phase, result in benchmark().items():
+        print(f"{phase}: {result['records']} records, {result['fullBytes'] / 1024:.0f} KiB -> "
+              f"{result['projectedBytes'] / 1024:.0f} KiB "
+              f"({1 - result['projectedBytes'] / result['fullBytes']:.0%} smaller); conversion "
+              f"{result['fullSeconds'] * 1000:.1f} ms -> {result['projectedSeconds'] * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,157 @@
+"""
+SHARED HOLIDAY CALENDAR (PYTHON)
+Single source of the federal holiday rules used for Phase 4 call weighting
+(CallSchedulingEngine) and the holidays Phase 8 reports next to each affected
+assignment's criticality (EmergencyCoverageEngine). Phase 9 (Excel
+highlighting) carries a JavaScript port of the same rule table.
+
+Each engine builds its calendar for the dates it works on
+(HolidayCalendar.for_range; holidayCalendarForRange in Phase 9).
+
+Moving holidays (nth/last weekday of a month) and the observed-day rule
+(Saturday holidays observed Friday, Sunday holidays observed Monday) are
+expanded once for a year range into a frozenset of date ordinals, so lookups
+are O(1) set membership.
+
+n8n Code nodes cannot import repository files, so the block between the
+SHARED HOLIDAY CALENDAR markers below is pasted verbatim into:
+- workflows/archive/phase4-python-powered.json ("Python Call Scheduling Engine")
+- tests/archive/test_phase4_mock.py (copy of the Phase 4 engine)
+- workflows/archive/phase8-python-powered-orchestrator-compatible.json
+  ("Python Emergency Coverage Engine")
+tests/archive/test_holiday_calendar.py fails if any copy (or the Phase 9
+JavaScript port) drifts.
+
+    python holiday-calendar-python.py 2025 2026
+
+Dependencies: None (uses only Python standard library)
+"""
+
+import sys
+from datetime import date, timedelta
+from typing import Optional, Union
+
+# -----------------------------------------------------------------------------
+# SHARED HOLIDAY CALENDAR (source: holiday-calendar-python.py)
+# -----------------------------------------------------------------------------
+# Uses datetime date, timedelta and typing Optional, Union, imported at the
+# top of each file that carries this block
+
+# US federal holidays (5 U.S.C. 6103) as (name, month, rule). rule is the day
+# of the month for fixed-date holidays, or (weekday, n) for the nth weekday of
+# the month with n = -1 for the last one (weekday 0 = Monday).
+FEDERAL_HOLIDAY_RULES = (
+    ("New Year's Day", 1, 1),
+    ('Martin Luther King Jr. Day', 1, (0, 3)),
+    ("Washington's Birthday", 2, (0, 3)),
+    ('Memorial Day', 5, (0, -1)),
+    ('Juneteenth', 6, 19),
+    ('Independence Day', 7, 4),
+    ('Labor Day', 9, (0, 1)),
+    ('Columbus Day', 10, (0, 2)),
+    ('Veterans Day', 11, 11),
+    ('Thanksgiving Day', 11, (3, 4)),
+    ('Christmas Day', 12, 25)
+)
+
+
+def holiday_date(year: int, month: int, rule) -> date:
+    """Resolve a holiday rule to its actual date in year"""
+    if isinstance(rule, int):
+        return date(year, month, rule)
+
+    weekday, n = rule
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed_date(holiday: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+class HolidayCalendar:
+    """
+    Holidays for first_year..last_year as a frozenset of date ordinals.
+
+    Both the actual and the observed date of a holiday are included (call on
+    the Saturday July 4th and on the Friday it is observed are both holiday
+    calls). Lookups accept ordinals, date objects or ISO date strings.
+    """
+
+    def __init__(self, first_year: int, last_year: int, rules=FEDERAL_HOLIDAY_RULES,
+                 include_observed: bool = True):
+        names = {}
+        for year in range(first_year, last_year + 1):
+            for name, month, rule in rules:
+                holiday = holiday_date(year, month, rule)
+                names.setdefault(holiday.toordinal(), name)
+                observed = observed_date(holiday)
+                if include_observed and observed != holiday:
+                    names.setdefault(observed.toordinal(), f'{name} (observed)')
+
+        self.first_year = first_year
+        self.last_year = last_year
+        self.names = names
+        self.ordinals = frozenset(names)
+
+    @classmethod
+    def for_range(cls, first_day, last_day, **kwargs) -> 'HolidayCalendar':
+        """Calendar covering two dates, plus the next year for a Dec 31 observed New Year's Day"""
+        first_year = date.fromordinal(cls.to_ordinal(first_day)).year
+        last_year = date.fromordinal(cls.to_ordinal(last_day)).year
+        return cls(first_year, last_year + 1, **kwargs)
+
+    @staticmethod
+    def to_ordinal(day: Union[int, date, str]) -> int:
+        if isinstance(day, int):
+            return day
+        if isinstance(day, date):
+            return day.toordinal()
+        return date.fromisoformat(day[:10]).toordinal()
+
+    def covers(self, first_day, last_day) -> bool:
+        """True when the calendar was built for every year between the two dates"""
+        # The day after last_day must be covered too: a Saturday New Year's Day
+        # is observed on Dec 31 of the previous year
+        return (self.first_year <= date.fromordinal(self.to_ordinal(first_day)).year and
+                date.fromordinal(self.to_ordinal(last_day) + 1).year <= self.last_year)
+
+    def is_holiday(self, day: Union[int, date, str]) -> bool:
+        return self.to_ordinal(day) in self.ordinals
+
+    def name(self, day: Union[int, date, str]) -> Optional[str]:
+        return self.names.get(self.to_ordinal(day))
+
+    def __contains__(self, day) -> bool:
+        return self.is_holiday(day)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+
+# -----------------------------------------------------------------------------
+# END SHARED HOLIDAY CALENDAR
+# -----------------------------------------------------------------------------
+
+
+def main(argv=None) -> None:
+    years = [int(year) for year in (argv or [])] or [date.today().year]
+    calendar = HolidayCalendar(min(years), max(years))
+
+    for ordinal in sorted(calendar.ordinals):
+        day = date.fromordinal(ordinal)
+        print(f'{day.isoformat()} {day.strftime("%a")} {calendar.names[ordinal]}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
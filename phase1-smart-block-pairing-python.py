@@ -0,0 +1,201 @@
+"""
+PHASE 1: SMART BLOCK PAIRING - HASH-JOIN ENGINE (PYTHON TWIN)
+Python twin of the "Smart Pairing Engine" node in UPDATED-phase1-smart-block-pairing.json.
+
+The n8n node and this module share the same algorithm:
+- Templates are indexed once by (Day, Half-day)
+- Half-days are paired in a single pass with O(1) index lookups
+- Multiple templates per key are ordered by Rotation Slot ID (numerically when
+  numeric), then record id
+- Per-key match counts are reported for diagnostics
+
+The legacy templates.find() scan is kept as pair_half_days_linear_scan() so the
+two can be benchmarked against each other on synthetic data:
+
+    python phase1-smart-block-pairing-python.py            # 10k and 100k half-days
+    python phase1-smart-block-pairing-python.py 50000      # custom sizes
+
+Dependencies: None (uses only Python standard library)
+"""
+
+from typing import Dict, List, Any, Optional, Tuple
+import random
+import re
+import sys
+import time
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+HALF_DAYS = ['AM', 'PM']
+
+# Rotation Slot IDs compared as numbers (same pattern as the JS node)
+NUMERIC_SLOT = re.compile(r'-?[0-9]+(\.[0-9]+)?')
+
+
+# =============================================================================
+# HASH-JOIN PAIRING ENGINE
+# =============================================================================
+
+def pairing_key(day: Any, half_day: Any) -> str:
+    """Join key shared by half-days and templates (matches the JS node)."""
+    return f'{day}|{half_day}'
+
+
+def tie_break_key(template: Dict[str, Any]) -> Tuple[int, Any, str]:
+    """
+    Deterministic ordering for templates that share a join key: numeric
+    Rotation Slot IDs first, compared as numbers (slot 2 before slot 10),
+    then the others as strings, then record id.
+    """
+    slot_id = template.get('Rotation Slot ID')
+    record_id = '' if template.get('id') is None else str(template.get('id'))
+    slot = '' if slot_id is None else str(slot_id)
+    if NUMERIC_SLOT.fullmatch(slot):
+        return (0, float(slot), record_id)
+    return (1, slot, record_id)
+
+
+def build_template_index(templates: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Bucket templates by (Day, Half-day) and sort each bucket by tie-break key."""
+    index: Dict[str, List[Dict[str, Any]]] = {}
+    for template in templates:
+        key = pairing_key(template.get('Day'), template.get('Half-day'))
+        index.setdefault(key, []).append(template)
+
+    for bucket in index.values():
+        bucket.sort(key=tie_break_key)
+    return index
+
+
+def pair_half_days(half_days: List[Dict[str, Any]],
+                   templates: List[Dict[str, Any]]) -> Tuple[List[Dict], Dict[str, Dict[str, int]]]:
+    """
+    Pair each half-day with its best matching template in one pass.
+
+    Returns:
+        (pairings, key_stats) where key_stats maps each join key seen on the
+        half-day side to {'halfDays', 'templates', 'paired'} counts.
+    """
+    index = build_template_index(templates)
+    pairings = []
+    key_stats: Dict[str, Dict[str, int]] = {}
+
+    for half_day in half_days:
+        key = pairing_key(half_day.get('Day of the Week of Block'), half_day.get('Time of Day'))
+        candidates = index.get(key, [])
+
+        stats = key_stats.get(key)
+        if stats is None:
+            stats = key_stats[key] = {'halfDays': 0, 'templates': len(candidates), 'paired': 0}
+        stats['halfDays'] += 1
+
+        if candidates:
+            template = candidates[0]
+            stats['paired'] += 1
+            pairings.append({
+                'halfDayId': half_day.get('id'),
+                'templateId': template.get('id'),
+                'activity': template.get('Activity'),
+                'candidateTemplates': len(candidates),
+                'absenceChecked': True
+            })
+
+    return pairings, key_stats
+
+
+def pair_half_days_linear_scan(half_days: List[Dict[str, Any]],
+                               templates: List[Dict[str, Any]]) -> List[Dict]:
+    """Legacy templates.find() pairing: O(halfDays x templates), first match wins."""
+    pairings = []
+    for half_day in half_days:
+        template = next((
+            t for t in templates
+            if t.get('Day') == half_day.get('Day of the Week of Block')
+            and t.get('Half-day') == half_day.get('Time of Day')
+        ), None)
+
+        if template:
+            pairings.append({
+                'halfDayId': half_day.get('id'),
+                'templateId': template.get('id'),
+                'activity': template.get('Activity'),
+                'absenceChecked': True
+            })
+    return pairings
+
+
+# =============================================================================
+# SYNTHETIC BENCHMARK
+# =============================================================================
+
+def generate_synthetic_inputs(half_day_count: int, template_count: int = 200,
+                              seed: int = 42) -> Tuple[List[Dict], List[Dict]]:
+    """Generate HDoWoB records and rotation templates with realistic key skew."""
+    rng = random.Random(seed)
+
+    templates = []
+    for index in range(template_count):
+        templates.append({
+            'id': f'rec_tpl_{index:05d}',
+            'Rotation Slot ID': f'slot_{rng.randint(0, template_count):05d}',
+            # Weekend keys stay sparse so some half-days remain unmatched
+            'Day': rng.choice(DAYS[:5] * 4 + DAYS[5:]),
+            'Half-day': rng.choice(HALF_DAYS),
+            'Activity': f'Activity {index % 25}'
+        })
+
+    half_days = []
+    for index in range(half_day_count):
+        half_days.append({
+            'id': f'rec_hd_{index:06d}',
+            'HDoWoB ID': index + 1,
+            'Day of the Week of Block': DAYS[(index // 2) % 7],
+            'Time of Day': HALF_DAYS[index % 2]
+        })
+
+    return half_days, templates
+
+
+def benchmark(half_day_count: int, template_count: int = 200) -> Dict[str, Any]:
+    """Time the hash-join engine against the legacy scan on one synthetic input."""
+    half_days, templates = generate_synthetic_inputs(half_day_count, template_count)
+
+    start = time.perf_counter()
+    pairings, key_stats = pair_half_days(half_days, templates)
+    hash_join_seconds = time.perf_counter() - start
+
+    # Feed the legacy scan pre-sorted templates so both pick the same winner
+    sorted_templates = sorted(templates, key=tie_break_key)
+    start = time.perf_counter()
+    legacy_pairings = pair_half_days_linear_scan(half_days, sorted_templates)
+    linear_scan_seconds = time.perf_counter() - start
+
+    identical = [(p['halfDayId'], p['templateId']) for p in pairings] == \
+                [(p['halfDayId'], p['templateId']) for p in legacy_pairings]
+
+    return {
+        'halfDays': half_day_count,
+        'templates': template_count,
+        'pairings': len(pairings),
+        'keys': len(key_stats),
+        'hashJoinSeconds': hash_join_seconds,
+        'linearScanSeconds': linear_scan_seconds,
+        'speedup': linear_scan_seconds / hash_join_seconds if hash_join_seconds > 0 else None,
+        'identicalPairings': identical
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    sizes = [int(arg) for arg in (argv or [])] or [10_000, 100_000]
+
+    print('=== PHASE 1 PAIRING BENCHMARK: HASH-JOIN vs templates.find() ===')
+    for size in sizes:
+        result = benchmark(size)
+        print(f"{result['halfDays']:>8} half-days x {result['templates']} templates: "
+              f"hash-join {result['hashJoinSeconds'] * 1000:.1f} ms, "
+              f"linear scan {result['linearScanSeconds'] * 1000:.1f} ms "
+              f"({result['speedup']:.1f}x), "
+              f"{result['pairings']} pairings, identical={result['identicalPairings']}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -12,9 +12,152 @@ Dependencies: None (uses only Python standard library)
 Compatible with: Pyodide in n8n Python Code node
 """
 
+from array import array
+from bisect import bisect_right
+import heapq
 from datetime import datetime, date
-from typing import Dict, List, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import json
+import re
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+# SHARED ACTIVITY CLASSIFIER (source: activity-classifier-python.py)
+# -----------------------------------------------------------------------------
+# Uses re, functools.lru_cache and typing Any, Optional, Sequence, Tuple,
+# imported at the top of each file that carries this block
+
+# Distinct activity strings are few (a few dozen per year); the bound only
+# guards against free-text activities growing the cache without limit
+ACTIVITY_CACHE_SIZE = 1024
+
+# Rule tables: (label, keywords) in priority order. The first rule with any
+# keyword contained in the activity (case-insensitive) wins.
+ACTIVITY_TYPE_RULES = (
+    ('procedure', ('procedure', 'vasectomy', 'botox')),
+    ('clinic', ('clinic', 'continuity')),
+    ('inpatient', ('inpatient', 'hospital'))
+)
+
+DUTY_CATEGORY_RULES = (
+    ('sports', ('sports medicine',)),
+    ('clinic', ('clinic', 'continuity')),
+    ('gme', ('conference', 'education', 'didactic', 'grand rounds')),
+    ('dfm', ('admin', 'leadership'))
+)
+
+# CRITICAL services need 24/7/365 coverage
+CRITICALITY_RULES = (
+    ('CRITICAL', ('family medicine inpatient', 'inpatient team', 'overnight call',
+                  'emergency', 'procedure', 'surgery', 'trauma')),
+    ('HIGH', ('clinic', 'continuity', 'specialty')),
+    ('MEDIUM', ('conference', 'education', 'didactic', 'grand rounds'))
+)
+
+
+class ActivityClassifier:
+    """
+    Keyword classifier compiled into one regex, memoized per activity string.
+
+    Every keyword becomes an alternative inside a lookahead, ordered by rule
+    priority, so a single finditer() pass sees the best rule matching at each
+    position (including overlapping keywords). Results are cached with an LRU
+    bound.
+    """
+
+    def __init__(self, rules: Sequence[Tuple[str, Sequence[str]]], default: Any = None,
+                 cache_size: Optional[int] = ACTIVITY_CACHE_SIZE):
+        self.labels = [label for label, _ in rules]
+        self.default = default
+        self._priority = {}
+        alternatives = []
+        for priority, (_, keywords) in enumerate(rules):
+            for keyword in keywords:
+                self._priority.setdefault(keyword.lower(), priority)
+                alternatives.append(re.escape(keyword.lower()))
+        self._pattern = re.compile('(?=(' + '|'.join(alternatives) + '))', re.IGNORECASE) if alternatives else None
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, activity: Optional[str]) -> Any:
+        if not activity or self._pattern is None:
+            return self.default
+        best = None
+        for match in self._pattern.finditer(activity):
+            priority = self._priority[match.group(1).lower()]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+        return self.default if best is None else self.labels[best]
+
+    def cache_info(self):
+        """functools cache statistics (hits, misses, maxsize, currsize)."""
+        return self.classify.cache_info()
+
+
+# -----------------------------------------------------------------------------
+# END SHARED ACTIVITY CLASSIFIER
+# -----------------------------------------------------------------------------
+
+# -----------------------------------------------------------------------------
+# SHARED RECORD ENVELOPES (source: record-envelopes-python.py)
+# -----------------------------------------------------------------------------
+# Envelope keys the "Tag ..." node after each Airtable search adds to a record
+SOURCE_KEY = '_source'
+SCHEMA_KEY = '_schema'
+
+# Schema version of each source table's fields. Bump a table's version when
+# the fields its search nodes project change meaning, so engines built for
+# the old shape reject its records instead of misreading them
+TABLE_SCHEMAS = {
+    'tbl17gcDUtXc14Rjv': 1,  # Master Assignments
+    'tbloGnXnu0mC6y83L': 1,  # Faculty Assignments
+    'tbl15U9cF0uig9IEo': 1,  # Call Schedule
+    'tblmgzodmqTsJ5inf': 1,  # Faculty
+    'tbl3TfpZSGYGxLCIG': 1,  # Residents
+    'tbltYT3HMWxGCcCfo': 1,  # Primary Duties
+    'tblJvewumPqMBl6Ut': 1,  # Faculty Leave
+    'tblQl3C95p0UE6F0P': 1,  # Resident Absences
+    'tblLUzjfad4B1GQ1a': 1,  # Rotation Templates
+    'tblTP62YOkF75o5aO': 1   # Half-Day of the Week of Blocks
+}
+
+
+def phase_source(phase) -> str:
+    """Envelope source of an upstream phase result ({'phase': n, ...})"""
+    return f'phase-{phase}'
+
+
+def dispatch_records(records, routes: dict, schemas: dict = TABLE_SCHEMAS) -> tuple:
+    """
+    Bucket records in one pass: routes maps a source (table ID or
+    phase_source(n)) to a bucket name. Returns (buckets, rejected), every
+    bucket of routes present, rejected as (reason, record) pairs for
+    'untagged' records, 'unrouted' sources and 'schema' version mismatches.
+    """
+    buckets = {bucket: [] for bucket in routes.values()}
+    # source -> (bucket list, expected schema version or None)
+    lanes = {source: (buckets[bucket], schemas.get(source)) for source, bucket in routes.items()}
+    rejected = []
+    for data in records:
+        source = data.get(SOURCE_KEY)
+        if source is None and data.get('phase') is not None:
+            source = phase_source(data['phase'])
+        lane = lanes.get(source)
+        if lane is None:
+            rejected.append(('untagged' if source is None else 'unrouted', data))
+        elif lane[1] is not None and data.get(SCHEMA_KEY) != lane[1]:
+            rejected.append(('schema', data))
+        else:
+            lane[0].append(data)
+    return buckets, rejected
+
+
+# -----------------------------------------------------------------------------
+# END SHARED RECORD ENVELOPES
+# -----------------------------------------------------------------------------
 
 # =============================================================================
 # MAIN EXECUTION: Phase 3 Enhanced Faculty Assignment
@@ -30,33 +173,44 @@ print(f'Received {len(all_items)} items from merge')
 # DATA SEPARATION: Identify upstream phase results and input data
 # =============================================================================
 
-master_assignments = []
-faculty_data = []
-clinic_templates = []
-phase0_absence_data = None
-phase1_smart_pairings = None
-phase2_resident_associations = None
-
-for item in all_items:
-    data = item['json']
-
-    # Identify data sources by their structure
-    if data.get('phase') == 0 and 'absence_data' in data:
-        phase0_absence_data = data['absence_data']
-    elif data.get('phase') == 1 and 'smart_pairings' in data:
-        phase1_smart_pairings = data
-    elif data.get('phase') == 2 and 'resident_associations' in data:
-        phase2_resident_associations = data
-    elif 'Half-Day of the Week of Blocks' in data and 'Resident (from Residency Block Schedule)' in data:
-        master_assignments.append(data)
-    elif 'Faculty' in data and 'Last Name' in data and 'Leave Start' not in data:
-        faculty_data.append(data)
-    elif 'Name' in data and data.get('Category') == 'Attending':
-        clinic_templates.append(data)
+# Upstream phase results by phase number, Airtable records by the source
+# table the "Tag ..." node after each search adds
+PHASE3_ROUTES = {
+    phase_source(0): 'phase0',
+    phase_source(1): 'phase1',
+    phase_source(2): 'phase2',
+    phase_source(3): 'phase3',
+    'tblTP62YOkF75o5aO': 'half_days',
+    'tbl17gcDUtXc14Rjv': 'master',
+    'tblmgzodmqTsJ5inf': 'faculty',
+    'tblLUzjfad4B1GQ1a': 'templates'
+}
+
+inputs, rejected_records = dispatch_records((item['json'] for item in all_items), PHASE3_ROUTES)
+
+
+def latest_result(bucket: str, key: str) -> Optional[Dict]:
+    """Last upstream phase result in bucket that carries key"""
+    return next((data for data in reversed(inputs[bucket]) if key in data), None)
+
+
+master_assignments = inputs['master']
+faculty_data = inputs['faculty']
+clinic_templates = inputs['templates']
+half_day_records = inputs['half_days']
+phase0_absence_data = (latest_result('phase0', 'absence_data') or {}).get('absence_data')
+phase1_smart_pairings = latest_result('phase1', 'smart_pairings')
+phase2_resident_associations = latest_result('phase2', 'resident_associations')
+solver_config = (latest_result('phase3', 'solver_config') or {}).get('solver_config', {})
+
+if rejected_records:
+    print(f'Skipped {len(rejected_records)} records: ' +
+          ', '.join(sorted({f'{reason} {record.get(SOURCE_KEY)}' for reason, record in rejected_records})))
 
 print(f'Found: {len(master_assignments)} master assignments with residents')
 print(f'Found: {len(faculty_data)} active faculty')
 print(f'Found: {len(clinic_templates)} clinic templates')
+print(f'Found: {len(half_day_records)} half-day (HDoWoB) records')
 print(f'Phase 0 absence data: {"Available" if phase0_absence_data else "MISSING - CRITICAL ERROR"}')
 print(f'Phase 1 smart pairings: {"Available" if phase1_smart_pairings else "MISSING - CRITICAL ERROR"}')
 print(f'Phase 2 associations: {"Available" if phase2_resident_associations else "OK if running standalone"}')
@@ -64,11 +218,234 @@ print(f'Phase 2 associations: {"Available" if phase2_resident_associations else
 if not phase0_absence_data:
     raise ValueError('Phase 3 Enhanced requires Phase 0 absence data for intelligent faculty assignment')
 
+# =============================================================================
+# PHASE 0 ABSENCE INDEX READER
+# =============================================================================
+
+class AbsenceIntervalIndex:
+    """
+    Read-only view over the Phase 0 interval absence index.
+
+    Phase 0 emits, per person, sorted non-overlapping [start, end, timeOfDay,
+    recordRef] intervals plus a shared records list. Lookups bisect on the
+    interval start dates, so point and range queries are O(log n) per person.
+    Legacy per-day calendars ({personId: {date: record}}) are accepted too and
+    loaded as one-day intervals.
+    """
+
+    def __init__(self, index: Dict[str, Dict]):
+        self._starts: Dict[str, List[str]] = {}
+        self._intervals: Dict[str, List[List]] = {}
+        self._records: Dict[str, List[Dict]] = {}
+
+        for person_id, entry in index.items():
+            intervals = sorted(entry.get('intervals', []), key=lambda interval: interval[0])
+            self._intervals[person_id] = intervals
+            self._starts[person_id] = [interval[0] for interval in intervals]
+            self._records[person_id] = entry.get('records', [])
+
+    @classmethod
+    def from_daily_calendar(cls, calendar: Dict[str, Dict[str, Dict]]) -> 'AbsenceIntervalIndex':
+        """Build an index from the legacy per-day absence calendar."""
+        index = {}
+        for person_id, days in calendar.items():
+            records = list(days.values())
+            index[person_id] = {
+                'intervals': [
+                    [date_str, date_str, record.get('timeOfDay', 'All Day'), ref]
+                    for ref, (date_str, record) in enumerate(days.items())
+                ],
+                'records': records
+            }
+        return cls(index)
+
+    @classmethod
+    def from_phase0(cls, absence_data: Dict, kind: str = 'faculty') -> 'AbsenceIntervalIndex':
+        """
+        Build the index for 'faculty' or 'resident' absences from Phase 0 output.
+
+        Prefers the interval index and falls back to the per-day calendar.
+        """
+        interval_index = absence_data.get(f'{kind}AbsenceIndex')
+        if interval_index is not None:
+            return cls(interval_index)
+        return cls.from_daily_calendar(absence_data.get(f'{kind}Absences', {}))
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._intervals
+
+    def _record(self, person_id: str, interval: List, date_str: str) -> Dict:
+        record = dict(self._records[person_id][interval[3]])
+        record['date'] = date_str
+        record['timeOfDay'] = interval[2]
+        return record
+
+    def lookup(self, person_id: str, date_str: str,
+               time_of_day: Optional[str] = None) -> Optional[Dict]:
+        """
+        Return the absence covering a date, or None.
+
+        With time_of_day set, only absences for that half-day or 'All Day'
+        count, matching the original per-day calendar check.
+        """
+        starts = self._starts.get(person_id)
+        if not starts:
+            return None
+
+        position = bisect_right(starts, date_str) - 1
+        if position < 0:
+            return None
+
+        interval = self._intervals[person_id][position]
+        if interval[1] < date_str:
+            return None
+        if time_of_day is not None and interval[2] not in ('All Day', time_of_day):
+            return None
+        return self._record(person_id, interval, date_str)
+
+    def overlapping(self, person_id: str, start_date: str, end_date: str) -> List[Dict]:
+        """Return every absence interval intersecting [start_date, end_date]."""
+        starts = self._starts.get(person_id)
+        if not starts:
+            return []
+
+        intervals = self._intervals[person_id]
+        position = max(bisect_right(starts, start_date) - 1, 0)
+        overlaps = []
+        for interval in intervals[position:]:
+            if interval[0] > end_date:
+                break
+            if interval[1] >= start_date:
+                record = self._record(person_id, interval, max(interval[0], start_date))
+                record['start'] = interval[0]
+                record['end'] = interval[1]
+                overlaps.append(record)
+        return overlaps
+
+
 # Extract absence data from Phase 0
 faculty_absences = phase0_absence_data.get('facultyAbsences', {})
+faculty_absence_index = AbsenceIntervalIndex.from_phase0(phase0_absence_data, 'faculty')
 faculty_reference = phase0_absence_data.get('facultyReference', {})
 
-print(f'Loaded faculty absences for {len(faculty_absences)} faculty')
+print(f'Loaded faculty absences for {len(faculty_absence_index)} faculty')
+
+# =============================================================================
+# PHASE 1 HALF-DAY INDEX
+# =============================================================================
+
+# Time-of-day codes stored in HalfDayIndex.slots
+HALF_DAY_TIMES = ('AM', 'PM', 'All Day')
+WEEKDAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+
+def first_value(value: Any) -> Any:
+    """Unwrap Airtable lookup/link arrays to their first element."""
+    if isinstance(value, list):
+        return value[0] if value else None
+    return value
+
+
+class HalfDayIndex:
+    """
+    Half-day record id -> date, time of day and weekday, built once per run.
+
+    Record ids are interned and mapped to a row number. Row attributes live in
+    parallel arrays (date ordinals in an array('i'), time-of-day codes in a
+    bytearray, block numbers in a list); the weekday is derived from the
+    ordinal, so lookups never parse dates.
+    """
+
+    def __init__(self):
+        self.rows: Dict[str, int] = {}
+        self.ordinals = array('i')
+        self.slots = bytearray()
+        self.block_numbers: List[Optional[int]] = []
+        self._iso_dates: Dict[int, str] = {}
+
+    @classmethod
+    def from_records(cls, half_day_records: List[Dict],
+                     master_assignments: List[Dict] = ()) -> 'HalfDayIndex':
+        """
+        Build the index from Phase 1 HDoWoB records.
+
+        Master assignments fill in half-days missing from the records using
+        their Date/Time of Day lookup fields.
+        """
+        index = cls()
+        for record in half_day_records:
+            index.add(
+                record.get('id'),
+                first_value(record.get('Date of Day of the Week of Block')),
+                first_value(record.get('Time of Day')),
+                first_value(record.get('Block Number'))
+            )
+
+        for assignment in master_assignments:
+            dates = assignment.get('Date (from Half-Day of the Week of Blocks)', assignment.get('Date'))
+            times = assignment.get('Time of Day (from Half-Day of the Week of Blocks)', assignment.get('Time of Day'))
+            dates = dates if isinstance(dates, list) else [dates]
+            times = times if isinstance(times, list) else [times]
+            for position, half_day_id in enumerate(assignment.get('Half-Day of the Week of Blocks', [])):
+                if half_day_id in index.rows:
+                    continue
+                # A single lookup value applies to every linked half-day
+                index.add(
+                    half_day_id,
+                    dates[position] if position < len(dates) else dates[0] if len(dates) == 1 else None,
+                    times[position] if position < len(times) else times[0] if len(times) == 1 else None
+                )
+        return index
+
+    def add(self, half_day_id: Optional[str], date_value: Optional[str],
+            time_of_day: Optional[str], block_number: Optional[int] = None) -> bool:
+        """Add one half-day; returns False if it is incomplete or already indexed."""
+        if not half_day_id or half_day_id in self.rows or time_of_day not in HALF_DAY_TIMES:
+            return False
+        try:
+            ordinal = date.fromisoformat(str(date_value)[:10]).toordinal()
+        except ValueError:
+            return False
+
+        self.rows[sys.intern(half_day_id)] = len(self.ordinals)
+        self.ordinals.append(ordinal)
+        self.slots.append(HALF_DAY_TIMES.index(time_of_day))
+        self.block_numbers.append(block_number)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __contains__(self, half_day_id: str) -> bool:
+        return half_day_id in self.rows
+
+    def iso_date(self, ordinal: int) -> str:
+        """ISO date string for a date ordinal (memoized)."""
+        iso = self._iso_dates.get(ordinal)
+        if iso is None:
+            iso = self._iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+        return iso
+
+    def info(self, half_day_id: str) -> Optional[Dict]:
+        """Half-day info dict as used by the engine, or None if unknown."""
+        row = self.rows.get(half_day_id)
+        if row is None:
+            return None
+        ordinal = self.ordinals[row]
+        return {
+            'date': self.iso_date(ordinal),
+            'dateOrdinal': ordinal,
+            'timeOfDay': HALF_DAY_TIMES[self.slots[row]],
+            'dayOfWeek': WEEKDAY_NAMES[(ordinal - 1) % 7].capitalize(),
+            'blockNumber': self.block_numbers[row]
+        }
+
+
+half_day_index = HalfDayIndex.from_records(half_day_records, master_assignments)
+print(f'Indexed {len(half_day_index)} half-days')
 
 # =============================================================================
 # ACGME SUPERVISION RATIOS AND SPECIALTY REQUIREMENTS
@@ -92,6 +469,24 @@ SUPERVISION_RATIOS = {
     }
 }
 
+# Pack residents sharing a date, half-day and activity type onto one faculty
+# member up to the supervision ratio (one faculty assignment per pool).
+# Pooled assignments carry their members in assignmentIds/residentIds, but
+# Phases 4-9 still read one faculty assignment per master assignment, so
+# pooling stays off until they consume the member lists
+SUPERVISION_POOLING = False
+
+# Faculty assignment solver: 'greedy' (input order) or 'flow' (min-cost flow
+# per block or week, falling back to greedy once the time budget is spent).
+# compareWithGreedy re-runs the greedy engine in flow mode to report both gap
+# counts; it doubles the work, so it is off outside of diagnostics
+ASSIGNMENT_SOLVER = {
+    'mode': 'greedy',
+    'timeBudgetSeconds': 20.0,
+    'horizon': 'week',
+    'compareWithGreedy': False
+}
+
 SPECIALTY_REQUIREMENTS = {
     'Sports Medicine': {
         'requiredFaculty': ['rec4F7XQKFyDjXn5n'],  # Tagawa's ID
@@ -107,6 +502,9 @@ SPECIALTY_REQUIREMENTS = {
     }
 }
 
+# Activity types produced by determine_activity_type()
+ACTIVITY_TYPES = tuple(label for label, _ in ACTIVITY_TYPE_RULES)
+
 # =============================================================================
 # ENHANCED FACULTY LOOKUP CREATION
 # =============================================================================
@@ -143,7 +541,6 @@ for faculty in faculty_data:
         },
         'totalInpatientWeeks': faculty.get('Total Inpatient Weeks', 0),
         'workloadCapacity': calculate_workload_capacity(faculty),
-        'absenceCalendar': faculty_absences.get(faculty_id, {}),  # PHASE 0 INTEGRATION
         'currentWorkload': 0  # Will be tracked during assignment
     }
 
@@ -163,6 +560,220 @@ for template in clinic_templates:
     })
 
 
+# =============================================================================
+# FACULTY AVAILABILITY MATRIX
+# =============================================================================
+
+HALF_DAY_SLOTS = ('AM', 'PM')
+
+
+class FacultyAvailabilityMatrix:
+    """
+    Dense dates x half-day slots x faculty availability, built once per run.
+
+    Cells are stored row-major in a bytearray (one row per date/slot, one byte
+    per faculty in engine faculty order), alongside an integer bitset per row
+    so a whole slot can be intersected with an eligibility class in one AND.
+    Availability combines the availableDays flags with Phase 0 absences;
+    workload capacity is tracked separately by the engine.
+    """
+
+    def __init__(self, faculty_order: List[Dict], absence_index: AbsenceIntervalIndex,
+                 start_date: str, end_date: str):
+        self.faculty_count = len(faculty_order)
+        self.start_ordinal = date.fromisoformat(start_date).toordinal()
+        self.day_count = date.fromisoformat(end_date).toordinal() - self.start_ordinal + 1
+        self.cells = bytearray(self.day_count * len(HALF_DAY_SLOTS) * self.faculty_count)
+        self.row_masks = [0] * (self.day_count * len(HALF_DAY_SLOTS))
+        self._date_indexes: Dict[str, Optional[int]] = {}
+
+        # Day-of-week availability, one bitset per weekday
+        weekday_masks = [0] * len(WEEKDAY_NAMES)
+        for bit, faculty in enumerate(faculty_order):
+            for weekday, name in enumerate(WEEKDAY_NAMES):
+                if faculty['availableDays'].get(name, False):
+                    weekday_masks[weekday] |= 1 << bit
+
+        for day in range(self.day_count):
+            weekday_mask = weekday_masks[date.fromordinal(self.start_ordinal + day).weekday()]
+            for slot in range(len(HALF_DAY_SLOTS)):
+                self.row_masks[day * len(HALF_DAY_SLOTS) + slot] = weekday_mask
+
+        # Clear absent cells straight from the Phase 0 intervals
+        for bit, faculty in enumerate(faculty_order):
+            for absence in absence_index.overlapping(faculty['id'], start_date, end_date):
+                first = max(date.fromisoformat(absence['start']).toordinal() - self.start_ordinal, 0)
+                last = min(date.fromisoformat(absence['end']).toordinal() - self.start_ordinal, self.day_count - 1)
+                slots = [slot for slot, name in enumerate(HALF_DAY_SLOTS)
+                         if absence['timeOfDay'] in ('All Day', name)]
+                for day in range(first, last + 1):
+                    for slot in slots:
+                        self.row_masks[day * len(HALF_DAY_SLOTS) + slot] &= ~(1 << bit)
+
+        for row, mask in enumerate(self.row_masks):
+            offset = row * self.faculty_count
+            for bit in range(self.faculty_count):
+                if mask >> bit & 1:
+                    self.cells[offset + bit] = 1
+
+    def date_index(self, date_str: str) -> Optional[int]:
+        """Integer date index for an ISO date, or None outside the matrix (memoized)."""
+        if date_str not in self._date_indexes:
+            try:
+                day = date.fromisoformat(date_str).toordinal() - self.start_ordinal
+            except (TypeError, ValueError):
+                day = -1
+            self._date_indexes[date_str] = day if 0 <= day < self.day_count else None
+        return self._date_indexes[date_str]
+
+    def is_available(self, date_index: int, slot: int, faculty_bit: int) -> bool:
+        """O(1) cell lookup by integer date index, slot index and faculty position."""
+        return self.cells[(date_index * len(HALF_DAY_SLOTS) + slot) * self.faculty_count + faculty_bit] == 1
+
+    def available_mask(self, date_index: int, slot: int) -> int:
+        """Bitset of every faculty available in one date/slot."""
+        return self.row_masks[date_index * len(HALF_DAY_SLOTS) + slot]
+
+
+# =============================================================================
+# MIN-COST FLOW SOLVER (OPTIONAL GLOBAL ASSIGNMENT MODE)
+# =============================================================================
+
+# Integer cost units per 1.0 of utilization score
+FLOW_COST_SCALE = 10000
+
+
+class SolverTimeout(Exception):
+    """Raised when the min-cost flow solver exceeds its time budget."""
+
+
+class MinCostFlow:
+    """
+    Min-cost max-flow via successive shortest paths (pure Python, Pyodide-safe).
+
+    Uses Dijkstra with Johnson potentials, so all edge costs must be
+    non-negative integers. Edges are stored as [to, capacity, cost, reverse].
+    """
+
+    def __init__(self, node_count: int):
+        self.graph: List[List[List[int]]] = [[] for _ in range(node_count)]
+
+    def add_edge(self, source: int, target: int, capacity: int, cost: int) -> Tuple[int, int]:
+        """Add an edge and return a handle for reading its flow later."""
+        self.graph[source].append([target, capacity, cost, len(self.graph[target])])
+        self.graph[target].append([source, 0, -cost, len(self.graph[source]) - 1])
+        return (source, len(self.graph[source]) - 1)
+
+    def flow_on(self, handle: Tuple[int, int]) -> int:
+        """Flow currently pushed through an edge added with add_edge()."""
+        source, index = handle
+        target, _, _, reverse = self.graph[source][index]
+        return self.graph[target][reverse][1]
+
+    def solve(self, source: int, sink: int, deadline: Optional[float] = None) -> Tuple[int, int]:
+        """Push maximum flow at minimum cost; returns (flow, cost)."""
+        node_count = len(self.graph)
+        potential = [0] * node_count
+        total_flow = 0
+        total_cost = 0
+
+        while True:
+            if deadline is not None and time.perf_counter() > deadline:
+                raise SolverTimeout()
+
+            distance = [None] * node_count
+            previous = [None] * node_count
+            distance[source] = 0
+            queue = [(0, source)]
+            while queue:
+                dist, node = heapq.heappop(queue)
+                if dist > distance[node]:
+                    continue
+                for index, (target, capacity, cost, _) in enumerate(self.graph[node]):
+                    if capacity <= 0:
+                        continue
+                    candidate = dist + cost + potential[node] - potential[target]
+                    if distance[target] is None or candidate < distance[target]:
+                        distance[target] = candidate
+                        previous[target] = (node, index)
+                        heapq.heappush(queue, (candidate, target))
+
+            if distance[sink] is None:
+                return total_flow, total_cost
+
+            for node in range(node_count):
+                if distance[node] is not None:
+                    potential[node] += distance[node]
+
+            # Bottleneck along the shortest path, then augment
+            push = None
+            node = sink
+            while node != source:
+                parent, index = previous[node]
+                capacity = self.graph[parent][index][1]
+                push = capacity if push is None else min(push, capacity)
+                node = parent
+
+            node = sink
+            while node != source:
+                parent, index = previous[node]
+                edge = self.graph[parent][index]
+                edge[1] -= push
+                self.graph[node][edge[3]][1] += push
+                total_cost += push * edge[2]
+                node = parent
+            total_flow += push
+
+
+# =============================================================================
+# LEAST-LOADED FACULTY SELECTION QUEUE
+# =============================================================================
+
+class FacultySelectionQueue:
+    """
+    Min-heap of faculty in one eligibility class, keyed on utilization.
+
+    Entries are (utilization, faculty bit, workload version). Invalidation is
+    lazy: an entry whose version no longer matches the engine's workload
+    version is re-scored when it reaches the top, and entries for faculty
+    outside the half-day's availability mask are set aside and restored after
+    the pick. Ties break on faculty bit (input order), so runs are
+    reproducible.
+    """
+
+    def __init__(self, class_mask: int, utilization, versions: List[int]):
+        self._utilization = utilization
+        self._versions = versions
+        self._heap = []
+        bit = 0
+        while class_mask >> bit:
+            if class_mask >> bit & 1:
+                self._heap.append((utilization(bit), bit, versions[bit]))
+            bit += 1
+        heapq.heapify(self._heap)
+
+    def best(self, available_mask: int) -> Optional[Tuple[float, int]]:
+        """Return (utilization, bit) of the least-loaded available faculty, or None."""
+        heap = self._heap
+        unavailable = []
+        best = None
+
+        while heap:
+            utilization, bit, version = heap[0]
+            if version != self._versions[bit]:
+                heapq.heapreplace(heap, (self._utilization(bit), bit, self._versions[bit]))
+                continue
+            if not available_mask >> bit & 1:
+                unavailable.append(heapq.heappop(heap))
+                continue
+            best = (utilization, bit)
+            break
+
+        for entry in unavailable:
+            heapq.heappush(heap, entry)
+        return best
+
+
 # =============================================================================
 # ENHANCED FACULTY ASSIGNMENT ENGINE CLASS
 # =============================================================================
@@ -179,11 +790,24 @@ class EnhancedFacultyAssignmentEngine:
     """
 
     def __init__(self, faculty_lookup: Dict, faculty_absences: Dict,
-                 supervision_ratios: Dict, specialty_requirements: Dict):
+                 supervision_ratios: Dict, specialty_requirements: Dict,
+                 absence_index: Optional[AbsenceIntervalIndex] = None,
+                 pool_supervision: bool = False,
+                 half_day_index: Optional[HalfDayIndex] = None):
         self.faculty_lookup = faculty_lookup
         self.faculty_absences = faculty_absences
+        # PHASE 0 INTEGRATION: interval index, or legacy per-day calendar
+        self.absence_index = absence_index or AbsenceIntervalIndex.from_daily_calendar(faculty_absences)
         self.supervision_ratios = supervision_ratios
         self.specialty_requirements = specialty_requirements
+        # Shared memoized classifiers (one regex pass per distinct activity)
+        self.activity_types = ActivityClassifier(ACTIVITY_TYPE_RULES, default='clinic')
+        self.specialties = ActivityClassifier([(name, (name,)) for name in specialty_requirements])
+        self.pool_supervision = pool_supervision
+        # PHASE 1 INTEGRATION: half-day id -> date/time of day lookup
+        self.half_day_index = half_day_index or HalfDayIndex()
+        self.unresolved_half_days = set()
+        self.processing_date = datetime.now().strftime('%Y-%m-%d')
         self.faculty_workload = {
             faculty_id: {
                 'totalAssignments': 0,
@@ -198,6 +822,102 @@ class EnhancedFacultyAssignmentEngine:
         self.absence_substitutions = []
         self.coverage_gaps = []
 
+        # Eligibility index: faculty as integer bitsets (bit i = faculty_order[i])
+        # keyed by (activity_type, specialty), built once per run
+        self.faculty_order = list(faculty_lookup.values())
+        self.faculty_bits = {faculty['id']: 1 << i for i, faculty in enumerate(self.faculty_order)}
+        self.eligibility_index = {}
+        for activity_type in ACTIVITY_TYPES:
+            for specialty in [None] + list(specialty_requirements.keys()):
+                self.build_eligibility(activity_type, specialty)
+
+        # Selection queues per eligibility bitset, invalidated through
+        # per-faculty workload versions
+        self.selection_queues: Dict[int, FacultySelectionQueue] = {}
+        self.workload_versions = [0] * len(self.faculty_order)
+
+        # Availability matrix (see build_availability_matrix) and the bitset
+        # of faculty that still have workload capacity
+        self.availability = None
+        self.capacity_mask = 0
+        for bit, faculty in enumerate(self.faculty_order):
+            if faculty['workloadCapacity'] > 0:
+                self.capacity_mask |= 1 << bit
+
+    def build_availability_matrix(self, start_date: str, end_date: str) -> FacultyAvailabilityMatrix:
+        """Precompute faculty availability for every date/slot in [start_date, end_date]."""
+        self.availability = FacultyAvailabilityMatrix(
+            self.faculty_order, self.absence_index, start_date, end_date
+        )
+        return self.availability
+
+    def available_faculty_mask(self, date_str: str, time_of_day: str,
+                               candidates_mask: Optional[int] = None) -> int:
+        """
+        Bitset of faculty available for a half-day, optionally within a candidate set.
+
+        Uses the availability matrix when the date/slot is covered and falls
+        back to per-faculty is_faculty_available() checks otherwise.
+        """
+        if candidates_mask is None:
+            candidates_mask = (1 << len(self.faculty_order)) - 1
+
+        date_index = self.availability.date_index(date_str) if self.availability else None
+        if date_index is not None and time_of_day in HALF_DAY_SLOTS:
+            slot = HALF_DAY_SLOTS.index(time_of_day)
+            return self.availability.available_mask(date_index, slot) & self.capacity_mask & candidates_mask
+
+        mask = 0
+        for faculty in self.faculty_from_mask(candidates_mask):
+            if self.is_faculty_available(faculty['id'], date_str, time_of_day):
+                mask |= self.faculty_bits[faculty['id']]
+        return mask
+
+    def record_workload(self, faculty_id: str, direct: bool) -> None:
+        """Count an assignment against a faculty member's workload and capacity."""
+        workload = self.faculty_workload[faculty_id]
+        workload['totalAssignments'] += 1
+        if direct:
+            workload['directSupervision'] += 1
+        else:
+            workload['indirectSupervision'] += 1
+
+        bit = self.faculty_bits[faculty_id]
+        self.workload_versions[bit.bit_length() - 1] += 1
+        if workload['totalAssignments'] >= self.faculty_lookup[faculty_id]['workloadCapacity']:
+            self.capacity_mask &= ~bit
+
+    def faculty_utilization(self, bit: int) -> float:
+        """Current load / capacity for the faculty at a bit position."""
+        faculty = self.faculty_order[bit]
+        capacity = faculty['workloadCapacity']
+        current_load = self.faculty_workload[faculty['id']]['totalAssignments']
+        return current_load / capacity if capacity > 0 else 1.0
+
+    def get_selection_queue(self, class_mask: int) -> FacultySelectionQueue:
+        """Selection queue for an eligibility bitset, created on first use."""
+        queue = self.selection_queues.get(class_mask)
+        if queue is None:
+            queue = FacultySelectionQueue(class_mask, self.faculty_utilization, self.workload_versions)
+            self.selection_queues[class_mask] = queue
+        return queue
+
+    def specialty_match_mask(self, supervision_need: Dict, eligible_mask: int) -> int:
+        """Bitset of eligible faculty earning the specialty-match bonus."""
+        requirement = supervision_need.get('specialtyRequirement')
+        if not requirement:
+            return 0
+
+        specialty = supervision_need.get('specialty')
+        if specialty in self.specialty_requirements:
+            return self.get_eligible_faculty(None, specialty)[0] & eligible_mask
+
+        mask = 0
+        for faculty in self.faculty_from_mask(eligible_mask):
+            if self.match_specialty_requirement(faculty, requirement):
+                mask |= self.faculty_bits[faculty['id']]
+        return mask
+
     def is_faculty_available(self, faculty_id: str, date_str: str,
                             time_of_day: str = 'AM') -> bool:
         """
@@ -217,13 +937,17 @@ class EnhancedFacultyAssignmentEngine:
 
         faculty = self.faculty_lookup[faculty_id]
 
-        # Check Phase 0 absence calendar
-        absence_calendar = faculty.get('absenceCalendar', {})
-        if date_str in absence_calendar:
-            absence = absence_calendar[date_str]
-            # Faculty unavailable if absence covers this time
-            if absence.get('timeOfDay') in ['All Day', time_of_day]:
+        # O(1) path through the precomputed availability matrix
+        date_index = self.availability.date_index(date_str) if self.availability else None
+        if date_index is not None and time_of_day in HALF_DAY_SLOTS:
+            bit = self.faculty_bits[faculty_id].bit_length() - 1
+            if not self.availability.is_available(date_index, HALF_DAY_SLOTS.index(time_of_day), bit):
                 return False
+            return self.faculty_workload[faculty_id]['totalAssignments'] < faculty['workloadCapacity']
+
+        # Check Phase 0 absence index (unavailable if an absence covers this time)
+        if self.absence_index.lookup(faculty_id, date_str, time_of_day):
+            return False
 
         # Check day-of-week availability
         try:
@@ -244,8 +968,7 @@ class EnhancedFacultyAssignmentEngine:
 
     def get_faculty_absence_info(self, faculty_id: str, date_str: str) -> Optional[Dict]:
         """Get faculty absence information for substitution (Phase 0 integration)."""
-        absence_calendar = self.faculty_lookup.get(faculty_id, {}).get('absenceCalendar', {})
-        return absence_calendar.get(date_str)
+        return self.absence_index.lookup(faculty_id, date_str)
 
     def match_specialty_requirement(self, faculty: Dict, requirement: Dict) -> bool:
         """Check if faculty matches specialty requirements."""
@@ -255,9 +978,47 @@ class EnhancedFacultyAssignmentEngine:
             return faculty.get('performsProcedures', False)
         return True
 
+    def build_eligibility(self, activity_type: str, specialty: Optional[str]) -> Tuple[int, List[Dict]]:
+        """
+        Compute the eligible faculty for an (activity_type, specialty) class.
+
+        Returns the class as an integer bitset and as a list in faculty order,
+        and caches both in the eligibility index.
+        """
+        requirement = self.specialty_requirements.get(specialty) if specialty else None
+        mask = 0
+        members = []
+        for index, faculty in enumerate(self.faculty_order):
+            if requirement and not self.match_specialty_requirement(faculty, requirement):
+                continue
+            if activity_type == 'procedure' and not faculty.get('performsProcedures', False):
+                continue
+            mask |= 1 << index
+            members.append(faculty)
+
+        self.eligibility_index[(activity_type, specialty)] = (mask, members)
+        return mask, members
+
+    def get_eligible_faculty(self, activity_type: str, specialty: Optional[str]) -> Tuple[int, List[Dict]]:
+        """Look up the precomputed eligibility class for a half-day."""
+        eligibility = self.eligibility_index.get((activity_type, specialty))
+        if eligibility is None:
+            eligibility = self.build_eligibility(activity_type, specialty)
+        return eligibility
+
+    def faculty_from_mask(self, mask: int) -> List[Dict]:
+        """Expand a faculty bitset into faculty records, in faculty order."""
+        members = []
+        while mask:
+            low_bit = mask & -mask
+            members.append(self.faculty_order[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return members
+
     def select_optimal_faculty(self, eligible_faculty: List[Dict],
                               supervision_need: Dict,
-                              half_day_info: Dict) -> Optional[Dict]:
+                              half_day_info: Dict,
+                              eligible_mask: Optional[int] = None) -> Optional[Dict]:
         """
         Enhanced faculty selection with absence awareness.
 
@@ -270,13 +1031,14 @@ class EnhancedFacultyAssignmentEngine:
         date_str = half_day_info['date']
         time_of_day = half_day_info['timeOfDay']
 
-        # Filter by availability using Phase 0 data
-        available_faculty = [
-            f for f in eligible_faculty
-            if self.is_faculty_available(f['id'], date_str, time_of_day)
-        ]
+        # Filter by availability using Phase 0 data (one bitset intersection)
+        if eligible_mask is None:
+            eligible_mask = 0
+            for faculty in eligible_faculty:
+                eligible_mask |= self.faculty_bits[faculty['id']]
+        available_mask = self.available_faculty_mask(date_str, time_of_day, eligible_mask)
 
-        if not available_faculty:
+        if not available_mask:
             # Check for absent faculty who might have substitution activities
             absent_with_substitution = []
             for faculty in eligible_faculty:
@@ -296,49 +1058,44 @@ class EnhancedFacultyAssignmentEngine:
 
             return None  # No faculty available
 
-        # Score available faculty based on workload balance and specialization
-        scored_faculty = []
-        for faculty in available_faculty:
-            current_load = self.faculty_workload[faculty['id']]['totalAssignments']
-            capacity = faculty['workloadCapacity']
-            utilization_score = current_load / capacity if capacity > 0 else 1.0
-
-            # Bonus for specialty match
-            specialty_bonus = 0.0
-            if supervision_need.get('specialtyRequirement'):
-                if self.match_specialty_requirement(faculty, supervision_need['specialtyRequirement']):
-                    specialty_bonus = -0.5  # Lower score (better) for specialty match
-
-            scored_faculty.append({
-                'faculty': faculty,
-                'score': utilization_score + specialty_bonus,
-                'currentLoad': current_load,
-                'substitutionRequired': False
-            })
-
-        # Sort by lowest score (best choice)
-        scored_faculty.sort(key=lambda x: x['score'])
-        return scored_faculty[0] if scored_faculty else None
+        # Least-loaded faculty from the class queues: specialty matches get a
+        # -0.5 bonus (lower score is better), ties break on faculty order
+        match_mask = self.specialty_match_mask(supervision_need, eligible_mask)
+        best = None
+        for class_mask, specialty_bonus in ((eligible_mask & match_mask, -0.5),
+                                            (eligible_mask & ~match_mask, 0.0)):
+            if not class_mask & available_mask:
+                continue
+            candidate = self.get_selection_queue(class_mask).best(available_mask)
+            if candidate is not None:
+                utilization_score, bit = candidate
+                if best is None or (utilization_score + specialty_bonus, bit) < best:
+                    best = (utilization_score + specialty_bonus, bit)
+
+        if best is None:
+            return None
+
+        score, bit = best
+        faculty = self.faculty_order[bit]
+        return {
+            'faculty': faculty,
+            'score': score,
+            'currentLoad': self.faculty_workload[faculty['id']]['totalAssignments'],
+            'substitutionRequired': False
+        }
 
     def determine_activity_type(self, activity: str) -> str:
-        """Determine activity type from activity name."""
-        activity_lower = activity.lower()
-
-        if any(keyword in activity_lower for keyword in ['procedure', 'vasectomy', 'botox']):
-            return 'procedure'
-        elif any(keyword in activity_lower for keyword in ['clinic', 'continuity']):
-            return 'clinic'
-        elif any(keyword in activity_lower for keyword in ['inpatient', 'hospital']):
-            return 'inpatient'
+        """Determine activity type from activity name (defaults to clinic)."""
+        return self.activity_types.classify(activity)
 
-        return 'clinic'  # Default to clinic
+    def get_specialty_name(self, activity: str) -> Optional[str]:
+        """Get the name of the specialty requirement matching an activity."""
+        return self.specialties.classify(activity)
 
     def get_specialty_requirement(self, activity: str) -> Optional[Dict]:
         """Get specialty requirement for an activity."""
-        for specialty, requirement in self.specialty_requirements.items():
-            if specialty.lower() in activity.lower():
-                return requirement
-        return None
+        specialty = self.get_specialty_name(activity)
+        return self.specialty_requirements[specialty] if specialty else None
 
     def find_clinic_template(self, activity: str, activity_type: str,
                             is_substitution: bool = False) -> Dict:
@@ -365,26 +1122,32 @@ class EnhancedFacultyAssignmentEngine:
         }
 
     def get_half_day_info(self, half_day_id: str, assignment: Dict) -> Dict:
-        """Get half-day information (simplified - would normally use half-day lookup)."""
-        return {
-            'date': datetime.now().strftime('%Y-%m-%d'),  # Placeholder
-            'timeOfDay': 'AM',  # Placeholder
-            'dayOfWeek': 'Monday'  # Placeholder
-        }
-
-    def generate_faculty_assignment(self, assignment: Dict) -> List[Dict]:
         """
-        Generate faculty assignment with ACGME compliance and absence awareness.
+        Get half-day information from the Phase 1 half-day index.
 
-        This is the main assignment logic that processes a master assignment
-        and creates appropriate faculty supervision assignments.
+        Half-days missing from the index fall back to the processing date (AM)
+        and are reported in unresolved_half_days.
         """
+        half_day_info = self.half_day_index.info(half_day_id)
+        if half_day_info is not None:
+            return half_day_info
+
+        self.unresolved_half_days.add(half_day_id)
+        return {
+            'date': self.processing_date,
+            'timeOfDay': 'AM',
+            'dayOfWeek': WEEKDAY_NAMES[date.fromisoformat(self.processing_date).weekday()].capitalize(),
+            'resolved': False
+        }
+
+    def build_supervision_needs(self, assignment: Dict) -> List[Dict]:
+        """Expand a master assignment into one supervision need per half-day."""
         half_day_ids = assignment.get('Half-Day of the Week of Blocks', [])
         resident_ids = assignment.get('Resident (from Residency Block Schedule)', [])
         pgy_levels = assignment.get('PGY Link (from Residency Block Schedule)', [])
         activities = assignment.get('Activity (from Rotation Templates)', [])
 
-        assignment_results = []
+        supervision_needs = []
 
         for index, half_day_id in enumerate(half_day_ids):
             pgy_level = pgy_levels[index] if index < len(pgy_levels) else pgy_levels[0] if pgy_levels else 'PGY-1'
@@ -398,10 +1161,13 @@ class EnhancedFacultyAssignmentEngine:
             activity_type = self.determine_activity_type(activity)
             supervision_ratio = self.supervision_ratios.get(pgy_level, self.supervision_ratios['PGY-1'])
             requires_direct_supervision = supervision_ratio['direct']
-            specialty_requirement = self.get_specialty_requirement(activity)
+            specialty = self.get_specialty_name(activity)
+            specialty_requirement = self.specialty_requirements[specialty] if specialty else None
 
-            # Create supervision need
-            supervision_need = {
+            # Find eligible faculty (precomputed specialty and procedure filters)
+            eligible_mask, _ = self.get_eligible_faculty(activity_type, specialty)
+
+            supervision_needs.append({
                 'assignmentId': assignment['id'],
                 'halfDayId': half_day_id,
                 'residentId': resident_id,
@@ -410,92 +1176,319 @@ class EnhancedFacultyAssignmentEngine:
                 'activityType': activity_type,
                 'supervisionRatio': supervision_ratio.get(activity_type, 1),
                 'requiresDirectSupervision': requires_direct_supervision,
+                'specialty': specialty,
                 'specialtyRequirement': specialty_requirement,
+                'eligibleMask': eligible_mask,
                 'halfDayInfo': half_day_info
+            })
+
+        return supervision_needs
+
+    def pool_key(self, supervision_need: Dict) -> Tuple:
+        """Needs sharing this key can be supervised by one faculty member."""
+        half_day_info = supervision_need['halfDayInfo']
+        return (half_day_info['date'], half_day_info['timeOfDay'], supervision_need['activityType'])
+
+    def pool_supervision_needs(self, supervision_needs: List[Dict]) -> List[Dict]:
+        """
+        Pack supervision needs into resident pools, one faculty member each.
+
+        Needs are grouped by (date, timeOfDay, activityType) and filled
+        first-fit in input order. A pool only takes needs with the same
+        eligible faculty, so specialty needs stay with credentialed faculty,
+        and holds at most the smallest supervision ratio among its residents.
+        Any resident requiring direct supervision makes the pool direct.
+        """
+        if not self.pool_supervision:
+            return supervision_needs
+
+        pools = []
+        open_pools: Dict[Tuple, List[Dict]] = {}
+        for supervision_need in supervision_needs:
+            key = self.pool_key(supervision_need) + (supervision_need['eligibleMask'],)
+            candidates = open_pools.setdefault(key, [])
+            ratio = supervision_need['supervisionRatio']
+            pool = next((p for p in candidates
+                         if len(p['members']) < min(p['supervisionRatio'], ratio)), None)
+            if pool is None:
+                pool = {**supervision_need, 'members': []}
+                candidates.append(pool)
+                pools.append(pool)
+
+            pool['members'].append(supervision_need)
+            pool['supervisionRatio'] = min(pool['supervisionRatio'], ratio)
+            pool['requiresDirectSupervision'] = (pool['requiresDirectSupervision']
+                                                 or supervision_need['requiresDirectSupervision'])
+            if len(pool['members']) >= pool['supervisionRatio']:
+                candidates.remove(pool)
+
+        return pools
+
+    def select_for_need(self, supervision_need: Dict) -> Optional[Dict]:
+        """Greedy faculty selection for one supervision need."""
+        eligible_faculty = self.get_eligible_faculty(
+            supervision_need['activityType'], supervision_need['specialty']
+        )[1]
+        return self.select_optimal_faculty(
+            eligible_faculty, supervision_need,
+            supervision_need['halfDayInfo'], supervision_need['eligibleMask']
+        )
+
+    def apply_faculty_selection(self, supervision_need: Dict,
+                                faculty_selection: Optional[Dict]) -> Optional[Dict]:
+        """
+        Record a faculty selection for a supervision need.
+
+        Returns the faculty assignment, or None after logging a coverage gap
+        when no faculty could be selected.
+        """
+        half_day_info = supervision_need['halfDayInfo']
+        activity = supervision_need['activity']
+        requires_direct_supervision = supervision_need['requiresDirectSupervision']
+        members = supervision_need.get('members') or [supervision_need]
+        resident_ids = [member['residentId'] for member in members]
+
+        if not faculty_selection:
+            # No faculty available - create coverage gap
+            self.coverage_gaps.append({
+                'halfDayId': supervision_need['halfDayId'],
+                'pgyLevel': supervision_need['pgyLevel'],
+                'activity': activity,
+                'residentIds': resident_ids,
+                'residentsAffected': len(members),
+                'reason': 'No available faculty (Phase 0 absence-aware)',
+                'specialtyRequirement': supervision_need['specialtyRequirement'],
+                'date': half_day_info['date'],
+                'timeOfDay': half_day_info['timeOfDay'],
+                'criticalLevel': 'HIGH' if requires_direct_supervision else 'MEDIUM'
+            })
+            return None
+
+        # Find appropriate clinic template
+        clinic_template = self.find_clinic_template(
+            activity,
+            supervision_need['activityType'],
+            faculty_selection.get('substitutionRequired', False)
+        )
+
+        faculty_assignment = {
+            'assignmentId': supervision_need['assignmentId'],
+            'halfDayId': supervision_need['halfDayId'],
+            'facultyId': faculty_selection['faculty']['id'],
+            'facultyName': faculty_selection['faculty']['name'],
+            'clinicTemplateId': clinic_template['id'],
+            'clinicTemplateName': clinic_template['name'],
+            'supervisionType': 'direct' if requires_direct_supervision else 'indirect',
+            'pgyLevel': supervision_need['pgyLevel'],
+            'activity': faculty_selection.get('replacementActivity', activity),
+            'originalActivity': activity,
+            'supervisionRatio': supervision_need['supervisionRatio'],
+            'assignmentIds': [member['assignmentId'] for member in members],
+            'halfDayIds': [member['halfDayId'] for member in members],
+            'residentIds': resident_ids,
+            'pgyLevels': [member['pgyLevel'] for member in members],
+            'supervisedResidents': len(members),
+            'substitutionApplied': faculty_selection.get('substitutionRequired', False),
+            'absenceInfo': faculty_selection.get('absenceInfo'),
+            'assignmentReason': 'Absence substitution with Phase 0 integration' if faculty_selection.get('substitutionRequired') else 'ACGME-compliant assignment',
+            'phaseIntegration': {
+                'phase0AbsenceChecked': True,
+                'phase1SmartPairingCompatible': True,
+                'verbatimReplacement': faculty_selection.get('substitutionRequired', False)
             }
+        }
 
-            # Find eligible faculty
-            eligible_faculty = list(self.faculty_lookup.values())
+        # Update faculty workload
+        faculty_id = faculty_selection['faculty']['id']
+        self.record_workload(faculty_id, requires_direct_supervision)
+
+        # Track substitutions
+        if faculty_selection.get('substitutionRequired'):
+            self.absence_substitutions.append({
+                'facultyId': faculty_id,
+                'date': half_day_info['date'],
+                'originalActivity': activity,
+                'replacementActivity': faculty_selection['replacementActivity'],
+                'absenceType': faculty_selection['absenceInfo'].get('leaveType'),
+                'phaseOrigin': 'Phase 0 absence data'
+            })
 
-            # Filter by specialty requirements
-            if specialty_requirement:
-                eligible_faculty = [
-                    f for f in eligible_faculty
-                    if self.match_specialty_requirement(f, specialty_requirement)
-                ]
+        return faculty_assignment
 
-            # Filter by procedure requirements
-            if activity_type == 'procedure':
-                eligible_faculty = [f for f in eligible_faculty if f.get('performsProcedures', False)]
+    def generate_faculty_assignment(self, assignment: Dict) -> List[Dict]:
+        """
+        Generate faculty assignment with ACGME compliance and absence awareness.
 
+        This is the main assignment logic that processes a master assignment
+        and creates appropriate faculty supervision assignments.
+        """
+        assignment_results = []
+
+        for supervision_need in self.pool_supervision_needs(self.build_supervision_needs(assignment)):
             # Select optimal faculty (with absence awareness)
-            faculty_selection = self.select_optimal_faculty(eligible_faculty, supervision_need, half_day_info)
-
-            if faculty_selection:
-                # Find appropriate clinic template
-                clinic_template = self.find_clinic_template(
-                    activity,
-                    activity_type,
-                    faculty_selection.get('substitutionRequired', False)
-                )
+            faculty_assignment = self.apply_faculty_selection(
+                supervision_need, self.select_for_need(supervision_need)
+            )
+            if faculty_assignment:
+                assignment_results.append(faculty_assignment)
 
-                faculty_assignment = {
-                    'assignmentId': assignment['id'],
-                    'halfDayId': half_day_id,
-                    'facultyId': faculty_selection['faculty']['id'],
-                    'facultyName': faculty_selection['faculty']['name'],
-                    'clinicTemplateId': clinic_template['id'],
-                    'clinicTemplateName': clinic_template['name'],
-                    'supervisionType': 'direct' if requires_direct_supervision else 'indirect',
-                    'pgyLevel': pgy_level,
-                    'activity': faculty_selection.get('replacementActivity', activity),
-                    'originalActivity': activity,
-                    'supervisionRatio': supervision_need['supervisionRatio'],
-                    'substitutionApplied': faculty_selection.get('substitutionRequired', False),
-                    'absenceInfo': faculty_selection.get('absenceInfo'),
-                    'assignmentReason': 'Absence substitution with Phase 0 integration' if faculty_selection.get('substitutionRequired') else 'ACGME-compliant assignment',
-                    'phaseIntegration': {
-                        'phase0AbsenceChecked': True,
-                        'phase1SmartPairingCompatible': True,
-                        'verbatimReplacement': faculty_selection.get('substitutionRequired', False)
-                    }
-                }
+        return assignment_results
 
-                assignment_results.append(faculty_assignment)
+    # -------------------------------------------------------------------------
+    # Optional global solver mode (min-cost flow per block or week)
+    # -------------------------------------------------------------------------
 
-                # Update faculty workload
-                faculty_id = faculty_selection['faculty']['id']
-                self.faculty_workload[faculty_id]['totalAssignments'] += 1
-                if requires_direct_supervision:
-                    self.faculty_workload[faculty_id]['directSupervision'] += 1
-                else:
-                    self.faculty_workload[faculty_id]['indirectSupervision'] += 1
-
-                # Track substitutions
-                if faculty_selection.get('substitutionRequired'):
-                    self.absence_substitutions.append({
-                        'facultyId': faculty_id,
-                        'date': half_day_info['date'],
-                        'originalActivity': activity,
-                        'replacementActivity': faculty_selection['replacementActivity'],
-                        'absenceType': faculty_selection['absenceInfo'].get('leaveType'),
-                        'phaseOrigin': 'Phase 0 absence data'
-                    })
-            else:
-                # No faculty available - create coverage gap
-                self.coverage_gaps.append({
-                    'halfDayId': half_day_id,
-                    'pgyLevel': pgy_level,
-                    'activity': activity,
-                    'reason': 'No available faculty (Phase 0 absence-aware)',
-                    'specialtyRequirement': specialty_requirement,
-                    'date': half_day_info['date'],
-                    'timeOfDay': half_day_info['timeOfDay'],
-                    'criticalLevel': 'HIGH' if requires_direct_supervision else 'MEDIUM'
-                })
+    def horizon_key(self, supervision_need: Dict, horizon: str) -> Tuple:
+        """Group key for the flow solver: scheduling block or ISO week."""
+        half_day_info = supervision_need['halfDayInfo']
+        if horizon == 'block' and half_day_info.get('blockNumber') is not None:
+            return ('block', half_day_info['blockNumber'])
+        try:
+            year, week, _ = date.fromisoformat(half_day_info['date']).isocalendar()
+        except (TypeError, ValueError):
+            return ('week', None)
+        return ('week', year, week)
 
-        return assignment_results
+    def solve_need_group(self, supervision_needs: List[Dict],
+                         deadline: Optional[float]) -> List[Optional[Dict]]:
+        """
+        Assign faculty to a group of needs jointly with min-cost max-flow.
+
+        Network: source -> need (cap 1) -> eligible, available faculty
+        (specialty match costs 0.5 less) -> unit capacity slots -> sink, where
+        the k-th extra assignment of a faculty member costs its utilization
+        after k more assignments. Maximum flow keeps coverage gaps minimal and
+        the cost spreads load the same way the greedy score does.
 
+        Returns one selection (or None for unmatched needs) per input need.
+        Raises SolverTimeout if the deadline passes.
+        """
+        scale = FLOW_COST_SCALE
+        need_count = len(supervision_needs)
+        need_nodes = range(2, 2 + need_count)
+        faculty_node = {}
+        edges_by_need = []
+        demand = {}
+
+        for supervision_need in supervision_needs:
+            half_day_info = supervision_need['halfDayInfo']
+            available_mask = self.available_faculty_mask(
+                half_day_info['date'], half_day_info['timeOfDay'], supervision_need['eligibleMask']
+            )
+            match_mask = self.specialty_match_mask(supervision_need, supervision_need['eligibleMask'])
+            candidates = []
+            for faculty in self.faculty_from_mask(available_mask):
+                bit = self.faculty_bits[faculty['id']]
+                if bit not in faculty_node:
+                    faculty_node[bit] = 2 + need_count + len(faculty_node)
+                demand[bit] = demand.get(bit, 0) + 1
+                candidates.append((bit, 0 if match_mask & bit else scale // 2))
+            edges_by_need.append(candidates)
+
+        flow = MinCostFlow(2 + need_count + len(faculty_node))
+        need_edges = []
+        for node, candidates in zip(need_nodes, edges_by_need):
+            flow.add_edge(0, node, 1, 0)
+            need_edges.append([(bit, flow.add_edge(node, faculty_node[bit], 1, cost))
+                               for bit, cost in candidates])
+
+        for bit, node in faculty_node.items():
+            faculty = self.faculty_order[bit.bit_length() - 1]
+            capacity = faculty['workloadCapacity']
+            load = self.faculty_workload[faculty['id']]['totalAssignments']
+            for extra in range(min(capacity - load, demand[bit])):
+                flow.add_edge(node, 1, 1, int(scale * (load + extra) / capacity))
+
+        flow.solve(0, 1, deadline)
+
+        selections = []
+        for supervision_need, candidates in zip(supervision_needs, need_edges):
+            chosen = next((bit for bit, edge in candidates if flow.flow_on(edge)), None)
+            if chosen is None:
+                selections.append(None)
+                continue
+            faculty = self.faculty_order[chosen.bit_length() - 1]
+            selections.append({
+                'faculty': faculty,
+                'score': None,
+                'currentLoad': self.faculty_workload[faculty['id']]['totalAssignments'],
+                'substitutionRequired': False
+            })
+        return selections
+
+    def generate_all_assignments(self, master_assignments: List[Dict], mode: str = 'greedy',
+                                 time_budget_seconds: Optional[float] = None,
+                                 horizon: str = 'week') -> List[Dict]:
+        """
+        Generate faculty assignments for every master assignment.
+
+        mode='greedy' processes half-days in input order. mode='flow' solves
+        each block or week jointly with min-cost flow; once the time budget is
+        exhausted the remaining groups fall back to greedy. Needs the solver
+        leaves unmatched also go through greedy selection so absence
+        substitutions still apply. With supervision pooling enabled both modes
+        work on resident pools rather than individual needs.
+        """
+        started = time.perf_counter()
+        supervision_needs = [
+            supervision_need
+            for assignment in master_assignments
+            for supervision_need in self.build_supervision_needs(assignment)
+        ]
+        pooled_needs = self.pool_supervision_needs(supervision_needs)
+        self.solver_report = {
+            'mode': mode,
+            'horizon': horizon,
+            'supervisionNeeds': len(supervision_needs),
+            'pooledNeeds': len(pooled_needs),
+            'groups': 0,
+            'groupsSolved': 0,
+            'fellBackToGreedy': False,
+            'timeBudgetSeconds': time_budget_seconds
+        }
+
+        if mode != 'flow':
+            all_results = []
+            for supervision_need in pooled_needs:
+                faculty_assignment = self.apply_faculty_selection(
+                    supervision_need, self.select_for_need(supervision_need)
+                )
+                if faculty_assignment:
+                    all_results.append(faculty_assignment)
+            self.solver_report['seconds'] = time.perf_counter() - started
+            self.solver_report['coverageGaps'] = len(self.coverage_gaps)
+            return all_results
+
+        groups = {}
+        for supervision_need in pooled_needs:
+            groups.setdefault(self.horizon_key(supervision_need, horizon), []).append(supervision_need)
+        self.solver_report['groups'] = len(groups)
+
+        deadline = started + time_budget_seconds if time_budget_seconds is not None else None
+        all_results = []
+        for key in sorted(groups, key=lambda k: tuple('' if v is None else v for v in k)):
+            supervision_needs = groups[key]
+            selections = None
+            if not self.solver_report['fellBackToGreedy']:
+                try:
+                    selections = self.solve_need_group(supervision_needs, deadline)
+                    self.solver_report['groupsSolved'] += 1
+                except SolverTimeout:
+                    self.solver_report['fellBackToGreedy'] = True
+
+            for index, supervision_need in enumerate(supervision_needs):
+                if selections is not None and selections[index] is not None:
+                    faculty_assignment = self.apply_faculty_selection(supervision_need, selections[index])
+                else:
+                    faculty_assignment = self.apply_faculty_selection(
+                        supervision_need, self.select_for_need(supervision_need)
+                    )
+                if faculty_assignment:
+                    all_results.append(faculty_assignment)
+
+        self.solver_report['seconds'] = time.perf_counter() - started
+        self.solver_report['coverageGaps'] = len(self.coverage_gaps)
+        return all_results
 
 # =============================================================================
 # EXECUTE ENHANCED FACULTY ASSIGNMENT
@@ -503,19 +1496,55 @@ class EnhancedFacultyAssignmentEngine:
 
 print('\n--- EXECUTING ENHANCED FACULTY ASSIGNMENT ---')
 
-assignment_engine = EnhancedFacultyAssignmentEngine(
-    enhanced_faculty_lookup,
-    faculty_absences,
-    SUPERVISION_RATIOS,
-    SPECIALTY_REQUIREMENTS
-)
+solver_settings = {**ASSIGNMENT_SOLVER, **solver_config}
+
+
+def create_assignment_engine() -> EnhancedFacultyAssignmentEngine:
+    engine = EnhancedFacultyAssignmentEngine(
+        enhanced_faculty_lookup,
+        faculty_absences,
+        SUPERVISION_RATIOS,
+        SPECIALTY_REQUIREMENTS,
+        absence_index=faculty_absence_index,
+        pool_supervision=SUPERVISION_POOLING,
+        half_day_index=half_day_index
+    )
+
+    # Precompute availability over every date the master assignments touch
+    horizon_dates = sorted({
+        engine.get_half_day_info(half_day_id, assignment)['date']
+        for assignment in master_assignments
+        for half_day_id in assignment.get('Half-Day of the Week of Blocks', [])
+    })
+    if horizon_dates:
+        engine.build_availability_matrix(horizon_dates[0], horizon_dates[-1])
+    return engine
+
 
-all_faculty_assignments = []
+assignment_engine = create_assignment_engine()
 
 # Process each master assignment with resident
-for assignment in master_assignments:
-    assignment_results = assignment_engine.generate_faculty_assignment(assignment)
-    all_faculty_assignments.extend(assignment_results)
+all_faculty_assignments = assignment_engine.generate_all_assignments(
+    master_assignments,
+    mode=solver_settings['mode'],
+    time_budget_seconds=solver_settings['timeBudgetSeconds'],
+    horizon=solver_settings['horizon']
+)
+
+if assignment_engine.unresolved_half_days:
+    print(f'WARNING: {len(assignment_engine.unresolved_half_days)} half-days missing from the half-day index '
+          f'were dated {assignment_engine.processing_date} AM')
+
+# Report gap counts for both modes when the solver ran and a comparison was asked for
+solver_report = dict(assignment_engine.solver_report)
+if solver_settings['mode'] == 'flow' and solver_settings['compareWithGreedy']:
+    greedy_engine = create_assignment_engine()
+    greedy_engine.generate_all_assignments(master_assignments)
+    solver_report['greedyCoverageGaps'] = greedy_engine.solver_report['coverageGaps']
+    solver_report['greedySeconds'] = greedy_engine.solver_report['seconds']
+    print(f"Solver: flow {solver_report['coverageGaps']} gaps vs greedy {solver_report['greedyCoverageGaps']} gaps "
+          f"({solver_report['groupsSolved']}/{solver_report['groups']} groups solved, "
+          f"fallback={'yes' if solver_report['fellBackToGreedy'] else 'no'})")
 
 # =============================================================================
 # CALCULATE SUMMARY STATISTICS
@@ -536,6 +1565,13 @@ for faculty_id, workload in assignment_engine.faculty_workload.items():
             'utilizationRate': f"{utilization_rate:.1f}%"
         })
 
+supervised_assignment_ids = {
+    assignment_id
+    for faculty_assignment in all_faculty_assignments
+    for assignment_id in faculty_assignment['assignmentIds']
+}
+residents_supervised = sum(a['supervisedResidents'] for a in all_faculty_assignments)
+
 summary = {
     'totalSupervisionNeeds': len(master_assignments),
     'facultyAssignments': len(all_faculty_assignments),
@@ -544,9 +1580,21 @@ summary = {
     'acgmeCompliance': {
         'totalDirectRequired': len([a for a in all_faculty_assignments if a['supervisionType'] == 'direct']),
         'totalIndirectAllowed': len([a for a in all_faculty_assignments if a['supervisionType'] == 'indirect']),
-        'complianceRate': f"{(len(all_faculty_assignments) / len(master_assignments) * 100):.1f}%" if master_assignments else '0%'
+        'complianceRate': f"{(len(supervised_assignment_ids) / len(master_assignments) * 100):.1f}%" if master_assignments else '0%'
+    },
+    'supervisionPooling': {
+        'enabled': SUPERVISION_POOLING,
+        'supervisionNeeds': solver_report['supervisionNeeds'],
+        'residentsSupervised': residents_supervised,
+        'facultyAssignments': len(all_faculty_assignments),
+        'averageResidentsPerFaculty': round(residents_supervised / len(all_faculty_assignments), 2) if all_faculty_assignments else 0
     },
     'facultyUtilization': faculty_utilization,
+    'solver': solver_report,
+    'halfDayIndex': {
+        'halfDays': len(half_day_index),
+        'unresolvedHalfDays': len(assignment_engine.unresolved_half_days)
+    },
     'phaseIntegration': {
         'phase0AbsenceIntegration': len(assignment_engine.absence_substitutions) > 0,
         'verbatimReplacements': len(assignment_engine.absence_substitutions),
@@ -557,7 +1605,8 @@ summary = {
 }
 
 print('\n=== PHASE 3 ENHANCED RESULTS (PYTHON) ===')
-print(f'Faculty assignments created: {summary["facultyAssignments"]}')
+print(f'Faculty assignments created: {summary["facultyAssignments"]} '
+      f'({summary["supervisionPooling"]["residentsSupervised"]} resident half-days supervised)')
 print(f'Absence substitutions: {summary["absenceSubstitutions"]}')
 print(f'Coverage gaps: {summary["coverageGaps"]}')
 print(f'ACGME compliance rate: {summary["acgmeCompliance"]["complianceRate"]}')
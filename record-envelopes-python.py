@@ -0,0 +1,170 @@
+"""
+SHARED RECORD ENVELOPES (PYTHON)
+Single source of the record envelope and the one-pass dispatcher the phase
+engines use to separate their merged input.
+
+A "Tag ..." Code node after every Airtable search node adds two envelope
+keys to each record: _source (the table ID it was fetched from) and _schema
+(the schema version of that table's fields, TABLE_SCHEMAS). Upstream phase
+results ({'phase': n, ...}) are addressed as phase_source(n). The engines
+then bucket their merged items with one dict lookup per item instead of
+probing which fields exist, so separation no longer depends on predicate
+order or on fields another table happens to share.
+
+n8n Code nodes cannot import repository files, so the block between the
+SHARED RECORD ENVELOPES markers below is pasted verbatim into:
+- phase3-enhanced-faculty-assignment-python.py
+- workflows/archive/phase7-python-powered.json ("Python Validation Engine")
+- workflows/archive/phase8-python-powered-orchestrator-compatible.json
+  ("Python Emergency Coverage Engine")
+and ported to JavaScript in the Phase 0 Absence Processing Engine
+(UPDATED-phase0-absence-loader.json), the Phase 3 Pyodide engine
+(phase3-processing-subworkflow.json) and the Phase 9 Excel Format Engine.
+tests/archive/test_record_envelopes.py fails if any copy drifts.
+
+    python record-envelopes-python.py   # benchmark: tag dispatch vs key probing
+
+Dependencies: None (uses only Python standard library)
+"""
+
+import sys
+import time
+
+# -----------------------------------------------------------------------------
+# SHARED RECORD ENVELOPES (source: record-envelopes-python.py)
+# -----------------------------------------------------------------------------
+# Envelope keys the "Tag ..." node after each Airtable search adds to a record
+SOURCE_KEY = '_source'
+SCHEMA_KEY = '_schema'
+
+# Schema version of each source table's fields. Bump a table's version when
+# the fields its search nodes project change meaning, so engines built for
+# the old shape reject its records instead of misreading them
+TABLE_SCHEMAS = {
+    'tbl17gcDUtXc14Rjv': 1,  # Master Assignments
+    'tbloGnXnu0mC6y83L': 1,  # Faculty Assignments
+    'tbl15U9cF0uig9IEo': 1,  # Call Schedule
+    'tblmgzodmqTsJ5inf': 1,  # Faculty
+    'tbl3TfpZSGYGxLCIG': 1,  # Residents
+    'tbltYT3HMWxGCcCfo': 1,  # Primary Duties
+    'tblJvewumPqMBl6Ut': 1,  # Faculty Leave
+    'tblQl3C95p0UE6F0P': 1,  # Resident Absences
+    'tblLUzjfad4B1GQ1a': 1,  # Rotation Templates
+    'tblTP62YOkF75o5aO': 1   # Half-Day of the Week of Blocks
+}
+
+
+def phase_source(phase) -> str:
+    """Envelope source of an upstream phase result ({'phase': n, ...})"""
+    return f'phase-{phase}'
+
+
+def dispatch_records(records, routes: dict, schemas: dict = TABLE_SCHEMAS) -> tuple:
+    """
+    Bucket records in one pass: routes maps a source (table ID or
+    phase_source(n)) to a bucket name. Returns (buckets, rejected), every
+    bucket of routes present, rejected as (reason, record) pairs for
+    'untagged' records, 'unrouted' sources and 'schema' version mismatches.
+    """
+    buckets = {bucket: [] for bucket in routes.values()}
+    # source -> (bucket list, expected schema version or None)
+    lanes = {source: (buckets[bucket], schemas.get(source)) for source, bucket in routes.items()}
+    rejected = []
+    for data in records:
+        source = data.get(SOURCE_KEY)
+        if source is None and data.get('phase') is not None:
+            source = phase_source(data['phase'])
+        lane = lanes.get(source)
+        if lane is None:
+            rejected.append(('untagged' if source is None else 'unrouted', data))
+        elif lane[1] is not None and data.get(SCHEMA_KEY) != lane[1]:
+            rejected.append(('schema', data))
+        else:
+            lane[0].append(data)
+    return buckets, rejected
+
+
+# -----------------------------------------------------------------------------
+# END SHARED RECORD ENVELOPES
+# -----------------------------------------------------------------------------
+
+
+def tag_records(records, table: str, schemas: dict = TABLE_SCHEMAS) -> list:
+    """Add the envelope in place, as the "Tag ..." node after a search does; returns records."""
+    for record in records:
+        record[SOURCE_KEY] = table
+        record[SCHEMA_KEY] = schemas[table]
+    return records
+
+
+def tag_node_code(table: str, schemas: dict = TABLE_SCHEMAS) -> str:
+    """jsCode of the "Tag ..." Code node that follows a search of table"""
+    return ('// Record envelope (record-envelopes-python.py): source table and schema version\n'
+            f"return $input.all().map(item => ({{json: {{...item.json, {SOURCE_KEY}: '{table}', "
+            f'{SCHEMA_KEY}: {schemas[table]}}}}}));')
+
+
+def _probe_phase7(data: dict):
+    """The key-probing cascade Phase 7 used before envelopes (benchmark baseline)"""
+    if data.get('Resident (from Residency Block Schedule)'):
+        return 'master'
+    elif data.get('Faculty') and data.get('Attending Clinic Templates'):
+        return 'faculty'
+    elif data.get('Call Date') or data.get('date'):
+        return 'call'
+    elif data.get('Faculty') and data.get('Last Name') and data.get('Faculty Status'):
+        return 'active_faculty'
+    elif data.get('Resident') and data.get('PGY Level'):
+        return 'resident'
+    elif data.get('Clinic Minimum Half-Days Per Week') is not None:
+        return 'primary_duty'
+    return None
+
+
+def benchmark(counts: dict = None, rounds: int = 5) -> dict:
+    """Separation of a Phase 7-sized merged input: probing cascade vs envelope dispatch."""
+    counts = counts or {'tbl17gcDUtXc14Rjv': 14000, 'tbloGnXnu0mC6y83L': 2600, 'tbl15U9cF0uig9IEo': 365,
+                        'tblmgzodmqTsJ5inf': 30, 'tbl3TfpZSGYGxLCIG': 36, 'tbltYT3HMWxGCcCfo': 30}
+    shapes = {
+        'tbl17gcDUtXc14Rjv': {'Resident (from Residency Block Schedule)': ['recR'], 'Half-Day of the Week of Blocks': ['recH']},
+        'tbloGnXnu0mC6y83L': {'Faculty': ['recF'], 'Attending Clinic Templates': ['recT']},
+        'tbl15U9cF0uig9IEo': {'Faculty': ['recF'], 'Call Date': '2026-07-04'},
+        'tblmgzodmqTsJ5inf': {'Faculty': 'Faculty', 'Last Name': 'Faculty', 'Faculty Status': 'Active'},
+        'tbl3TfpZSGYGxLCIG': {'Resident': ['recP'], 'PGY Level': 'PGY-1'},
+        'tbltYT3HMWxGCcCfo': {'Faculty': ['recF'], 'Clinic Minimum Half-Days Per Week': 2}
+    }
+    routes = {'tbl17gcDUtXc14Rjv': 'master', 'tbloGnXnu0mC6y83L': 'faculty', 'tbl15U9cF0uig9IEo': 'call',
+              'tblmgzodmqTsJ5inf': 'active_faculty', 'tbl3TfpZSGYGxLCIG': 'resident',
+              'tbltYT3HMWxGCcCfo': 'primary_duty'}
+    records = [record for table, count in counts.items()
+               for record in tag_records([dict(shapes[table]) for _ in range(count)], table)]
+
+    def probe():
+        buckets = {bucket: [] for bucket in routes.values()}
+        for data in records:
+            kind = _probe_phase7(data)
+            if kind:
+                buckets[kind].append(data)
+        return buckets
+
+    timings = {}
+    for name, separate in (('probe', probe), ('dispatch', lambda: dispatch_records(records, routes)[0])):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            buckets = separate()
+        timings[name] = (time.perf_counter() - started) / rounds
+        timings[f'{name}Sizes'] = {bucket: len(items) for bucket, items in buckets.items()}
+    timings['records'] = len(records)
+    return timings
+
+
+def main(argv=None) -> None:
+    result = benchmark()
+    print(f"=== MERGED INPUT SEPARATION ({result['records']} records, Phase 7 shape) ===")
+    print(f"Key-probing cascade: {result['probe'] * 1000:.2f} ms")
+    print(f"Envelope dispatch:   {result['dispatch'] * 1000:.2f} ms")
+    print(f"Same buckets: {result['probeSizes'] == result['dispatchSizes']}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
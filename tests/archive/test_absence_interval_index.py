@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Test the Phase 0 interval absence index and its Phase 3 Python reader
+Checks the intervals Phase 0 builds, point/range lookups, legacy per-day
+fallback and engine availability
+"""
+
+import json
+import shutil
+import subprocess
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE3_SCRIPT = REPO_ROOT / "phase3-enhanced-faculty-assignment-python.py"
+PHASE0_WORKFLOW = REPO_ROOT / "UPDATED-phase0-absence-loader.json"
+
+# The Phase 0 Code node against mock input, printing its phaseData
+PHASE0_HARNESS = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const $input = {all: () => input.records.map(json => ({json}))};
+const $ = () => ({first: () => ({json: {orchestratorId: 'interval-test', phaseNumber: 0,
+                                        phaseConfig: input.phaseConfig}})});
+const write = text => process.stdout.write(text);
+console.log = () => {};
+const output = (() => {
+%s
+})();
+write(JSON.stringify(output[0].json.phaseData));
+"""
+
+
+def load_phase3(items):
+    """Execute the Phase 3 script against mock n8n input and return its namespace."""
+    namespace = {'_get_input_all': lambda: items}
+    exec(PHASE3_SCRIPT.read_text(), namespace)
+    return namespace
+
+
+def run_phase0(leave, phase_config=None):
+    """Execute the Phase 0 Code node under node on tagged faculty leave records."""
+    workflow = json.loads(PHASE0_WORKFLOW.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == 'Phase 0: Absence Processing Engine')
+    records = [dict(record, _source='tblJvewumPqMBl6Ut', _schema=1) for record in leave]
+    payload = json.dumps({'records': records, 'phaseConfig': phase_config or {}})
+    output = subprocess.run(['node', '-e', PHASE0_HARNESS % node['parameters']['jsCode']], input=payload,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def create_mock_leave():
+    """Overlapping leave for one faculty member; later records win where they overlap"""
+    spans = [('2025-07-01', '2025-07-10', 'TDY'), ('2025-07-04', '2025-07-05', 'Conference'),
+             ('2025-07-12', '2025-07-12', 'Personal Leave'), ('2025-07-09', '2025-07-13', 'Deployment'),
+             ('2025-06-28', '2025-07-02', 'Sick')]
+    return [{'id': f'rec_leave_{index}', 'Faculty': ['rec_fac_001'], 'Leave Start': start, 'Leave End': end,
+             'Leave Type': leave_type}
+            for index, (start, end, leave_type) in enumerate(spans)]
+
+
+def expected_daily(leave):
+    """Per-day leave type, applying records in order as the old per-day Map.set() did"""
+    daily = {}
+    for record in leave:
+        day = date.fromisoformat(record['Leave Start'])
+        while day <= date.fromisoformat(record['Leave End']):
+            daily[day.isoformat()] = record['Leave Type']
+            day += timedelta(days=1)
+    return daily
+
+
+def test_phase0_builds_disjoint_sorted_intervals():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    leave = create_mock_leave()
+    entry = run_phase0(leave)['facultyAbsenceIndex']['rec_fac_001']
+
+    assert [interval[:2] for interval in entry['intervals']] == [
+        ['2025-06-28', '2025-07-02'], ['2025-07-03', '2025-07-03'], ['2025-07-04', '2025-07-05'],
+        ['2025-07-06', '2025-07-08'], ['2025-07-09', '2025-07-13']]
+    daily = {}
+    for start, end, _, ref in entry['intervals']:
+        day = date.fromisoformat(start)
+        while day <= date.fromisoformat(end):
+            daily[day.isoformat()] = entry['records'][ref]['leaveType']
+            day += timedelta(days=1)
+    assert daily == expected_daily(leave)
+
+
+def test_phase0_daily_maps_only_on_request():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    leave = create_mock_leave()
+    assert 'facultyAbsences' not in run_phase0(leave)
+
+    daily = run_phase0(leave, {'emitDailyAbsenceMaps': True})['facultyAbsences']['rec_fac_001']
+    assert {day: absence['leaveType'] for day, absence in daily.items()} == expected_daily(leave)
+
+
+def create_mock_phase0():
+    """Interval index as emitted by the Phase 0 Absence Processing Engine"""
+    return {
+        'absenceIndexFormat': 'interval-v1',
+        'facultyAbsenceIndex': {
+            'rec_fac_001': {
+                'intervals': [
+                    ['2025-07-03', '2025-07-04', 'All Day', 0],
+                    ['2025-07-05', '2025-07-06', 'All Day', 1],
+                    ['2025-07-14', '2025-07-14', 'PM', 2]
+                ],
+                'records': [
+                    {'leaveType': 'TDY', 'replacementActivity': 'TDY'},
+                    {'leaveType': 'Conference', 'replacementActivity': 'ACGME Conference'},
+                    {'leaveType': 'Personal Leave', 'replacementActivity': 'Personal Leave'}
+                ]
+            }
+        },
+        'residentAbsenceIndex': {},
+        'facultyReference': {}
+    }
+
+
+def create_mock_items(phase0):
+    faculty = {
+        'id': 'rec_fac_001',
+        '_source': 'tblmgzodmqTsJ5inf',
+        '_schema': 1,
+        'Faculty': 'Smith',
+        'Last Name': 'Smith',
+        'Available Monday': True,
+        'Available Tuesday': True,
+        'Available Wednesday': True,
+        'Available Thursday': True,
+        'Available Friday': True
+    }
+    return [
+        {'json': {'phase': 0, 'absence_data': phase0}},
+        {'json': faculty}
+    ]
+
+
+def test_point_lookup():
+    ns = load_phase3(create_mock_items(create_mock_phase0()))
+    index = ns['faculty_absence_index']
+
+    assert index.lookup('rec_fac_001', '2025-07-02') is None
+    assert index.lookup('rec_fac_001', '2025-07-03')['leaveType'] == 'TDY'
+    assert index.lookup('rec_fac_001', '2025-07-06')['leaveType'] == 'Conference'
+    assert index.lookup('rec_fac_001', '2025-07-07') is None
+    assert index.lookup('rec_unknown', '2025-07-03') is None
+
+
+def test_half_day_lookup():
+    ns = load_phase3(create_mock_items(create_mock_phase0()))
+    index = ns['faculty_absence_index']
+
+    assert index.lookup('rec_fac_001', '2025-07-14', 'AM') is None
+    assert index.lookup('rec_fac_001', '2025-07-14', 'PM')['timeOfDay'] == 'PM'
+    assert index.lookup('rec_fac_001', '2025-07-04', 'AM')['timeOfDay'] == 'All Day'
+
+
+def test_range_lookup():
+    ns = load_phase3(create_mock_items(create_mock_phase0()))
+    index = ns['faculty_absence_index']
+
+    overlaps = index.overlapping('rec_fac_001', '2025-07-04', '2025-07-10')
+    assert [(o['start'], o['end']) for o in overlaps] == [
+        ('2025-07-03', '2025-07-04'),
+        ('2025-07-05', '2025-07-06')
+    ]
+    assert index.overlapping('rec_fac_001', '2025-07-07', '2025-07-13') == []
+
+
+def test_legacy_daily_calendar_fallback():
+    phase0 = {
+        'facultyAbsences': {
+            'rec_fac_001': {
+                '2025-07-03': {'leaveType': 'TDY', 'timeOfDay': 'All Day'}
+            }
+        }
+    }
+    ns = load_phase3(create_mock_items(phase0))
+    index = ns['faculty_absence_index']
+
+    assert len(index) == 1
+    assert index.lookup('rec_fac_001', '2025-07-03')['leaveType'] == 'TDY'
+    assert index.lookup('rec_fac_001', '2025-07-04') is None
+
+
+def test_engine_uses_interval_index():
+    ns = load_phase3(create_mock_items(create_mock_phase0()))
+    engine = ns['assignment_engine']
+
+    # 2025-07-03 is a Thursday covered by TDY, 2025-07-10 is a free Thursday
+    assert not engine.is_faculty_available('rec_fac_001', '2025-07-03', 'AM')
+    assert engine.is_faculty_available('rec_fac_001', '2025-07-10', 'AM')
+    assert engine.get_faculty_absence_info('rec_fac_001', '2025-07-05')['replacementActivity'] == 'ACGME Conference'
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the shared activity classifier (activity-classifier-python.py)
+Checks parity with the legacy keyword scans, the LRU bound and that the copies
+embedded in Phase 3, Phase 7 and Phase 8 match the source
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CLASSIFIER_SCRIPT = REPO_ROOT / "activity-classifier-python.py"
+EMBEDDED_COPIES = [
+    (REPO_ROOT / "phase3-enhanced-faculty-assignment-python.py", None),
+    (REPO_ROOT / "workflows/archive/phase7-python-powered.json", "Python Validation Engine"),
+    (REPO_ROOT / "workflows/archive/phase8-python-powered-orchestrator-compatible.json",
+     "Python Emergency Coverage Engine")
+]
+
+BLOCK_START = '# SHARED ACTIVITY CLASSIFIER (source: activity-classifier-python.py)'
+BLOCK_END = '# END SHARED ACTIVITY CLASSIFIER'
+
+ACTIVITIES = [
+    'Vasectomy Clinic', 'Botox', 'Procedure Clinic', 'Continuity Clinic', 'Sports Medicine',
+    'Sports Medicine Clinic', 'Family Medicine Inpatient', 'FM Inpatient Team', 'Hospital Medicine',
+    'Grand Rounds', 'Didactic Conference', 'Admin', 'Leadership Time', 'Overnight Call',
+    'Emergency Medicine', 'Trauma Surgery', 'Specialty Education', 'CLINIC', 'Research', ''
+]
+
+
+def load_classifier():
+    spec = importlib.util.spec_from_file_location('activity_classifier', CLASSIFIER_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def extract_block(source):
+    start = source.index(BLOCK_START)
+    return source[start:source.index(BLOCK_END, start)]
+
+
+def legacy_activity_type(activity):
+    activity_lower = activity.lower()
+    if any(keyword in activity_lower for keyword in ['procedure', 'vasectomy', 'botox']):
+        return 'procedure'
+    elif any(keyword in activity_lower for keyword in ['clinic', 'continuity']):
+        return 'clinic'
+    elif any(keyword in activity_lower for keyword in ['inpatient', 'hospital']):
+        return 'inpatient'
+    return 'clinic'
+
+
+def legacy_duty_category(template):
+    t_lower = template.lower()
+    if 'sports medicine' in t_lower:
+        return 'sports'
+    elif 'clinic' in t_lower or 'continuity' in t_lower:
+        return 'clinic'
+    elif any(x in t_lower for x in ['conference', 'education', 'didactic', 'grand rounds']):
+        return 'gme'
+    elif any(x in t_lower for x in ['admin', 'leadership']):
+        return 'dfm'
+    return None
+
+
+def legacy_criticality(activity):
+    activity_str = activity.lower()
+    critical_services = ['family medicine inpatient', 'inpatient team', 'overnight call',
+                         'emergency', 'procedure', 'surgery', 'trauma']
+    if any(service in activity_str for service in critical_services):
+        return 'CRITICAL'
+    if any(kw in activity_str for kw in ['clinic', 'continuity', 'specialty']):
+        return 'HIGH'
+    if any(kw in activity_str for kw in ['conference', 'education', 'didactic', 'grand rounds']):
+        return 'MEDIUM'
+    return 'LOW'
+
+
+def test_matches_legacy_keyword_scans():
+    classifier = load_classifier()
+    activity_types = classifier.ActivityClassifier(classifier.ACTIVITY_TYPE_RULES, default='clinic')
+    duty_categories = classifier.ActivityClassifier(classifier.DUTY_CATEGORY_RULES)
+    criticality = classifier.ActivityClassifier(classifier.CRITICALITY_RULES, default='LOW')
+
+    for activity in ACTIVITIES:
+        assert activity_types.classify(activity) == legacy_activity_type(activity), activity
+        assert duty_categories.classify(activity) == legacy_duty_category(activity), activity
+        assert criticality.classify(activity) == legacy_criticality(activity), activity
+
+
+def test_overlapping_keywords_use_rule_priority():
+    classifier = load_classifier()
+    rules = [('long', ('medicine inpatient',)), ('short', ('family medicine',))]
+    overlapping = classifier.ActivityClassifier(rules)
+
+    # 'family medicine' matches first but overlaps the higher-priority keyword
+    assert overlapping.classify('Family Medicine Inpatient') == 'long'
+    assert overlapping.classify('Family Medicine') == 'short'
+
+
+def test_lru_bound():
+    classifier = load_classifier()
+    activity_types = classifier.ActivityClassifier(classifier.ACTIVITY_TYPE_RULES, default='clinic', cache_size=2)
+
+    for activity in ['Botox', 'Clinic', 'Botox', 'Inpatient', 'Botox']:
+        activity_types.classify(activity)
+
+    # 'Clinic' is evicted; the recently used 'Botox' stays cached
+    info = activity_types.cache_info()
+    assert info.currsize == 2
+    assert info.hits == 2
+
+
+def test_embedded_copies_match_source():
+    source_block = extract_block(CLASSIFIER_SCRIPT.read_text())
+
+    for path, node_name in EMBEDDED_COPIES:
+        if node_name is None:
+            code = path.read_text()
+        else:
+            workflow = json.loads(path.read_text())
+            node = next(n for n in workflow['nodes'] if n['name'] == node_name)
+            code = node['parameters']['pythonCode']
+        assert extract_block(code) == source_block, path.name
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Test the Airtable bulk writer (airtable-bulk-writer-python.py)
+Packing, token-bucket pacing, 429/5xx retries and the rerun diff against the
+local Airtable stub
+"""
+
+import importlib.util
+import json
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+WRITER_SCRIPT = REPO_ROOT / "airtable-bulk-writer-python.py"
+PHASE3_PROCESSING_WORKFLOW = REPO_ROOT / "phase3-processing-subworkflow.json"
+PHASE4_WORKFLOW = REPO_ROOT / "workflows/archive/phase4-python-powered.json"
+KEY_FIELDS = ('Half-Day of the Week of Blocks', 'Faculty')
+
+
+def load_writer():
+    spec = importlib.util.spec_from_file_location('airtable_bulk_writer', WRITER_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def assignment(half_day, faculty, supervision='direct', compliant=True):
+    return {'Half-Day of the Week of Blocks': [half_day], 'Faculty': [faculty],
+            'Supervision Type': supervision, 'ACGME Compliant': compliant,
+            'Processing Phase': 'Phase 3 - Pyodide Enhanced'}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_spaces_requests_at_rate():
+    writer = load_writer()
+    clock = FakeClock()
+    bucket = writer.TokenBucket(5, clock=clock, sleep=clock.sleep)
+
+    times = []
+    for _ in range(6):
+        bucket.acquire()
+        times.append(round(clock.now, 6))
+    assert times == [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+def test_creates_in_packed_requests_and_keeps_order():
+    writer = load_writer()
+    records = [{'Faculty': [f'rec_fac_{index:03d}']} for index in range(25)]
+
+    with writer.AirtableStub(rate_limit=100) as stub:
+        result = writer.AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url, rate=100).create(records)
+        stored = stub.records('appTest', 'tblTest')
+        sizes = [request['records'] for request in stub.requests]
+
+    # Batches are sent concurrently, so they may reach the stub in any order
+    assert sorted(sizes) == [5, 10, 10]
+    assert result['requests'] == 3 and not result['failed']
+    assert [r['fields']['Faculty'] for r in result['records']] == [r['Faculty'] for r in records]
+    assert len(stored) == 25
+
+
+def test_retries_rate_limits_and_server_errors():
+    writer = load_writer()
+    records = [{'Faculty': [f'rec_fac_{index:03d}']} for index in range(60)]
+
+    # The writer runs ten times faster than the stub allows (no burst), and the
+    # first two requests fail
+    slept = []
+
+    def recording_sleep(seconds):
+        slept.append(seconds)
+        time.sleep(seconds)
+
+    with writer.AirtableStub(rate_limit=20, burst=1, fail_first=2) as stub:
+        bulk = writer.AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url, rate=200,
+                                         backoff_base=0.01, max_retries=20, seed=1,
+                                         sleep=recording_sleep)
+        result = bulk.create(records)
+        stored = stub.records('appTest', 'tblTest')
+
+    assert not result['failed']
+    assert result['statuses'][503] == 2 and result['statuses'][429] > 0
+    assert result['retries'] == result['requests'] - 6
+    assert len(stored) == 60
+
+    # Backoff goes through the injected sleep, full jitter below the exponential cap
+    assert len(result['backoffSeconds']) == result['retries']
+    assert all(delay in slept for delay in result['backoffSeconds'])
+
+
+def test_exhausted_retries_are_reported():
+    writer = load_writer()
+
+    with writer.AirtableStub(rate_limit=100, fail_rate=1.0) as stub:
+        bulk = writer.AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url, rate=100,
+                                         backoff_base=1.0, max_retries=2, seed=3, sleep=lambda seconds: None)
+        result = bulk.create([{'Faculty': ['rec_fac_001']}])
+
+    assert result['requests'] == 3
+    # Attempt n waits up to base * 2**n
+    assert [delay <= cap for delay, cap in zip(result['backoffSeconds'], [1.0, 2.0])] == [True, True]
+    assert result['failed'][0]['status'] == 503
+    assert result['failed'][0]['records'] == [{'fields': {'Faculty': ['rec_fac_001']}}]
+
+
+def test_phase3_workflow_packs_ten_records_per_request():
+    workflow = json.loads(PHASE3_PROCESSING_WORKFLOW.read_text())
+    nodes = {node['name']: node for node in workflow['nodes']}
+
+    assert 'Wait (Rate Limiting)' not in nodes
+    assert 'MAX_RECORDS_PER_REQUEST = 10' in nodes['Pack Airtable Batches']['parameters']['jsCode']
+    batching = nodes['Create Faculty Assignments']['parameters']['options']['batching']['batch']
+    assert batching == {'batchSize': 5, 'batchInterval': 1000}
+
+    # Failing batches are retried, then routed to the error output with their records
+    create = nodes['Create Faculty Assignments']
+    assert create['retryOnFail'] and create['maxTries'] > 1 and create['onError'] == 'continueErrorOutput'
+    error_output = workflow['connections']['Create Faculty Assignments']['main'][1]
+    assert error_output[0]['node'] == 'Failed Airtable Batches'
+
+
+def test_plan_diff_matches_by_key_and_content():
+    writer = load_writer()
+    existing = [
+        {'id': 'rec1', 'fields': assignment('hd1', 'fac1')},
+        # Airtable leaves unchecked checkboxes out of the record
+        {'id': 'rec2', 'fields': {k: v for k, v in assignment('hd2', 'fac1', compliant=False).items()
+                                  if k != 'ACGME Compliant'}},
+        {'id': 'rec3', 'fields': assignment('hd3', 'fac2')},
+        {'id': 'rec4', 'fields': assignment('hd3', 'fac2')},
+        {'id': 'rec5', 'fields': assignment('hd4', 'fac3')},
+        {'id': 'rec6', 'fields': dict(assignment('hd5', 'fac1'), Notes='kept')}
+    ]
+    desired = [
+        assignment('hd1', 'fac1'),
+        assignment('hd2', 'fac1', compliant=False),
+        assignment('hd3', 'fac2', supervision='indirect'),
+        assignment('hd4', 'fac4'),
+        assignment('hd5', 'fac1')
+    ]
+
+    plan = writer.plan_diff(desired, existing, KEY_FIELDS)
+
+    # Fields the desired records do not manage (Notes) are ignored
+    assert plan['unchanged'] == 3
+    assert plan['update'] == [{'id': 'rec3', 'fields': {'Supervision Type': 'indirect'}}]
+    assert plan['create'] == [assignment('hd4', 'fac4')]
+    # The duplicate from an earlier run and the key nothing wants any more
+    assert sorted(plan['delete']) == ['rec4', 'rec5']
+
+
+def test_rerun_sync_only_writes_changes():
+    writer = load_writer()
+    desired = [assignment(f'hd{index:03d}', f'fac{index % 7}') for index in range(120)]
+    phase3 = "{Processing Phase} = 'Phase 3 - Pyodide Enhanced'"
+
+    with writer.AirtableStub(rate_limit=100) as stub:
+        bulk = writer.AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url, rate=100)
+        first = bulk.sync(desired, KEY_FIELDS, phase3)
+
+        rerun = [dict(fields, **{'Supervision Type': 'indirect'}) if index in (5, 40) else fields
+                 for index, fields in enumerate(desired)]
+        rerun[77] = assignment('hd077', 'fac9')
+        del rerun[100]
+        before = len(stub.requests)
+        second = bulk.sync(rerun, KEY_FIELDS, phase3)
+        methods = [request['method'] for request in stub.requests[before:]]
+        stored = stub.records('appTest', 'tblTest')
+        third = bulk.sync(rerun, KEY_FIELDS, phase3)
+
+    assert first['created'] == 120 and first['requests'] == 1 + 12
+    assert (second['created'], second['updated'], second['deleted'], second['unchanged']) == (1, 2, 2, 116)
+    # Two list pages, then one request each for the creates, updates and deletes
+    assert sorted(methods) == ['DELETE', 'GET', 'GET', 'PATCH', 'POST']
+    assert sorted(writer.record_key(record['fields'], KEY_FIELDS) for record in stored) == \
+        sorted(writer.record_key(fields, KEY_FIELDS) for fields in rerun)
+    assert third['created'] + third['updated'] + third['deleted'] == 0 and third['requests'] == 2
+
+
+def test_sync_with_perform_upsert():
+    writer = load_writer()
+    desired = [{'Assignment Key': f'hd{index}|fac1', 'Supervision Type': 'direct'} for index in range(15)]
+
+    with writer.AirtableStub(rate_limit=100) as stub:
+        bulk = writer.AirtableBulkWriter('appTest', 'tblTest', 'key', api_url=stub.url, rate=100)
+        bulk.create(desired[:5])
+        result = bulk.sync(desired, ['Assignment Key'], merge_on=['Assignment Key'])
+        upserts = [request for request in stub.requests if request['method'] == 'PATCH']
+        stored = stub.records('appTest', 'tblTest')
+
+    assert (result['created'], result['unchanged']) == (10, 5)
+    assert len(upserts) == 1 and not result['failed']
+    assert sorted(record['fields']['Assignment Key'] for record in stored) == \
+        sorted(fields['Assignment Key'] for fields in desired)
+
+
+@pytest.mark.parametrize('path, key_fields', [
+    (PHASE3_PROCESSING_WORKFLOW, list(KEY_FIELDS)),
+    (PHASE4_WORKFLOW, ['Call Date', 'Call Type'])
+])
+def test_workflow_diff_node_matches_plan_diff(path, key_fields):
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+    writer = load_writer()
+    workflow = json.loads(path.read_text())
+    code = next(n for n in workflow['nodes'] if n['name'] == 'Diff Airtable Assignments')['parameters']['jsCode']
+    assert f'const KEY_FIELDS = {json.dumps(key_fields)};'.replace('"', "'") in code
+
+    def record(index, variant=''):
+        return {key_fields[0]: [f'key{index % 9}'], key_fields[1]: [f'other{index % 4}'],
+                'Supervision Type': variant or ('direct' if index % 3 else 'indirect'),
+                'Gap Days': index % 5, 'ACGME Compliant': index % 2 == 0}
+
+    desired = [record(index) for index in range(30)]
+    # Shifted by three (creates and deletes), two edited records (updates) and
+    # two duplicates of earlier runs (deletes); checkboxes read back unset
+    existing = [record(index) for index in range(3, 33)] + [record(4), record(8)]
+    existing[5]['Supervision Type'] = 'indirect' if existing[5]['Supervision Type'] == 'direct' else 'direct'
+    existing[6]['Gap Days'] = 99
+    existing = [{'id': f'rec{index:03d}', **{name: value for name, value in fields.items() if value is not False}}
+                for index, fields in enumerate(existing)]
+
+    script = (
+        f"const $ = () => ({{ all: () => {json.dumps([{'json': {'fields': f}} for f in desired])} }});\n"
+        f"const $input = {{ all: () => {json.dumps([{'json': e} for e in existing] + [{'json': {}}])} }};\n"
+        f"const run = () => {{\n{code}\n}};\n"
+        "console.log = () => {};\n"
+        "process.stdout.write(JSON.stringify(run().map(item => item.json)));\n"
+    )
+    operations = json.loads(subprocess.run(['node', '-e', script], capture_output=True, text=True,
+                                           check=True).stdout)
+
+    plan = writer.plan_diff(desired, [{'id': e['id'], 'fields': {k: v for k, v in e.items() if k != 'id'}}
+                                      for e in existing], key_fields)
+    assert [o['record']['fields'] for o in operations if o['op'] == 'create'] == plan['create']
+    assert [o['record'] for o in operations if o['op'] == 'update'] == plan['update']
+    assert sorted(o['id'] for o in operations if o['op'] == 'delete') == sorted(plan['delete'])
+    assert plan['unchanged'] > 0 and plan['update'] and plan['delete']
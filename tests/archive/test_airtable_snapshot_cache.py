@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the Airtable snapshot cache (airtable-snapshot-cache-python.py)
+Full scans, one delta query per table on refresh, local filter re-evaluation
+and the search nodes it mirrors, against the local Airtable stub
+"""
+
+import importlib.util
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CACHE_SCRIPT = REPO_ROOT / "airtable-snapshot-cache-python.py"
+PHASE_WORKFLOWS = {
+    'Phase 0': REPO_ROOT / "UPDATED-phase0-absence-loader.json",
+    'Phase 3': REPO_ROOT / "phase3-main-v4.json",
+    'Phase 7': REPO_ROOT / "workflows/archive/phase7-python-powered.json",
+    'Phase 8': REPO_ROOT / "workflows/archive/phase8-python-powered-orchestrator-compatible.json"
+}
+
+
+def load_cache():
+    spec = importlib.util.spec_from_file_location('airtable_snapshot_cache', CACHE_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def stub():
+    snapshots = load_cache()
+    with snapshots.airtable.AirtableStub(rate_limit=1000, field_ids=snapshots.FIELD_IDS) as server:
+        yield snapshots, server, snapshots.seed_synthetic_base(server, faculty_count=20, leave_count=150,
+                                                               assignment_count=400)
+
+
+def writer_factory(snapshots, server):
+    return lambda base_id, table: snapshots.airtable.AirtableBulkWriter(base_id, table, 'key',
+                                                                        api_url=server.url, rate=1000)
+
+
+def fresh_ids(snapshots, server, table, formula):
+    records = writer_factory(snapshots, server)(snapshots.BASE_ID, table).list_records(formula)
+    return sorted(record['id'] for record in records)
+
+
+def test_phase_fetches_match_workflow_search_nodes():
+    snapshots = load_cache()
+
+    for phase, fetches in snapshots.PHASE_FETCHES.items():
+        nodes = {n['name']: n for n in json.loads(PHASE_WORKFLOWS[phase].read_text())['nodes']}
+        for name, table, formula in fetches:
+            parameters = nodes[name]['parameters']
+            assert parameters['table']['value'] == table, name
+            assert parameters['filterByFormula'].lstrip('=') == formula, name
+            snapshots.airtable.compile_formula(formula, snapshots.FIELD_IDS)
+
+
+def test_one_run_scans_each_snapshot_once(stub, tmp_path):
+    snapshots, server, _ = stub
+    cache = snapshots.SnapshotCache(tmp_path, writer_factory(snapshots, server))
+
+    served = snapshots.prefetch(cache)
+    requests = cache.stats['requests']
+    again = cache.get(snapshots.BASE_ID, 'tblmgzodmqTsJ5inf', snapshots.ACTIVE_FACULTY)
+
+    distinct = {(table, formula) for fetches in snapshots.PHASE_FETCHES.values() for _, table, formula in fetches}
+    assert cache.stats['full'] == len(distinct)
+    assert cache.stats['requests'] == requests
+    assert again is served['Phase 0']['Fetch Active Faculty Reference']
+    assert served['Phase 3']['Fetch Faculty (Orchestrator)'] is again
+    # Inactive faculty are filtered server-side
+    assert len(again) == 18
+    assert len(list(tmp_path.glob('*.json.gz'))) == len(distinct)
+
+
+def test_rerun_refreshes_with_one_delta_per_table(stub, tmp_path):
+    snapshots, server, ids = stub
+    factory = writer_factory(snapshots, server)
+    snapshots.prefetch(snapshots.SnapshotCache(tmp_path, factory))
+
+    time.sleep(0.01)
+    leave = factory(snapshots.BASE_ID, 'tblJvewumPqMBl6Ut')
+    # Approves a leave (joins the Phase 0 filter), revokes another (leaves it), adds one
+    leave.update([{'id': ids['leave'][0], 'fields': {'Leave Approved Residency': True}},
+                  {'id': ids['leave'][1], 'fields': {'Leave Approved Army': False}}])
+    leave.create([{'Faculty': [ids['faculty'][2]], 'Leave Approved Residency': True, 'Leave Approved Army': True,
+                   'Leave Start': '2026-08-01', 'Leave End': '2026-08-02'}])
+    factory(snapshots.BASE_ID, 'tblmgzodmqTsJ5inf').update(
+        [{'id': ids['faculty'][3], 'fields': {'Faculty Status': 'Inactive'}}])
+
+    cache = snapshots.SnapshotCache(tmp_path, factory, overlap=0.0)
+    served = snapshots.prefetch(cache)
+
+    tables = {table for fetches in snapshots.PHASE_FETCHES.values() for _, table, _ in fetches}
+    assert (cache.stats['full'], cache.stats['delta'], cache.stats['requests']) == (0, len(tables), len(tables))
+    for phase, fetches in snapshots.PHASE_FETCHES.items():
+        for name, table, formula in fetches:
+            assert sorted(r['id'] for r in served[phase][name]) == fresh_ids(snapshots, server, table, formula), name
+
+
+def test_stale_snapshots_get_a_full_scan(stub, tmp_path):
+    snapshots, server, _ = stub
+    factory = writer_factory(snapshots, server)
+    table, formula = 'tblLUzjfad4B1GQ1a', "{Category} = 'Attending'"
+    first = snapshots.SnapshotCache(tmp_path, factory).get(snapshots.BASE_ID, table, formula)
+
+    # Deleting a record does not touch LAST_MODIFIED_TIME(), so only the full scan drops it
+    factory(snapshots.BASE_ID, table).delete([first[0]['id']])
+    delta = snapshots.SnapshotCache(tmp_path, factory)
+    assert len(delta.get(snapshots.BASE_ID, table, formula)) == len(first)
+    assert delta.stats['delta'] == 1
+
+    later = snapshots.SnapshotCache(tmp_path, factory, clock=lambda: time.time() + snapshots.MAX_AGE_SECONDS + 1)
+    assert len(later.get(snapshots.BASE_ID, table, formula)) == len(first) - 1
+    assert later.stats['full'] == 1
+
+
+def test_formula_subset():
+    airtable = load_cache().airtable
+    approved = airtable.compile_formula(
+        '=AND({Leave Approved Residency} = TRUE(), {Leave Approved Army} = TRUE(), '
+        '{Leave Start} != BLANK(), {Leave End} != BLANK())')
+    assert approved({'Leave Approved Residency': True, 'Leave Approved Army': True,
+                     'Leave Start': '2026-07-01', 'Leave End': '2026-07-02'})
+    assert not approved({'Leave Approved Army': True, 'Leave Start': '2026-07-01', 'Leave End': '2026-07-02'})
+
+    templates = airtable.compile_formula("=OR({Name} = 'TDY', {Name} = 'Leave AM')")
+    assert templates({'Name': 'TDY'}) and not templates({'Name': 'Clinic'})
+
+    changed = airtable.compile_formula("IS_AFTER(LAST_MODIFIED_TIME(), '2026-01-01T00:00:00.000Z')")
+    assert changed({}, modified=1.9e9) and not changed({}, modified=1.7e9)
+
+    with pytest.raises(airtable.FormulaError):
+        airtable.compile_formula("FIND('x', {Name})")
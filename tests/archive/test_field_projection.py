@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test the Airtable field projection manifest (field-projection-python.py)
+Workflow search nodes match the manifest, and the Phase 0, 3, 7 and 8
+engines read no field their search node leaves out
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import re
+import shutil
+import subprocess
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PROJECTION_SCRIPT = REPO_ROOT / "field-projection-python.py"
+PHASE3_SCRIPT = REPO_ROOT / "phase3-enhanced-faculty-assignment-python.py"
+ENVELOPES_SCRIPT = REPO_ROOT / "record-envelopes-python.py"
+
+# The Phase 0 Code node against projected records wrapped in a Proxy that
+# records reads of the fields each projection dropped
+PHASE0_HARNESS = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const unprojected = new Set();
+const items = input.records.map(({source, fields, hidden}) => ({json: new Proxy(fields, {
+  get(target, key) {
+    if (hidden.includes(key)) unprojected.add(`${source}\\u0000${key}`);
+    return target[key];
+  },
+  has(target, key) {
+    if (hidden.includes(key)) unprojected.add(`${source}\\u0000${key}`);
+    return key in target;
+  }
+})}));
+const $input = {all: () => items};
+const $ = () => ({first: () => ({json: {orchestratorId: 'projection-test', phaseNumber: 0}})});
+const write = text => process.stdout.write(text);
+console.log = () => {};
+const output = (() => {
+%s
+})();
+write(JSON.stringify({unprojected: [...unprojected], phaseData: output[0].json.phaseData}));
+"""
+
+
+def load_script(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_projection():
+    return load_script('field_projection', PROJECTION_SCRIPT)
+
+
+def node_code(projection, phase, node_name, key):
+    node = next(n for n in projection.load_workflow(phase)['nodes'] if n['name'] == node_name)
+    return node['parameters'][key]
+
+
+def projected_input(projection, audit, phase, base, nodes=None):
+    """Each search node's matches, projected and tagged, in merge order"""
+    envelopes = load_script('record_envelopes', ENVELOPES_SCRIPT)
+    fetched = projection.search(base, phase)
+    nodes = list(projection.PROJECTIONS[phase]) if nodes is None else nodes
+    return fetched, [record for node in nodes
+                     for record in envelopes.tag_records(audit.project(node, fetched[node]),
+                                                         projection.PROJECTIONS[phase][node][0])]
+
+
+class MockItem:
+    """n8n Python items expose their payload as an attribute"""
+    def __init__(self, data):
+        self.json = data
+
+
+def test_workflows_match_manifest():
+    projection = load_projection()
+
+    assert projection.check_workflows() == []
+    for phase, fetches in projection.PROJECTIONS.items():
+        for node, (_, fields) in fetches.items():
+            assert len(set(fields)) == len(fields), node
+
+
+def test_audit_flags_unprojected_reads():
+    projection = load_projection()
+    projections = {'Phase 7': {'Fetch Final Call Assignments': ('tbl15U9cF0uig9IEo', ('Faculty',))}}
+    audit = projection.ProjectionAudit('Phase 7', projections)
+    call, = audit.project('Fetch Final Call Assignments',
+                          [{'id': 'rec_call_1', 'Faculty': ['rec_fac_1'], 'Call Date': '2026-07-04', 'Notes': 'x'}])
+
+    assert dict(call) == {'id': 'rec_call_1', 'Faculty': ['rec_fac_1']}
+    assert call.get('Faculty') == ['rec_fac_1'] and 'Unknown Field' not in call
+    audit.check()
+
+    assert call.get('Call Date') is None
+    assert audit.violations() == {'Fetch Final Call Assignments': ['Call Date']}
+    with pytest.raises(projection.ProjectionError, match='Call Date'):
+        audit.check()
+
+
+def test_phase7_engine_reads_only_projected_fields():
+    projection = load_projection()
+    audit = projection.ProjectionAudit('Phase 7')
+    fetched, records = projected_input(projection, audit, 'Phase 7',
+                                       projection.synthetic_base(weeks=2, faculty_count=10, resident_count=6))
+
+    code = node_code(projection, 'Phase 7', 'Python Validation Engine', 'pythonCode')
+    code = code[:re.search(r'^return_value =', code, re.M).start()]
+    namespace = {'_get_input_all': lambda: [{'json': r} for r in records]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(code, namespace)
+
+    audit.check()
+    # Projected records still separate into the same record types
+    kinds = {'master': 'Fetch Final Master Assignments', 'faculty': 'Fetch Final Faculty Assignments',
+             'call': 'Fetch Final Call Assignments', 'active_faculty': 'Fetch Active Faculty Data',
+             'resident': 'Fetch Resident Data', 'primary_duty': 'Fetch Primary Duties'}
+    for kind, node in kinds.items():
+        assert len(namespace['records_by_type'][kind]) == len(fetched[node]) > 0, kind
+
+
+def test_phase8_engine_reads_only_projected_fields():
+    projection = load_projection()
+    audit = projection.ProjectionAudit('Phase 8')
+    start = date.today() + timedelta(days=7 - date.today().weekday())
+    fetched, records = projected_input(projection, audit, 'Phase 8',
+                                       projection.synthetic_base(start, weeks=2, faculty_count=8, resident_count=6))
+
+    code = node_code(projection, 'Phase 8', 'Python Emergency Coverage Engine', 'pythonCode')
+    code = code[:re.search(r'^return', code, re.M).start()]
+    namespace = {'_get_all_items': lambda: [MockItem(r) for r in records]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(code, namespace)
+
+    audit.check()
+    assert len(namespace['active_faculty']) == len(fetched['Fetch Active Faculty'])
+    assert len(namespace['faculty_leave']) == len(fetched['Fetch Faculty Leave Data'])
+    assert namespace['impact_analysis']['affected_assignments']
+
+
+@pytest.mark.parametrize('mode', ['Orchestrator', 'Standalone'])
+def test_phase3_engine_reads_only_projected_fields(mode):
+    projection = load_projection()
+    audit = projection.ProjectionAudit('Phase 3')
+    nodes = [node for node in projection.PROJECTIONS['Phase 3'] if node.endswith(f'({mode})')]
+    fetched, records = projected_input(projection, audit, 'Phase 3',
+                                       projection.synthetic_base(weeks=1, faculty_count=8, resident_count=4), nodes)
+
+    phase0 = {'absenceIndexFormat': 'interval-v1', 'facultyAbsenceIndex': {}, 'residentAbsenceIndex': {},
+              'facultyReference': {}}
+    items = [{'json': {'phase': 0, 'absence_data': phase0}}] + [{'json': r} for r in records]
+    namespace = {'_get_input_all': lambda: items}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(PHASE3_SCRIPT.read_text(), namespace)
+
+    audit.check()
+    assert len(namespace['master_assignments']) == len(fetched[nodes[0]]) > 0
+    assert len(namespace['faculty_data']) == len(fetched[nodes[1]])
+    assert len(namespace['clinic_templates']) == len(fetched[nodes[2]]) > 0
+
+
+def test_phase0_engine_reads_only_projected_fields():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    projection = load_projection()
+    audit = projection.ProjectionAudit('Phase 0')
+    fetched, records = projected_input(projection, audit, 'Phase 0',
+                                       projection.synthetic_base(weeks=2, faculty_count=10, resident_count=6))
+
+    script = PHASE0_HARNESS % node_code(projection, 'Phase 0', 'Phase 0: Absence Processing Engine', 'jsCode')
+    payload = json.dumps({'records': [{'source': r.source, 'fields': dict(r), 'hidden': sorted(r.hidden)}
+                                      for r in records]})
+    output = json.loads(subprocess.run(['node', '-e', script], input=payload, capture_output=True,
+                                       text=True, check=True).stdout)
+
+    audit.unprojected.update(tuple(read.split('\u0000')) for read in output['unprojected'])
+    audit.check()
+    phase_data = output['phaseData']
+    assert len(phase_data['facultyReference']) == len(fetched['Fetch Active Faculty Reference'])
+    assert len(phase_data['absenceTemplateReference']) == len(fetched['Fetch Absence Templates'])
+    assert phase_data['facultyAbsenceIndex'] and phase_data['residentAbsenceIndex']
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test the shared holiday calendar (holiday-calendar-python.py)
+Checks federal and observed dates, range coverage and that the copies embedded
+in Phase 4 and Phase 8 (and the Phase 9 JavaScript port) match the source
+"""
+
+import importlib.util
+import json
+import shutil
+import subprocess
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CALENDAR_SCRIPT = REPO_ROOT / "holiday-calendar-python.py"
+PHASE4_WORKFLOW = REPO_ROOT / "workflows/archive/phase4-python-powered.json"
+PHASE8_WORKFLOW = REPO_ROOT / "workflows/archive/phase8-python-powered-orchestrator-compatible.json"
+PHASE9_WORKFLOW = REPO_ROOT / "workflows/archive/phase9-excel-export-engine.json"
+EMBEDDED_COPIES = [
+    (PHASE4_WORKFLOW, "Python Call Scheduling Engine"),
+    (REPO_ROOT / "tests/archive/test_phase4_mock.py", None),
+    (PHASE8_WORKFLOW, "Python Emergency Coverage Engine")
+]
+
+BLOCK_START = '# SHARED HOLIDAY CALENDAR (source: holiday-calendar-python.py)'
+BLOCK_END = '# END SHARED HOLIDAY CALENDAR'
+JS_BLOCK_START = '// SHARED HOLIDAY CALENDAR (JavaScript port of holiday-calendar-python.py)'
+JS_BLOCK_END = '// END SHARED HOLIDAY CALENDAR'
+
+# OPM federal holiday schedule, including observed days
+FEDERAL_HOLIDAYS_2026 = [
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-05-25', '2026-06-19', '2026-07-03',
+    '2026-07-04', '2026-09-07', '2026-10-12', '2026-11-11', '2026-11-26', '2026-12-25'
+]
+
+
+def load_calendar():
+    spec = importlib.util.spec_from_file_location('holiday_calendar', CALENDAR_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def node_code(path, node_name, key):
+    workflow = json.loads(path.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == node_name)
+    return node['parameters'][key]
+
+
+def extract_block(source, start_marker, end_marker):
+    start = source.index(start_marker)
+    return source[start:source.index(end_marker, start)]
+
+
+def test_federal_and_observed_dates():
+    holidays = load_calendar()
+    calendar = holidays.HolidayCalendar(2026, 2026)
+
+    assert sorted(date.fromordinal(o).isoformat() for o in calendar.ordinals) == FEDERAL_HOLIDAYS_2026
+    assert calendar.name('2026-07-03') == 'Independence Day (observed)'
+    assert calendar.name(date(2026, 11, 26)) == 'Thanksgiving Day'
+    assert date(2026, 5, 25).toordinal() in calendar
+    assert not calendar.is_holiday('2026-07-06')
+
+
+def test_range_covers_observed_new_year():
+    holidays = load_calendar()
+
+    # New Year's Day 2028 is a Saturday, observed Friday Dec 31st 2027
+    calendar = holidays.HolidayCalendar.for_range('2027-12-01', '2027-12-31')
+    assert calendar.name('2027-12-31') == "New Year's Day (observed)"
+    assert calendar.covers('2027-12-01', '2027-12-30')
+    assert not holidays.HolidayCalendar(2027, 2027).covers('2027-12-01', '2027-12-31')
+
+
+def test_embedded_copies_match_source():
+    source_block = extract_block(CALENDAR_SCRIPT.read_text(), BLOCK_START, BLOCK_END)
+
+    for path, node_name in EMBEDDED_COPIES:
+        code = path.read_text() if node_name is None else node_code(path, node_name, 'pythonCode')
+        assert extract_block(code, BLOCK_START, BLOCK_END) == source_block, path.name
+
+
+def test_phase9_javascript_port_matches():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    js_block = extract_block(node_code(PHASE9_WORKFLOW, 'Phase 9: Excel Format Engine', 'jsCode'),
+                             JS_BLOCK_START, JS_BLOCK_END)
+    script = js_block + ('\nconsole.log(JSON.stringify([[...buildHolidayCalendar(2020, 2035)],\n'
+                         "  [...holidayCalendarForRange('2027-12-01', '2027-12-31')]]));\n")
+    output = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout
+
+    holidays = load_calendar()
+    calendars = [holidays.HolidayCalendar(2020, 2035), holidays.HolidayCalendar.for_range('2027-12-01', '2027-12-31')]
+    for entries, calendar in zip(json.loads(output), calendars):
+        assert dict(entries) == {date.fromordinal(o).isoformat(): name for o, name in calendar.names.items()}
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the Phase 1 hash-join pairing engine (Python twin)
+Validates deterministic tie-breaking, per-key stats and parity with the legacy scan
+"""
+
+import importlib.util
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE1_SCRIPT = REPO_ROOT / "phase1-smart-block-pairing-python.py"
+PHASE1_WORKFLOW = REPO_ROOT / "UPDATED-phase1-smart-block-pairing.json"
+
+# The Smart Pairing Engine node against mock input, printing its pairings
+PHASE1_HARNESS = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const $input = {all: () => input.map(json => ({json}))};
+const $ = () => ({first: () => ({json: {orchestratorId: 'pairing-test', phaseNumber: 1}})});
+const write = text => process.stdout.write(text);
+console.log = () => {};
+const output = (() => {
+%s
+})();
+write(JSON.stringify(output[0].json.pairings));
+"""
+
+
+def load_phase1():
+    spec = importlib.util.spec_from_file_location('phase1_pairing', PHASE1_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def create_mock_data():
+    half_days = [
+        {'id': 'rec_hd_001', 'HDoWoB ID': 1, 'Day of the Week of Block': 'Monday', 'Time of Day': 'AM'},
+        {'id': 'rec_hd_002', 'HDoWoB ID': 2, 'Day of the Week of Block': 'Monday', 'Time of Day': 'PM'},
+        {'id': 'rec_hd_003', 'HDoWoB ID': 3, 'Day of the Week of Block': 'Saturday', 'Time of Day': 'AM'},
+        {'id': 'rec_hd_004', 'HDoWoB ID': 4, 'Day of the Week of Block': 'Monday', 'Time of Day': 'AM'}
+    ]
+    templates = [
+        {'id': 'rec_tpl_b', 'Rotation Slot ID': 'slot_2', 'Day': 'Monday', 'Half-day': 'AM', 'Activity': 'Clinic B'},
+        {'id': 'rec_tpl_a', 'Rotation Slot ID': 'slot_1', 'Day': 'Monday', 'Half-day': 'AM', 'Activity': 'Clinic A'},
+        {'id': 'rec_tpl_c', 'Rotation Slot ID': 'slot_3', 'Day': 'Monday', 'Half-day': 'PM', 'Activity': 'Procedures'}
+    ]
+    return half_days, templates
+
+
+def test_tie_break_is_order_independent():
+    phase1 = load_phase1()
+    half_days, templates = create_mock_data()
+
+    pairings, _ = phase1.pair_half_days(half_days, templates)
+    reversed_pairings, _ = phase1.pair_half_days(half_days, list(reversed(templates)))
+
+    assert pairings == reversed_pairings
+    assert pairings[0]['templateId'] == 'rec_tpl_a'
+    assert pairings[0]['candidateTemplates'] == 2
+
+
+def test_key_stats():
+    phase1 = load_phase1()
+    half_days, templates = create_mock_data()
+
+    pairings, key_stats = phase1.pair_half_days(half_days, templates)
+
+    assert len(pairings) == 3
+    assert key_stats['Monday|AM'] == {'halfDays': 2, 'templates': 2, 'paired': 2}
+    assert key_stats['Monday|PM'] == {'halfDays': 1, 'templates': 1, 'paired': 1}
+    assert key_stats['Saturday|AM'] == {'halfDays': 1, 'templates': 0, 'paired': 0}
+
+
+def test_parity_with_linear_scan():
+    phase1 = load_phase1()
+    result = phase1.benchmark(2_000, template_count=50)
+
+    assert result['identicalPairings']
+    assert result['pairings'] > 0
+
+
+def create_numeric_slot_templates():
+    """Same-key templates whose Rotation Slot IDs sort differently as strings and numbers"""
+    slots = [10, '2', 'slot_1', '9.5', None, '-1']
+    return [{'id': f'rec_tpl_{index}', 'Rotation Slot ID': slot, 'Day': 'Monday', 'Half-day': 'AM',
+             'Activity': f'Clinic {index}'} for index, slot in enumerate(slots)]
+
+
+def test_numeric_slot_ids_compare_as_numbers():
+    phase1 = load_phase1()
+    templates = create_numeric_slot_templates()
+
+    ordered = phase1.build_template_index(templates)['Monday|AM']
+    assert [t['Rotation Slot ID'] for t in ordered] == ['-1', '2', '9.5', 10, None, 'slot_1']
+
+
+def test_javascript_node_matches_python_tie_break():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    phase1 = load_phase1()
+    half_days, _ = create_mock_data()
+    templates = create_numeric_slot_templates()
+    workflow = json.loads(PHASE1_WORKFLOW.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == 'Smart Pairing Engine')
+    # The node only picks up templates that have a Rotation Slot ID
+    templates = [t for t in templates if t['Rotation Slot ID'] is not None]
+
+    for order in (templates, list(reversed(templates))):
+        output = subprocess.run(['node', '-e', PHASE1_HARNESS % node['parameters']['jsCode']],
+                                input=json.dumps(half_days + order), capture_output=True, text=True,
+                                check=True).stdout
+        pairings, _ = phase1.pair_half_days(half_days, order)
+        assert [p['templateId'] for p in json.loads(output)] == [p['templateId'] for p in pairings]
+        assert pairings[0]['templateId'] == 'rec_tpl_5'
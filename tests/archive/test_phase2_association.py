@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the indexed Phase 2 Smart Association Engine (UPDATED-phase2-smart-resident-association.json)
+Block|resident joins, absence checks through the Phase 0 interval index and
+unmatched reporting, run under node
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE2_WORKFLOW = REPO_ROOT / "UPDATED-phase2-smart-resident-association.json"
+
+# The Smart Association Engine node against mock input, printing its output
+PHASE2_HARNESS = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const $input = {all: () => input.items.map(json => ({json}))};
+const $ = () => ({first: () => ({json: {orchestratorId: 'association-test', phaseNumber: 2,
+                                        globalState: {absenceData: input.absenceData}}})});
+const write = text => process.stdout.write(text);
+console.log = () => {};
+const output = (() => {
+%s
+})();
+write(JSON.stringify(output[0].json));
+"""
+
+
+def run_phase2(items, absence_data=None):
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    workflow = json.loads(PHASE2_WORKFLOW.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == 'Smart Association Engine')
+    payload = json.dumps({'items': items, 'absenceData': absence_data or {}})
+    output = subprocess.run(['node', '-e', PHASE2_HARNESS % node['parameters']['jsCode']], input=payload,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def create_mock_items():
+    schedules = [
+        {'id': 'rec_sched_1', 'Resident': ['rec_res_1', 'rec_res_2'], 'Block Number': 3, 'PGY Level': ['PGY-1']},
+        {'id': 'rec_sched_2', 'Resident': ['rec_res_3'], 'Block Number': '4', 'PGY Level': 'PGY-2'}
+    ]
+
+    def assignment(assignment_id, block, resident=None, day='2025-07-07', time_of_day='AM'):
+        record = {'id': assignment_id, 'fldHalfDayOfWeekBlocks': ['rec_hd_1'],
+                  'Block (from Half-Day of the Week of Blocks)': [block],
+                  'Date (from Half-Day of the Week of Blocks)': [day],
+                  'Time of Day (from Half-Day of the Week of Blocks)': [time_of_day]}
+        if resident:
+            record['Resident (from Residency Block Schedule)'] = [resident]
+        return record
+
+    assignments = [
+        assignment('rec_ma_1', 3, 'rec_res_2'),
+        assignment('rec_ma_2', 4, 'rec_res_3', time_of_day='PM'),
+        assignment('rec_ma_3', 3),
+        assignment('rec_ma_4', 3, 'rec_res_3'),
+        assignment('rec_ma_5', 5, 'rec_res_1')
+    ]
+    return assignments + schedules
+
+
+def test_linked_residents_join_by_block():
+    output = run_phase2(create_mock_items())
+
+    associations = {a['assignmentId']: a for a in output['associations']}
+    assert set(associations) == {'rec_ma_1', 'rec_ma_2'}
+    assert associations['rec_ma_1'] == {
+        'assignmentId': 'rec_ma_1', 'residentId': 'rec_res_2', 'pgyLevel': 'PGY-1', 'blockNumber': '3',
+        'scheduleRecordId': 'rec_sched_1', 'residentAvailable': True, 'absenceChecked': True}
+    # Numeric and text block numbers share one key
+    assert associations['rec_ma_2']['scheduleRecordId'] == 'rec_sched_2'
+
+
+def test_unlinked_assignments_are_reported_not_guessed():
+    output = run_phase2(create_mock_items())
+
+    assert output['unmatchedAssignments'] == [
+        {'assignmentId': 'rec_ma_3', 'blockNumber': '3', 'residentId': None,
+         'reason': 'No resident linked to assignment'},
+        {'assignmentId': 'rec_ma_4', 'blockNumber': '3', 'residentId': 'rec_res_3',
+         'reason': 'Linked resident not scheduled for block'},
+        {'assignmentId': 'rec_ma_5', 'blockNumber': '5', 'residentId': 'rec_res_1',
+         'reason': 'Linked resident not scheduled for block'}
+    ]
+    assert output['summary']['totalAssociations'] == 2
+    assert output['summary']['unmatchedAssignments'] == 3
+
+
+def test_absences_read_from_interval_index():
+    absence_data = {
+        'residentAbsenceIndex': {
+            'rec_res_2': {'intervals': [['2025-07-06', '2025-07-08', 'All Day', 0]],
+                          'records': [{'absenceType': 'Medical Leave'}]},
+            'rec_res_3': {'intervals': [['2025-07-07', '2025-07-07', 'AM', 0]],
+                          'records': [{'absenceType': 'Appointment'}]}
+        }
+    }
+    output = run_phase2(create_mock_items(), absence_data)
+
+    available = {a['assignmentId']: a['residentAvailable'] for a in output['associations']}
+    # rec_res_3 is only away in the morning; rec_ma_2 is an afternoon
+    assert available == {'rec_ma_1': False, 'rec_ma_2': True}
+    assert output['summary']['absenceConflicts'] == 1
+
+
+def test_legacy_daily_absence_map_fallback():
+    absence_data = {'residentAbsences': {'rec_res_2': {'2025-07-07': {'timeOfDay': 'All Day'}}}}
+    output = run_phase2(create_mock_items(), absence_data)
+
+    assert [a['residentAvailable'] for a in output['associations']] == [False, True]
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed indexes inside EnhancedFacultyAssignmentEngine
+Eligibility bitsets, availability and selection structures built once per run
+"""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE3_SCRIPT = REPO_ROOT / "phase3-enhanced-faculty-assignment-python.py"
+
+
+def load_phase3(items):
+    """Execute the Phase 3 script against mock n8n input and return its namespace."""
+    namespace = {'_get_input_all': lambda: items}
+    exec(PHASE3_SCRIPT.read_text(), namespace)
+    return namespace
+
+
+def tagged(table, records):
+    """Records with the envelope the "Tag ..." node after a search of table adds"""
+    return [dict(record, _source=table, _schema=1) for record in records]
+
+
+def create_mock_faculty(faculty_id, name, performs_procedure=False, weekdays=True):
+    return {
+        'id': faculty_id,
+        'Faculty': name,
+        'Last Name': name,
+        'Performs Procedure': performs_procedure,
+        'Available Monday': weekdays,
+        'Available Tuesday': weekdays,
+        'Available Wednesday': weekdays,
+        'Available Thursday': weekdays,
+        'Available Friday': True
+    }
+
+
+def create_mock_items(extra_items=None, phase0=None):
+    faculty = [
+        create_mock_faculty('rec4F7XQKFyDjXn5n', 'Tagawa', performs_procedure=True),
+        create_mock_faculty('rec_fac_002', 'Smith', performs_procedure=True),
+        create_mock_faculty('rec_fac_003', 'Jones'),
+        create_mock_faculty('rec_fac_004', 'Lee', weekdays=False)
+    ]
+    items = [{'json': {'phase': 0, 'absence_data': phase0 or {'facultyAbsenceIndex': {}}}}]
+    items += [{'json': f} for f in tagged('tblmgzodmqTsJ5inf', faculty)]
+    items += [{'json': item} for item in (extra_items or [])]
+    return items
+
+
+def test_eligibility_bitsets():
+    ns = load_phase3(create_mock_items())
+    engine = ns['assignment_engine']
+
+    clinic_mask, clinic_members = engine.get_eligible_faculty('clinic', None)
+    assert clinic_mask == 0b1111
+    assert [f['id'] for f in clinic_members] == ['rec4F7XQKFyDjXn5n', 'rec_fac_002', 'rec_fac_003', 'rec_fac_004']
+
+    procedure_mask, _ = engine.get_eligible_faculty('procedure', None)
+    assert procedure_mask == 0b0011
+
+    sports_mask, sports_members = engine.get_eligible_faculty('clinic', 'Sports Medicine')
+    assert sports_mask == 0b0001
+    assert [f['id'] for f in sports_members] == ['rec4F7XQKFyDjXn5n']
+
+    # Index is built once; lookups return the cached class
+    assert engine.get_eligible_faculty('clinic', None)[1] is clinic_members
+    assert [f['id'] for f in engine.faculty_from_mask(0b1010)] == ['rec_fac_002', 'rec_fac_004']
+
+
+def test_availability_matrix_matches_slow_path():
+    phase0 = {
+        'facultyAbsenceIndex': {
+            'rec_fac_002': {
+                'intervals': [['2025-07-08', '2025-07-10', 'All Day', 0]],
+                'records': [{'leaveType': 'TDY'}]
+            },
+            'rec_fac_003': {
+                'intervals': [['2025-07-09', '2025-07-09', 'PM', 0]],
+                'records': [{'leaveType': 'Personal Leave'}]
+            }
+        }
+    }
+    ns = load_phase3(create_mock_items(phase0=phase0))
+    engine = ns['assignment_engine']
+
+    expected = {}
+    for day in range(7, 15):
+        for slot in ('AM', 'PM'):
+            date_str = f'2025-07-{day:02d}'
+            expected[(date_str, slot)] = engine.available_faculty_mask(date_str, slot)
+
+    matrix = engine.build_availability_matrix('2025-07-07', '2025-07-14')
+    for (date_str, slot), mask in expected.items():
+        assert engine.available_faculty_mask(date_str, slot) == mask, (date_str, slot)
+
+    # Wednesday 2025-07-09: Smith on TDY, Jones out PM, Lee only works Fridays
+    assert engine.available_faculty_mask('2025-07-09', 'AM') == 0b0101
+    assert engine.available_faculty_mask('2025-07-09', 'PM') == 0b0001
+    assert engine.available_faculty_mask('2025-07-11', 'AM') == 0b1111
+    assert matrix.is_available(matrix.date_index('2025-07-11'), 0, 3)
+    assert matrix.date_index('2025-07-20') is None
+
+
+def test_selection_queue_matches_full_sort():
+    import random
+
+    ns = load_phase3(create_mock_items())
+    engine = ns['assignment_engine']
+    rng = random.Random(7)
+    class_mask, members = engine.get_eligible_faculty('clinic', None)
+
+    for _ in range(40):
+        available_mask = rng.randint(1, class_mask)
+        need = {'activity': 'General Clinic', 'specialtyRequirement': None}
+        half_day = {'date': '2025-07-11', 'timeOfDay': 'AM'}
+
+        expected = sorted(
+            (f for f in members if available_mask >> engine.faculty_bits[f['id']].bit_length() - 1 & 1
+             and engine.is_faculty_available(f['id'], '2025-07-11', 'AM')),
+            key=lambda f: engine.faculty_utilization(engine.faculty_bits[f['id']].bit_length() - 1)
+        )
+        selection = engine.select_optimal_faculty(members, need, half_day, class_mask & available_mask)
+
+        if not expected:
+            assert selection is None
+            continue
+        assert selection['faculty']['id'] == expected[0]['id']
+        engine.record_workload(selection['faculty']['id'], direct=rng.random() < 0.5)
+
+
+def create_solver_engine(ns, pool_supervision=False):
+    def faculty(faculty_id, name, procedures):
+        return {
+            'id': faculty_id,
+            'name': name,
+            'performsProcedures': procedures,
+            'availableDays': {day: True for day in ('monday', 'tuesday', 'wednesday', 'thursday', 'friday')},
+            'workloadCapacity': 2
+        }
+
+    lookup = {
+        'rec4F7XQKFyDjXn5n': faculty('rec4F7XQKFyDjXn5n', 'Tagawa', True),
+        'rec_fac_003': faculty('rec_fac_003', 'Jones', False)
+    }
+    engine = ns['EnhancedFacultyAssignmentEngine'](
+        lookup, {}, ns['SUPERVISION_RATIOS'], ns['SPECIALTY_REQUIREMENTS'],
+        pool_supervision=pool_supervision
+    )
+    engine.get_half_day_info = lambda half_day_id, assignment: {
+        'date': '2025-07-07', 'timeOfDay': 'AM', 'dayOfWeek': 'Monday'
+    }
+    engine.build_availability_matrix('2025-07-07', '2025-07-07')
+    return engine
+
+
+def test_flow_solver_closes_greedy_gaps():
+    ns = load_phase3(create_mock_items())
+    master_assignments = [
+        {
+            'id': f'rec_ma_{index}',
+            'Half-Day of the Week of Blocks': [f'rec_hd_{index}'],
+            'Resident (from Residency Block Schedule)': [f'rec_res_{index}'],
+            'PGY Link (from Residency Block Schedule)': ['PGY-2'],
+            'Activity (from Rotation Templates)': [activity]
+        }
+        for index, activity in enumerate(['General Clinic', 'General Clinic', 'Sports Medicine', 'Sports Medicine'])
+    ]
+
+    greedy = create_solver_engine(ns)
+    greedy.generate_all_assignments(master_assignments)
+    assert greedy.solver_report['coverageGaps'] == 1
+
+    flow = create_solver_engine(ns)
+    results = flow.generate_all_assignments(master_assignments, mode='flow', time_budget_seconds=10)
+    assert flow.solver_report['coverageGaps'] == 0
+    assert flow.solver_report['groupsSolved'] == 1
+    assert [r['facultyName'] for r in results] == ['Jones', 'Jones', 'Tagawa', 'Tagawa']
+
+
+def test_flow_solver_falls_back_to_greedy_on_timeout():
+    ns = load_phase3(create_mock_items())
+    master_assignments = [{
+        'id': 'rec_ma_0',
+        'Half-Day of the Week of Blocks': ['rec_hd_0'],
+        'Resident (from Residency Block Schedule)': ['rec_res_0'],
+        'PGY Link (from Residency Block Schedule)': ['PGY-1'],
+        'Activity (from Rotation Templates)': ['General Clinic']
+    }]
+
+    engine = create_solver_engine(ns)
+    results = engine.generate_all_assignments(master_assignments, mode='flow', time_budget_seconds=-1)
+    assert engine.solver_report['fellBackToGreedy']
+    assert engine.solver_report['groupsSolved'] == 0
+    assert len(results) == 1
+
+
+def test_flow_mode_compares_with_greedy_only_on_request():
+    def solver_summary(solver_config):
+        ns = load_phase3(create_mock_items(extra_items=[{'phase': 3, 'solver_config': solver_config}]))
+        return ns['summary']['solver']
+
+    assert solver_summary({'mode': 'flow'})['mode'] == 'flow'
+    assert 'greedyCoverageGaps' not in solver_summary({'mode': 'flow'})
+    assert solver_summary({'mode': 'flow', 'compareWithGreedy': True})['greedyCoverageGaps'] == 0
+
+
+def test_supervision_pooling_packs_residents_up_to_ratio():
+    ns = load_phase3(create_mock_items())
+    needs = [('PGY-2', 'General Clinic')] * 3 + [('PGY-1', 'General Clinic'), ('PGY-2', 'Sports Medicine')]
+    master_assignments = [
+        {
+            'id': f'rec_ma_{index}',
+            'Half-Day of the Week of Blocks': [f'rec_hd_{index}'],
+            'Resident (from Residency Block Schedule)': [f'rec_res_{index}'],
+            'PGY Link (from Residency Block Schedule)': [pgy_level],
+            'Activity (from Rotation Templates)': [activity]
+        }
+        for index, (pgy_level, activity) in enumerate(needs)
+    ]
+
+    engine = create_solver_engine(ns, pool_supervision=True)
+    results = engine.generate_all_assignments(master_assignments)
+
+    # PGY-2s share one faculty (1:4), the PGY-1 would cap that pool at 1:2 so
+    # it opens its own, and Sports Medicine stays with credentialed faculty
+    assert [r['residentIds'] for r in results] == [
+        ['rec_res_0', 'rec_res_1', 'rec_res_2'], ['rec_res_3'], ['rec_res_4']
+    ]
+    assert [r['supervisionType'] for r in results] == ['indirect', 'direct', 'indirect']
+    assert [r['facultyName'] for r in results] == ['Tagawa', 'Jones', 'Tagawa']
+    assert engine.solver_report['supervisionNeeds'] == 5
+    assert engine.solver_report['pooledNeeds'] == 3
+    assert engine.faculty_workload['rec4F7XQKFyDjXn5n']['totalAssignments'] == 2
+    assert engine.coverage_gaps == []
+
+
+def test_half_day_index_resolves_phase1_records():
+    half_days = tagged('tblTP62YOkF75o5aO', [
+        {'id': 'rec_hd_a', 'HDoWoB ID': 1, 'Date of Day of the Week of Block': '2025-07-09',
+         'Time of Day': 'PM', 'Day of the Week of Block': 'Wednesday', 'Block Number': [2]},
+        {'id': 'rec_hd_bad', 'HDoWoB ID': 2, 'Date of Day of the Week of Block': None, 'Time of Day': 'AM'}
+    ])
+    assignment, = tagged('tbl17gcDUtXc14Rjv', [{
+        'id': 'rec_ma_0',
+        'Half-Day of the Week of Blocks': ['rec_hd_a', 'rec_hd_b', 'rec_hd_missing'],
+        'Resident (from Residency Block Schedule)': ['rec_res_0'],
+        'PGY Link (from Residency Block Schedule)': ['PGY-2'],
+        'Activity (from Rotation Templates)': ['General Clinic'],
+        'Date (from Half-Day of the Week of Blocks)': ['2025-07-09', '2025-07-11'],
+        'Time of Day (from Half-Day of the Week of Blocks)': ['PM', 'AM']
+    }])
+    ns = load_phase3(create_mock_items(extra_items=half_days + [assignment]))
+    index = ns['half_day_index']
+    engine = ns['assignment_engine']
+
+    assert len(index) == 2
+    assert 'rec_hd_bad' not in index
+    assert index.info('rec_hd_a') == {
+        'date': '2025-07-09', 'dateOrdinal': index.ordinals[0],
+        'timeOfDay': 'PM', 'dayOfWeek': 'Wednesday', 'blockNumber': 2
+    }
+    # Filled in from the assignment's lookup fields
+    assert index.info('rec_hd_b')['dayOfWeek'] == 'Friday'
+    assert index.info('rec_hd_missing') is None
+
+    assert engine.get_half_day_info('rec_hd_b', assignment)['date'] == '2025-07-11'
+    assert engine.get_half_day_info('rec_hd_missing', assignment)['resolved'] is False
+    assert engine.unresolved_half_days == {'rec_hd_missing'}
+    assert ns['summary']['halfDayIndex'] == {'halfDays': 2, 'unresolvedHalfDays': 1}
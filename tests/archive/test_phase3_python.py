@@ -201,20 +201,21 @@ mock_phase1_data = {
     }
 }
 
-# Assemble all input items (simulating n8n merge node output)
+# Assemble all input items (simulating n8n merge node output), each Airtable
+# record with the envelope its "Tag ..." node adds
 all_input_items = []
 
 # Add master assignments
 for assignment in mock_master_assignments:
-    all_input_items.append({'json': assignment})
+    all_input_items.append({'json': dict(assignment, _source='tbl17gcDUtXc14Rjv', _schema=1)})
 
 # Add faculty data
 for faculty in mock_faculty_data:
-    all_input_items.append({'json': faculty})
+    all_input_items.append({'json': dict(faculty, _source='tblmgzodmqTsJ5inf', _schema=1)})
 
 # Add clinic templates
 for template in mock_clinic_templates:
-    all_input_items.append({'json': template})
+    all_input_items.append({'json': dict(template, _source='tblLUzjfad4B1GQ1a', _schema=1)})
 
 # Add Phase 0 data
 all_input_items.append({'json': {
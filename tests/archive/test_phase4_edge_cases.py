@@ -5,6 +5,7 @@ Tests boundary conditions, error handling, and special scenarios for call schedu
 """
 
 import json
+import math
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
@@ -310,6 +311,130 @@ def test_inactive_faculty_excluded():
 
     return active_got_calls and inactive_got_no_calls
 
+def test_incremental_equity_matches_recomputation():
+    """Test running equity totals against full recomputation on a large department"""
+    print("\n" + "="*60)
+    print("TEST 9: Incremental Equity Accounting")
+    print("="*60)
+
+    class RecomputingEngine(CallSchedulingEngine):
+        """Reference engine: recompute the mean and absence counts on every score"""
+        def calculate_equity_score(self, faculty_id: str) -> float:
+            avg_calls = sum(f['total_calls'] for f in self.faculty.values()) / len(self.faculty)
+            equity_score = self.faculty[faculty_id]['total_calls'] - avg_calls
+            return equity_score - len(self.absence_calendar.get(faculty_id, {})) * 0.1
+
+    today = datetime.now()
+    start_date = (today + timedelta(days=7 - today.weekday())).strftime('%Y-%m-%d')
+
+    faculty_data = [
+        {'id': f'rec_f{i:02d}', 'Faculty': f'Faculty{i}', 'Last Name': f'F{i}',
+         'Faculty Status': 'Active', 'Total Monday Call': i % 4, 'Total Tuesday Call': i % 3,
+         'Total Wednesday Call': 1, 'Total Thursday Call': i % 2, 'Total Friday Call': 2,
+         'Total Saturday Call': i % 5, 'Total Sunday Call': 0, 'Total Inpatient Weeks': 1}
+        for i in range(40)
+    ]
+    faculty_leave = [
+        {'id': f'rec_leave_{i}', 'Faculty': [f'rec_f{i:02d}'],
+         'Leave Start': (today + timedelta(days=3 * i)).isoformat(),
+         'Leave End': (today + timedelta(days=3 * i + i % 6)).isoformat(),
+         'Leave Type': 'TDY', 'Comments': 'Training'}
+        for i in range(0, 40, 3)
+    ]
+
+    config = {'minimum_gap_days': 3, 'weekend_weight': 1.5, 'holiday_weight': 2.0,
+              'max_calls_per_month': 8, 'debug_equity': True}
+
+    # debug_equity raises on any drift between running and recomputed scores
+    engine = CallSchedulingEngine(faculty_data, faculty_leave, config)
+    result = engine.generate_call_schedule(start_date, weeks=12)
+    reference = RecomputingEngine(faculty_data, faculty_leave, config).generate_call_schedule(start_date, weeks=12)
+
+    same_schedule = [a['faculty_id'] for a in result['assignments']] == \
+                    [a['faculty_id'] for a in reference['assignments']]
+    mean_matches = math.isclose(engine.mean_calls,
+                                sum(f['total_calls'] for f in engine.faculty.values()) / len(engine.faculty))
+
+    print(f"✓ Same schedule as full recomputation: {same_schedule}")
+    print(f"✓ Running mean matches: {mean_matches}")
+
+    assert same_schedule and mean_matches
+    return same_schedule and mean_matches
+
+def test_rolling_horizon_reduces_gap_violations():
+    """Test the rolling-horizon optimizer against greedy on a tight three-faculty rotation"""
+    print("\n" + "="*60)
+    print("TEST 10: Rolling-Horizon Optimizer")
+    print("="*60)
+
+    faculty_data = [
+        {'id': f'rec_f{i}', 'Faculty': f'Faculty{i}', 'Last Name': f'F{i}',
+         'Faculty Status': 'Active', 'Total Monday Call': 0}
+        for i in range(3)
+    ]
+    # One faculty away for three days forces the other two onto short gaps
+    faculty_leave = [
+        {'id': 'rec_leave_1', 'Faculty': ['rec_f0'],
+         'Leave Start': '2025-07-10', 'Leave End': '2025-07-12',
+         'Leave Type': 'Vacation', 'Comments': ''}
+    ]
+
+    def run(optimizer, horizon_days=7, beam_width=8):
+        config = {'minimum_gap_days': 3, 'weekend_weight': 1.5, 'holiday_weight': 2.0,
+                  'max_calls_per_month': 8, 'optimizer': optimizer,
+                  'horizon_days': horizon_days, 'beam_width': beam_width}
+        engine = CallSchedulingEngine(faculty_data, faculty_leave, config)
+        return engine.generate_call_schedule('2025-07-07', weeks=4)
+
+    greedy = run('greedy')
+    rolling = run('rolling_horizon')
+    # A one-day window with a single beam is the greedy rule
+    one_day = run('rolling_horizon', horizon_days=1, beam_width=1)
+
+    greedy_stats = greedy['statistics']
+    rolling_stats = rolling['statistics']
+    fewer_violations = rolling_stats['gap_violations'] < greedy_stats['gap_violations']
+    one_day_is_greedy = [a['faculty_id'] for a in one_day['assignments']] == \
+                        [a['faculty_id'] for a in greedy['assignments']]
+    full_coverage = len(rolling['assignments']) == 28
+
+    print(f"✓ Greedy gap violations: {greedy_stats['gap_violations']} ({greedy_stats['wall_time_seconds']}s)")
+    print(f"✓ Rolling-horizon gap violations: {rolling_stats['gap_violations']} "
+          f"(window {rolling_stats['horizon_days']}, beam {rolling_stats['beam_width']}, "
+          f"{rolling_stats['wall_time_seconds']}s)")
+    print(f"✓ Fewer gap violations: {fewer_violations}")
+    print(f"✓ One-day window matches greedy: {one_day_is_greedy}")
+
+    assert fewer_violations and one_day_is_greedy and full_coverage
+    return fewer_violations and one_day_is_greedy and full_coverage
+
+def test_observed_and_moving_holidays():
+    """Test that observed and moving federal holidays get the holiday weight"""
+    print("\n" + "="*60)
+    print("TEST 11: Observed & Moving Holidays")
+    print("="*60)
+
+    faculty_data = [
+        {'id': f'rec_f{i}', 'Faculty': f'Faculty{i}', 'Last Name': f'F{i}',
+         'Faculty Status': 'Active', 'Total Monday Call': 0}
+        for i in range(5)
+    ]
+    config = {'minimum_gap_days': 3, 'weekend_weight': 1.5, 'holiday_weight': 2.0, 'max_calls_per_month': 8}
+
+    # July 4th 2026 is a Saturday (observed Friday July 3rd); Thanksgiving is November 26th
+    july = CallSchedulingEngine(faculty_data, [], config).generate_call_schedule('2026-06-29', weeks=1)
+    november = CallSchedulingEngine(faculty_data, [], config).generate_call_schedule('2026-11-23', weeks=1)
+
+    holiday_dates = [a['date'] for a in july['assignments'] + november['assignments'] if a['is_holiday']]
+    weights = {a['date']: a['call_weight'] for a in july['assignments'] + november['assignments']}
+    expected = ['2026-07-03', '2026-07-04', '2026-11-26']
+    correct = holiday_dates == expected and all(weights[d] == 2.0 for d in expected)
+
+    print(f"✓ Holiday dates: {holiday_dates}")
+    print(f"✓ Observed and moving holidays weighted 2.0x: {correct}")
+
+    return correct
+
 def main():
     """Run all edge case tests"""
     print("="*60)
@@ -325,7 +450,10 @@ def main():
         ("Holiday Weighting", test_holiday_weighting),
         ("Substitution Handling", test_substitution_handling),
         ("Empty Faculty List", test_empty_faculty_list),
-        ("Inactive Faculty Exclusion", test_inactive_faculty_excluded)
+        ("Inactive Faculty Exclusion", test_inactive_faculty_excluded),
+        ("Incremental Equity Accounting", test_incremental_equity_matches_recomputation),
+        ("Rolling-Horizon Optimizer", test_rolling_horizon_reduces_gap_violations),
+        ("Observed & Moving Holidays", test_observed_and_moving_holidays)
     ]
 
     results = {}
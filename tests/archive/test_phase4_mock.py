@@ -5,9 +5,122 @@ This validates the call scheduling engine with equity management and absence awa
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
 import math
+import time
+
+# -----------------------------------------------------------------------------
+# SHARED HOLIDAY CALENDAR (source: holiday-calendar-python.py)
+# -----------------------------------------------------------------------------
+# Uses datetime date, timedelta and typing Optional, Union, imported at the
+# top of each file that carries this block
+
+# US federal holidays (5 U.S.C. 6103) as (name, month, rule). rule is the day
+# of the month for fixed-date holidays, or (weekday, n) for the nth weekday of
+# the month with n = -1 for the last one (weekday 0 = Monday).
+FEDERAL_HOLIDAY_RULES = (
+    ("New Year's Day", 1, 1),
+    ('Martin Luther King Jr. Day', 1, (0, 3)),
+    ("Washington's Birthday", 2, (0, 3)),
+    ('Memorial Day', 5, (0, -1)),
+    ('Juneteenth', 6, 19),
+    ('Independence Day', 7, 4),
+    ('Labor Day', 9, (0, 1)),
+    ('Columbus Day', 10, (0, 2)),
+    ('Veterans Day', 11, 11),
+    ('Thanksgiving Day', 11, (3, 4)),
+    ('Christmas Day', 12, 25)
+)
+
+
+def holiday_date(year: int, month: int, rule) -> date:
+    """Resolve a holiday rule to its actual date in year"""
+    if isinstance(rule, int):
+        return date(year, month, rule)
+
+    weekday, n = rule
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed_date(holiday: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday"""
+    if holiday.weekday() == 5:
+        return holiday - timedelta(days=1)
+    if holiday.weekday() == 6:
+        return holiday + timedelta(days=1)
+    return holiday
+
+
+class HolidayCalendar:
+    """
+    Holidays for first_year..last_year as a frozenset of date ordinals.
+
+    Both the actual and the observed date of a holiday are included (call on
+    the Saturday July 4th and on the Friday it is observed are both holiday
+    calls). Lookups accept ordinals, date objects or ISO date strings.
+    """
+
+    def __init__(self, first_year: int, last_year: int, rules=FEDERAL_HOLIDAY_RULES,
+                 include_observed: bool = True):
+        names = {}
+        for year in range(first_year, last_year + 1):
+            for name, month, rule in rules:
+                holiday = holiday_date(year, month, rule)
+                names.setdefault(holiday.toordinal(), name)
+                observed = observed_date(holiday)
+                if include_observed and observed != holiday:
+                    names.setdefault(observed.toordinal(), f'{name} (observed)')
+
+        self.first_year = first_year
+        self.last_year = last_year
+        self.names = names
+        self.ordinals = frozenset(names)
+
+    @classmethod
+    def for_range(cls, first_day, last_day, **kwargs) -> 'HolidayCalendar':
+        """Calendar covering two dates, plus the next year for a Dec 31 observed New Year's Day"""
+        first_year = date.fromordinal(cls.to_ordinal(first_day)).year
+        last_year = date.fromordinal(cls.to_ordinal(last_day)).year
+        return cls(first_year, last_year + 1, **kwargs)
+
+    @staticmethod
+    def to_ordinal(day: Union[int, date, str]) -> int:
+        if isinstance(day, int):
+            return day
+        if isinstance(day, date):
+            return day.toordinal()
+        return date.fromisoformat(day[:10]).toordinal()
+
+    def covers(self, first_day, last_day) -> bool:
+        """True when the calendar was built for every year between the two dates"""
+        # The day after last_day must be covered too: a Saturday New Year's Day
+        # is observed on Dec 31 of the previous year
+        return (self.first_year <= date.fromordinal(self.to_ordinal(first_day)).year and
+                date.fromordinal(self.to_ordinal(last_day) + 1).year <= self.last_year)
+
+    def is_holiday(self, day: Union[int, date, str]) -> bool:
+        return self.to_ordinal(day) in self.ordinals
+
+    def name(self, day: Union[int, date, str]) -> Optional[str]:
+        return self.names.get(self.to_ordinal(day))
+
+    def __contains__(self, day) -> bool:
+        return self.is_holiday(day)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+
+# -----------------------------------------------------------------------------
+# END SHARED HOLIDAY CALENDAR
+# -----------------------------------------------------------------------------
 
 # Mock data generator
 def create_mock_data():
@@ -126,16 +239,28 @@ def create_mock_data():
 class CallSchedulingEngine:
     """Advanced call scheduling with equity management and absence awareness"""
 
+    # Dates are handled internally as integer ordinals (date.toordinal());
+    # ISO strings are only produced for output records
+    DAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
     def __init__(self, faculty_list: List[Dict], leave_records: List[Dict],
-                 config: Dict):
+                 config: Dict, holiday_calendar: Optional[HolidayCalendar] = None):
         self.faculty = {f['id']: self._enhance_faculty_profile(f) for f in faculty_list}
         self.absence_calendar = self._process_absences(leave_records)
         self.config = config
+        self.holiday_calendar = holiday_calendar
         self.assignments = []
         self.faculty_last_call = {}
         self.substitutions = []
         self.gaps = []
 
+        # Incremental equity accounting (O(1) per assignment): running sum and
+        # mean of total_calls plus per-faculty absence day counts
+        self.total_calls_sum = sum(f['total_calls'] for f in self.faculty.values())
+        self.mean_calls = self.total_calls_sum / len(self.faculty) if self.faculty else 0.0
+        self.absence_counts = {fid: len(days) for fid, days in self.absence_calendar.items()}
+        self.debug_equity = config.get('debug_equity', False)
+
     def _enhance_faculty_profile(self, faculty: Dict) -> Dict:
         """Create enhanced faculty profile with call history"""
         return {
@@ -163,67 +288,72 @@ class CallSchedulingEngine:
             'is_active': faculty.get('Faculty Status', 'Active') != 'Inactive'
         }
 
-    def _process_absences(self, leave_records: List[Dict]) -> Dict[str, Dict[str, Dict]]:
-        """Process faculty leave into absence calendar"""
+    def _process_absences(self, leave_records: List[Dict]) -> Dict[str, Dict[int, Dict]]:
+        """Process faculty leave into absence calendar keyed by date ordinal"""
         calendar = {}
 
         for leave in leave_records:
             faculty_ids = leave.get('Faculty', [])
-            start = datetime.fromisoformat(leave['Leave Start'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(leave['Leave End'].replace('Z', '+00:00'))
-
-            current = start
-            while current <= end:
-                date_str = current.strftime('%Y-%m-%d')
+            start = datetime.fromisoformat(leave['Leave Start'].replace('Z', '+00:00')).date().toordinal()
+            end = datetime.fromisoformat(leave['Leave End'].replace('Z', '+00:00')).date().toordinal()
 
+            for day in range(start, end + 1):
                 for fac_id in faculty_ids:
                     if fac_id not in calendar:
                         calendar[fac_id] = {}
 
-                    calendar[fac_id][date_str] = {
+                    calendar[fac_id][day] = {
                         'leave_type': leave.get('Leave Type', 'Leave'),
                         'comments': leave.get('Comments', ''),
                         'replacement': leave.get('Comments', '') or 'Leave'
                     }
 
-                current += timedelta(days=1)
-
         return calendar
 
-    def is_faculty_available(self, faculty_id: str, date: str) -> bool:
+    def is_faculty_available(self, faculty_id: str, day: int) -> bool:
         """Check if faculty available for call on specific date"""
         if faculty_id not in self.faculty or not self.faculty[faculty_id]['is_active']:
             return False
 
         # Check absence calendar
         if faculty_id in self.absence_calendar:
-            if date in self.absence_calendar[faculty_id]:
+            if day in self.absence_calendar[faculty_id]:
                 return False
 
         return True
 
+    def record_call(self, faculty_id: str, call_weight: float):
+        """Add a call to a faculty total and update the running sum and mean"""
+        self.faculty[faculty_id]['total_calls'] += call_weight
+        self.total_calls_sum += call_weight
+        self.mean_calls = self.total_calls_sum / len(self.faculty)
+
     def calculate_equity_score(self, faculty_id: str) -> float:
         """Calculate equity score (lower is more fair to assign)"""
         faculty = self.faculty[faculty_id]
-        avg_calls = sum(f['total_calls'] for f in self.faculty.values()) / len(self.faculty)
-
-        equity_score = faculty['total_calls'] - avg_calls
+        equity_score = faculty['total_calls'] - self.mean_calls
 
         # Adjust for absences (faculty with more absences get lower scores)
-        absence_count = len(self.absence_calendar.get(faculty_id, {}))
-        equity_score -= (absence_count * 0.1)
+        equity_score -= (self.absence_counts.get(faculty_id, 0) * 0.1)
 
+        if self.debug_equity:
+            self._check_equity_score(faculty_id, equity_score)
         return equity_score
 
-    def calculate_gap_penalty(self, faculty_id: str, date: str) -> float:
+    def _check_equity_score(self, faculty_id: str, equity_score: float):
+        """Debug mode: compare the incremental score with a full recomputation"""
+        avg_calls = sum(f['total_calls'] for f in self.faculty.values()) / len(self.faculty)
+        expected = self.faculty[faculty_id]['total_calls'] - avg_calls
+        expected -= len(self.absence_calendar.get(faculty_id, {})) * 0.1
+        if not math.isclose(equity_score, expected, rel_tol=1e-9, abs_tol=1e-9):
+            raise RuntimeError(f"Equity drift for {faculty_id}: incremental {equity_score} != recomputed {expected}")
+
+    def calculate_gap_penalty(self, faculty_id: str, day: int) -> float:
         """Calculate penalty for gap violations (min 3 days between calls)"""
         if faculty_id not in self.faculty_last_call:
             return 0.0
 
-        last_call = datetime.fromisoformat(self.faculty_last_call[faculty_id])
-        current_date = datetime.fromisoformat(date)
-
-        days_between = (current_date - last_call).days
+        days_between = day - self.faculty_last_call[faculty_id]
 
         if days_between < self.config['minimum_gap_days']:
             # Exponential penalty for gap violations
@@ -231,11 +361,11 @@ class CallSchedulingEngine:
 
         return 0.0
 
-    def score_faculty_for_call(self, faculty_id: str, date: str, is_weekend: bool,
+    def score_faculty_for_call(self, faculty_id: str, day: int, is_weekend: bool,
                                 is_holiday: bool) -> float:
         """Calculate total score for assigning faculty to call (lower is better)"""
         # Gap penalty (70% weight)
-        gap_penalty = self.calculate_gap_penalty(faculty_id, date) * 0.7
+        gap_penalty = self.calculate_gap_penalty(faculty_id, day) * 0.7
 
         # Equity penalty (30% weight)
         equity_score = self.calculate_equity_score(faculty_id)
@@ -246,31 +376,32 @@ class CallSchedulingEngine:
 
         return gap_penalty + equity_penalty
 
-    def assign_call(self, date: str, day_of_week: str, is_weekend: bool,
-                   is_holiday: bool) -> Optional[Dict]:
-        """Assign call for specific date"""
+    def assign_call(self, day: int, day_of_week: str, is_weekend: bool,
+                   is_holiday: bool, planned_faculty: Optional[str] = None) -> Optional[Dict]:
+        """Assign call for specific date (given as a date ordinal), optionally to a planned faculty"""
         call_weight = (self.config['holiday_weight'] if is_holiday
                       else self.config['weekend_weight'] if is_weekend
                       else 1.0)
+        date_str = date.fromordinal(day).isoformat()
 
         # Get available faculty
         available = [fid for fid in self.faculty.keys()
-                    if self.is_faculty_available(fid, date)]
+                    if self.is_faculty_available(fid, day)]
 
         if not available:
             # Check for substitution opportunities
             absent_with_replacement = [
                 fid for fid in self.faculty.keys()
-                if fid in self.absence_calendar and date in self.absence_calendar[fid]
-                and self.absence_calendar[fid][date]['replacement']
+                if fid in self.absence_calendar and day in self.absence_calendar[fid]
+                and self.absence_calendar[fid][day]['replacement']
             ]
 
             if absent_with_replacement:
                 faculty_id = absent_with_replacement[0]
-                absence_info = self.absence_calendar[faculty_id][date]
+                absence_info = self.absence_calendar[faculty_id][day]
 
                 assignment = {
-                    'date': date,
+                    'date': date_str,
                     'day_of_week': day_of_week,
                     'faculty_id': faculty_id,
                     'faculty_name': self.faculty[faculty_id]['name'],
@@ -290,7 +421,7 @@ class CallSchedulingEngine:
 
             # No faculty available - create gap
             self.gaps.append({
-                'date': date,
+                'date': date_str,
                 'day_of_week': day_of_week,
                 'reason': 'All faculty absent',
                 'is_weekend': is_weekend,
@@ -300,23 +431,20 @@ class CallSchedulingEngine:
 
         # Score all available faculty
         scored = [
-            (fid, self.score_faculty_for_call(fid, date, is_weekend, is_holiday))
+            (fid, self.score_faculty_for_call(fid, day, is_weekend, is_holiday))
             for fid in available
         ]
         scored.sort(key=lambda x: x[1])
 
-        # Assign to best scoring faculty
-        faculty_id = scored[0][0]
-        penalty_score = scored[0][1]
+        # Assign to best scoring faculty (or the one chosen by the rolling-horizon planner)
+        faculty_id, penalty_score = next((s for s in scored if s[0] == planned_faculty), scored[0])
 
         gap_days = None
         if faculty_id in self.faculty_last_call:
-            last_call = datetime.fromisoformat(self.faculty_last_call[faculty_id])
-            current_date = datetime.fromisoformat(date)
-            gap_days = (current_date - last_call).days
+            gap_days = day - self.faculty_last_call[faculty_id]
 
         assignment = {
-            'date': date,
+            'date': date_str,
             'day_of_week': day_of_week,
             'faculty_id': faculty_id,
             'faculty_name': self.faculty[faculty_id]['name'],
@@ -331,38 +459,101 @@ class CallSchedulingEngine:
         }
 
         # Update state
-        self.faculty_last_call[faculty_id] = date
-        self.faculty[faculty_id]['total_calls'] += call_weight
+        self.faculty_last_call[faculty_id] = day
+        self.record_call(faculty_id, call_weight)
 
         self.assignments.append(assignment)
         return assignment
 
+    def _apply_path(self, path: List[Tuple[str, int, float]]) -> Tuple:
+        """Temporarily apply planned (faculty_id, day, call_weight) calls; returns the state to restore"""
+        saved = (self.total_calls_sum, self.mean_calls,
+                 {fid: (self.faculty[fid]['total_calls'], self.faculty_last_call.get(fid)) for fid, _, _ in path})
+        for faculty_id, day, call_weight in path:
+            self.faculty_last_call[faculty_id] = day
+            self.record_call(faculty_id, call_weight)
+        return saved
+
+    def _restore_state(self, saved: Tuple):
+        """Undo _apply_path exactly (restores the saved values rather than subtracting)"""
+        self.total_calls_sum, self.mean_calls, touched = saved
+        for faculty_id, (total_calls, last_call) in touched.items():
+            self.faculty[faculty_id]['total_calls'] = total_calls
+            if last_call is None:
+                self.faculty_last_call.pop(faculty_id, None)
+            else:
+                self.faculty_last_call[faculty_id] = last_call
+
+    def plan_call_window(self, window: List[Tuple[int, str, bool, bool]], beam_width: int) -> Optional[str]:
+        """
+        Rolling-horizon lookahead: beam search over the days in window, scoring
+        each path with score_faculty_for_call on the state left by the earlier
+        days of that path. Returns the faculty for the first day of the best
+        path (None when nobody is available that day).
+        """
+        beams = [(0.0, [])]
+        for day, _, is_weekend, is_holiday in window:
+            available = [fid for fid in self.faculty.keys() if self.is_faculty_available(fid, day)]
+            if not available:
+                continue
+            call_weight = (self.config['holiday_weight'] if is_holiday
+                          else self.config['weekend_weight'] if is_weekend
+                          else 1.0)
+
+            candidates = []
+            for cost, path in beams:
+                saved = self._apply_path(path)
+                for fid in available:
+                    score = self.score_faculty_for_call(fid, day, is_weekend, is_holiday)
+                    candidates.append((cost + score, path + [(fid, day, call_weight)]))
+                self._restore_state(saved)
+
+            candidates.sort(key=lambda c: c[0])
+            beams = candidates[:beam_width]
+
+        best_path = beams[0][1]
+        if best_path and best_path[0][1] == window[0][0]:
+            return best_path[0][0]
+        return None
+    
     def generate_call_schedule(self, start_date: str, weeks: int = 4) -> Dict:
         """Generate call schedule for specified period"""
         print(f"\n{'='*60}")
         print(f"Generating {weeks}-week call schedule starting {start_date}")
         print(f"{'='*60}")
 
-        start = datetime.fromisoformat(start_date)
-
-        for week in range(weeks):
-            for day in range(7):
-                current_date = start + timedelta(weeks=week, days=day)
-                date_str = current_date.strftime('%Y-%m-%d')
-                day_name = current_date.strftime('%A').lower()
-                is_weekend = day_name in ['saturday', 'sunday']
-                is_holiday = self._is_holiday(current_date)
-
-                result = self.assign_call(date_str, day_name, is_weekend, is_holiday)
-
-                if result:
-                    status = '[SUB]' if result.get('substitution_applied') else ''
-                    gap = f"(gap: {result.get('gap_days', 'N/A')})" if result.get('gap_days') is not None else ''
-                    print(f"✓ {date_str} ({day_name}): {result['faculty_name']} {status} {gap}")
-                else:
-                    print(f"✗ {date_str} ({day_name}): NO COVERAGE")
-
-            print(f"  Week {week + 1} complete\n")
+        optimizer = self.config.get('optimizer', 'greedy')
+        horizon_days = max(1, self.config.get('horizon_days', 7))
+        beam_width = max(1, self.config.get('beam_width', 8))
+        started = time.perf_counter()
+
+        start = datetime.fromisoformat(start_date).date().toordinal()
+        end = start + weeks * 7 - 1
+        if self.holiday_calendar is None or not self.holiday_calendar.covers(start, end):
+            self.holiday_calendar = HolidayCalendar.for_range(start, end)
+        holidays = self.holiday_calendar.ordinals
+        days = []
+        for day in range(start, start + weeks * 7):
+            day_name = self.DAY_NAMES[(day - 1) % 7]
+            days.append((day, day_name, day_name in ('saturday', 'sunday'), day in holidays))
+
+        for index, (day, day_name, is_weekend, is_holiday) in enumerate(days):
+            # Rolling horizon: plan the next horizon_days jointly, commit only today
+            planned_faculty = None
+            if optimizer == 'rolling_horizon':
+                planned_faculty = self.plan_call_window(days[index:index + horizon_days], beam_width)
+
+            result = self.assign_call(day, day_name, is_weekend, is_holiday, planned_faculty)
+
+            if result:
+                status = '[SUB]' if result.get('substitution_applied') else ''
+                gap = f"(gap: {result.get('gap_days', 'N/A')})" if result.get('gap_days') is not None else ''
+                print(f"✓ {result['date']} ({day_name}): {result['faculty_name']} {status} {gap}")
+            else:
+                print(f"✗ {date.fromordinal(day).isoformat()} ({day_name}): NO COVERAGE")
+
+            if (index + 1) % 7 == 0:
+                print(f"  Week {(index + 1) // 7} complete\n")
 
         # Calculate statistics
         stats = {
@@ -373,7 +564,11 @@ class CallSchedulingEngine:
             'coverage_rate': f"{(len(self.assignments) / (weeks * 7) * 100):.1f}%",
             'substitution_rate': f"{(len(self.substitutions) / max(len(self.assignments), 1) * 100):.1f}%",
             'gap_violations': sum(1 for a in self.assignments
-                                 if a.get('gap_days') and a['gap_days'] < self.config['minimum_gap_days'])
+                                 if a.get('gap_days') and a['gap_days'] < self.config['minimum_gap_days']),
+            'optimizer': optimizer,
+            'horizon_days': horizon_days if optimizer == 'rolling_horizon' else 1,
+            'beam_width': beam_width if optimizer == 'rolling_horizon' else 1,
+            'wall_time_seconds': round(time.perf_counter() - started, 4)
         }
 
         return {
@@ -387,15 +582,6 @@ class CallSchedulingEngine:
             ]
         }
 
-    def _is_holiday(self, date: datetime) -> bool:
-        """Check if date is a major holiday"""
-        return (
-            (date.month == 12 and date.day == 25) or  # Christmas
-            (date.month == 1 and date.day == 1) or     # New Year
-            (date.month == 7 and date.day == 4) or     # July 4th
-            (date.month == 11 and date.day == 11)      # Veterans Day
-        )
-
 def validate_results(result: Dict, mock_data: Dict, config: Dict) -> Dict:
     """Validate the Phase 4 results"""
 
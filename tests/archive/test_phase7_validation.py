@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test the aggregates, rule registry and incremental mode of Phase7Validator (Phase 7)
+Supervision, duty hour, Primary Duty and call coverage rules evaluated from
+aggregates built once per run, with per-rule timing; changesets rebuild only
+the partitions they touch
+"""
+
+import contextlib
+import io
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE7_WORKFLOW = REPO_ROOT / "workflows/archive/phase7-python-powered.json"
+
+
+def load_phase7(records):
+    """Execute the Phase 7 node (up to its returned value) against mock input."""
+    workflow = json.loads(PHASE7_WORKFLOW.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == 'Python Validation Engine')
+    code = node['parameters']['pythonCode']
+    code = code[:re.search(r'^return_value =', code, re.M).start()]
+
+    namespace = {'_get_input_all': lambda: [{'json': r} for r in records]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(code, namespace)
+    return namespace
+
+
+def tagged(table, records):
+    """Records with the envelope the "Tag ..." node after a search of table adds"""
+    return [dict(record, _source=table, _schema=1) for record in records]
+
+
+def create_mock_records():
+    records = tagged('tblmgzodmqTsJ5inf', [
+        {'id': 'rec_fac_001', 'Faculty': 'Dr. Smith', 'Last Name': 'Smith', 'Faculty Status': 'Active'}
+    ])
+    records += tagged('tbltYT3HMWxGCcCfo', [
+        {'id': 'rec_pd_1', 'Faculty': ['rec_fac_001'], 'Primary Duty': 'Core Faculty',
+         'Clinic Minimum Half-Days Per Week': 2, 'Clinic Maximum Half-Days Per Week': 4}
+    ])
+    records += tagged('tbl17gcDUtXc14Rjv', [
+        {'id': 'rec_ma_1', 'Resident (from Residency Block Schedule)': ['rec_res_1'],
+         'Half-Day of the Week of Blocks': ['rec_hd_1'], 'PGY Link (from Residency Block Schedule)': ['PGY-1']},
+        {'id': 'rec_ma_2', 'Resident (from Residency Block Schedule)': ['rec_res_2'],
+         'Half-Day of the Week of Blocks': ['rec_hd_1'], 'PGY Link (from Residency Block Schedule)': ['PGY-2']},
+        {'id': 'rec_ma_3', 'Resident (from Residency Block Schedule)': 'rec_res_1',
+         'Half-Day of the Week of Blocks': ['rec_hd_2'], 'PGY Link (from Residency Block Schedule)': ['PGY-1']}
+    ])
+    # Two clinics in the first week, one in the next
+    records += tagged('tbloGnXnu0mC6y83L', [
+        {'id': f'rec_fa_{index}', 'Faculty': ['rec_fac_001'], 'Attending Clinic Templates': ['Continuity Clinic'],
+         'Half-Day of the Week of Blocks': ['rec_hd_1'], 'Date (from Half-Day of the Week of Blocks)': [day]}
+        for index, day in enumerate(['2025-07-07', '2025-07-08', '2025-07-14'])])
+    records += tagged('tbl15U9cF0uig9IEo', [
+        {'id': f'rec_call_{day}', 'Call Date': f'2025-07-{day:02d}', 'Faculty': ['rec_fac_001']}
+        for day in (1, 2, 2, 4)])
+    return records
+
+
+def test_aggregates_group_residents_and_faculty_by_half_day():
+    validator = load_phase7(create_mock_records())['validator']
+    half_day = validator.aggregate('half_days')['rec_hd_1']
+
+    assert half_day['residents_by_pgy'] == {'PGY-1': {'rec_res_1'}, 'PGY-2': {'rec_res_2'}}
+    assert half_day['faculty'] == {'rec_fac_001'}
+    assert validator.aggregate('resident_weekly_hours') == {('rec_res_1', None): 16, ('rec_res_2', None): 8}
+
+    supervision = validator.validate_supervision_ratios()
+    assert (supervision['PGY-1']['supervised'], supervision['PGY-1']['totalAssignments']) == (1, 2)
+    assert not supervision['PGY-1']['compliant']
+    assert supervision['PGY-2']['compliant']
+    assert supervision['PGY-3']['totalAssignments'] == 0
+
+
+def test_primary_duties_checked_per_week():
+    validator = load_phase7(create_mock_records())['validator']
+
+    assert validator.aggregate('faculty_weekly_counts') == {
+        ('rec_fac_001', '2025-W28'): {'clinic': 2, 'sports': 0, 'gme': 0, 'dfm': 0},
+        ('rec_fac_001', '2025-W29'): {'clinic': 1, 'sports': 0, 'gme': 0, 'dfm': 0}
+    }
+    report = validator.validate_primary_duties()
+    assert report['violations'][0]['violations'] == [
+        {'type': 'clinic', 'issue': 'below minimum', 'required': 2, 'actual': 1, 'week': '2025-W29'}
+    ]
+
+
+def test_call_coverage():
+    namespace = load_phase7(create_mock_records())
+    coverage = namespace['validation_report']['callCoverage']
+
+    assert coverage == {'daysInRange': 4, 'uncoveredDates': ['2025-07-03'],
+                        'doubleBookedDates': ['2025-07-02'], 'compliant': False}
+
+
+def test_rule_engine_reports_each_rule_and_builds_aggregates_once():
+    namespace = load_phase7(create_mock_records())
+    validator = namespace['validator']
+    engine_report = namespace['validation_report']['ruleEngine']
+
+    assert [rule['rule'] for rule in engine_report['rules']] == [key for key, *_ in namespace['VALIDATION_RULES']]
+    violations = {rule['rule']: rule['violations'] for rule in engine_report['rules']}
+    assert violations == {'supervision': 1, 'dutyHours': 0, 'primaryDuties': 1, 'callCoverage': 2}
+    assert set(engine_report['aggregateSeconds']) == {
+        'half_days', 'pgy_supervision', 'resident_weekly_hours', 'faculty_weekly_counts', 'calls_by_date'}
+
+    # A new rule reuses the existing aggregates instead of rescanning records
+    built = dict(validator.aggregates)
+    validator.validate_unsupervised_half_days = lambda: {
+        'halfDays': sorted(hd_id for hd_id, hd in validator.aggregate('half_days').items() if not hd['supervised'])}
+    rule = ('unsupervisedHalfDays', 'validate_unsupervised_half_days', ('half_days',),
+            lambda section: len(section['halfDays']))
+    sections, rule_stats = validator.run_rules([rule])
+    assert sections['unsupervisedHalfDays'] == {'halfDays': ['rec_hd_2']}
+    assert rule_stats[0]['violations'] == 1
+    assert all(validator.aggregates[name] is built[name] for name in built)
+
+
+def strip_run_details(report):
+    return {key: value for key, value in report.items() if key not in ('timestamp', 'ruleEngine')}
+
+
+def test_revalidate_matches_full_validation():
+    records = create_mock_records()
+    validator = load_phase7(records)['validator']
+
+    # Supervise the second PGY-1 half-day, move a clinic, replace both rows of
+    # the double-booked rec_call_2 with one call and drop the call on the 4th
+    supervising, = tagged('tbloGnXnu0mC6y83L', [
+        {'id': 'rec_fa_3', 'Faculty': ['rec_fac_001'], 'Attending Clinic Templates': ['Admin'],
+         'Half-Day of the Week of Blocks': ['rec_hd_2'], 'Date (from Half-Day of the Week of Blocks)': ['2025-07-15']}])
+    moved = dict(records[5], **{'Date (from Half-Day of the Week of Blocks)': ['2025-07-15']})
+    single_call = dict(records[-2])
+    changeset = {'added': [supervising], 'modified': [moved, single_call], 'deleted': ['rec_call_4']}
+    report = validator.revalidate(changeset)
+
+    changed_ids = {record['id'] for record in changeset['added'] + changeset['modified']} | {'rec_call_4'}
+    fresh = [record for record in records if record['id'] not in changed_ids] + [supervising, moved, single_call]
+    assert strip_run_details(report) == strip_run_details(load_phase7(fresh)['validation_report'])
+    assert report['acgmeCompliance']['supervision']['PGY-1']['compliant']
+
+    incremental = report['ruleEngine']['incremental']
+    assert incremental['changedRecords'] == 4
+    assert incremental['rebuiltPartitions'] == {'half_days': 2, 'pgy_supervision': 1, 'resident_weekly_hours': 0,
+                                                'faculty_weekly_counts': 2, 'calls_by_date': 2}
+    assert [rule['rerun'] for rule in report['ruleEngine']['rules']] == [True, False, True, True]
+    assert report['callCoverage'] == {'daysInRange': 2, 'uncoveredDates': [], 'doubleBookedDates': [],
+                                      'compliant': True}
+
+
+def test_repeated_and_missing_ids_are_all_validated():
+    records = create_mock_records()
+    records += tagged('tbl15U9cF0uig9IEo', [{'Call Date': '2025-07-03', 'Faculty': ['rec_fac_001']}])
+    validator = load_phase7(records)['validator']
+
+    # Both rec_call_2 rows and the call without an ID count towards coverage
+    assert len(validator.call_assignments) == 5
+    assert validator.aggregate('calls_by_date')[date(2025, 7, 2).toordinal()] == 2
+    coverage = validator.validate_call_coverage()
+    assert (coverage['uncoveredDates'], coverage['doubleBookedDates']) == ([], ['2025-07-02'])
+
+
+def test_changeset_checked_before_it_is_applied():
+    validator = load_phase7(create_mock_records())['validator']
+    report = validator.generate_report()
+    call = {'Call Date': '2025-07-03', 'Faculty': ['rec_fac_001']}
+
+    for changeset, message in (({'added': [call]}, r"changeset\['added'\]\[0\] has no record ID"),
+                               ({'modified': [dict(call, id='')]}, r"changeset\['modified'\]\[0\] has no record ID"),
+                               ({'deleted': ['rec_call_1', None]}, r"changeset\['deleted'\]\[1\] is not a record ID"),
+                               ({'removed': ['rec_call_1']}, 'Unknown changeset keys')):
+        with pytest.raises(ValueError, match=message):
+            validator.revalidate(changeset)
+
+    # Nothing was applied
+    assert strip_run_details(validator.generate_report()) == strip_run_details(report)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test the assignment indexes, batch what-if mode and replacement candidate cache
+of EmergencyCoverageEngine (Phase 8)
+Person and (person, date) indexes built once per run, checked against a full scan
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import re
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PHASE8_WORKFLOW = REPO_ROOT / "workflows/archive/phase8-python-powered-orchestrator-compatible.json"
+
+
+class MockItem:
+    """n8n Python items expose their payload as an attribute"""
+    def __init__(self, data):
+        self.json = data
+
+
+def load_phase8(records):
+    """Execute the Phase 8 node (up to its top-level return) against mock input."""
+    workflow = json.loads(PHASE8_WORKFLOW.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == 'Python Emergency Coverage Engine')
+    code = node['parameters']['pythonCode']
+    code = code[:re.search(r'^return', code, re.M).start()]
+
+    namespace = {'_get_all_items': lambda: [MockItem(r) for r in records]}
+    with contextlib.redirect_stdout(io.StringIO()):
+        exec(code, namespace)
+    return namespace
+
+
+def tagged(table, records):
+    """Records with the envelope the "Tag ..." node after a search of table adds"""
+    return [dict(record, _source=table, _schema=1) for record in records]
+
+
+def create_mock_records(start):
+    people = ['rec_fac_001', 'rec_fac_002', 'rec_fac_003']
+    records = tagged('tblmgzodmqTsJ5inf', [{'id': p, 'Faculty': p, 'Last Name': p} for p in people])
+    records += tagged('tbl17gcDUtXc14Rjv', [
+        {'id': 'rec_ma_1', 'Half-Day of the Week of Blocks': ['rec_hd_1'],
+         'Resident (from Residency Block Schedule)': ['rec_fac_001', 'rec_fac_001'],
+         'Activity (from Rotation Templates)': ['FM Inpatient Team']},
+        {'id': 'rec_ma_2', 'Half-Day of the Week of Blocks': ['rec_hd_2'],
+         'Resident (from Residency Block Schedule)': ['rec_fac_002'],
+         'Activity (from Rotation Templates)': ['Continuity Clinic']}
+    ])
+    records += tagged('tbloGnXnu0mC6y83L', [
+        {'id': 'rec_fa_1', 'Faculty': 'rec_fac_001', 'Attending Clinic Templates': ['rec_tpl_1'],
+         'Activity (from Rotation Templates)': ['Continuity Clinic']}
+    ])
+    records += tagged('tbl15U9cF0uig9IEo', [
+        {'id': 'rec_call_1', 'Call Date': (start + timedelta(days=2)).isoformat(), 'Faculty': ['rec_fac_001']},
+        {'id': 'rec_call_2', 'Call Date': (start + timedelta(days=40)).isoformat(), 'Faculty': ['rec_fac_001']},
+        {'id': 'rec_call_3', 'Call Date': (start + timedelta(days=2)).isoformat(), 'Faculty': ['rec_fac_002']}
+    ])
+    return records
+
+
+def test_indexes_are_keyed_by_person_and_date():
+    start = date.today() + timedelta(days=7)
+    engine = load_phase8(create_mock_records(start))['engine']
+
+    # Duplicate link IDs and single-ID strings are indexed once
+    assert [a['id'] for a in engine.master_by_person['rec_fac_001']] == ['rec_ma_1']
+    assert [a['id'] for a in engine.faculty_by_person['rec_fac_001']] == ['rec_fa_1']
+    call_key = ('rec_fac_001', (start + timedelta(days=2)).isoformat())
+    assert [c['id'] for c in engine.calls_by_person_date[call_key]] == ['rec_call_1']
+    assert 'rec_fac_003' not in engine.master_by_person
+
+
+def test_impact_query_matches_full_scan():
+    start = date.today() + timedelta(days=7)
+    engine = load_phase8(create_mock_records(start))['engine']
+    end = start + timedelta(days=9)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        impact = engine.analyze_emergency_impact('rec_fac_001', start.isoformat(), end.isoformat(),
+                                                 'Deployment', 'faculty_deployment')
+
+    # Same result as scanning every record for every date: both records of the
+    # person on each day, and only the call that falls inside the window
+    dates = engine._expand_date_range(start.isoformat(), end.isoformat())
+    expected_assignments = [(assignment_id, day) for day in dates for assignment_id in ('rec_ma_1', 'rec_fa_1')]
+    assert [(a['assignment_id'], a['date']) for a in impact['affected_assignments']] == expected_assignments
+    assert [g['call_id'] for g in impact['call_schedule_gaps']] == ['rec_call_1']
+    assert len(impact['critical_service_gaps']) == len(dates)
+
+
+
+def test_holidays_reported_without_changing_criticality():
+    start = date.today() + timedelta(days=7)
+    namespace = load_phase8(create_mock_records(start))
+    engine = namespace['engine']
+    engine.holiday_calendar = namespace['HolidayCalendar'].for_range('2026-11-25', '2026-11-27')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        impact = engine.analyze_emergency_impact('rec_fac_001', '2026-11-25', '2026-11-27',
+                                                 'Deployment', 'faculty_deployment')
+
+    # Thanksgiving is named on its date, and clinic supervision stays HIGH
+    assert [(a['date'], a['holiday'], a['criticality']) for a in impact['affected_assignments']] == [
+        ('2026-11-25', None, 'CRITICAL'), ('2026-11-25', None, 'HIGH'),
+        ('2026-11-26', 'Thanksgiving Day', 'CRITICAL'), ('2026-11-26', 'Thanksgiving Day', 'HIGH'),
+        ('2026-11-27', None, 'CRITICAL'), ('2026-11-27', None, 'HIGH')]
+
+
+def test_batch_ranks_single_points_of_failure():
+    start = date.today() + timedelta(days=7)
+    namespace = load_phase8(create_mock_records(start))
+    engine = namespace['engine']
+    end = start + timedelta(days=9)
+
+    report = engine.simulate_unavailability_batch(start.isoformat(), end.isoformat(), include_pairs=True)
+
+    assert report['scenarios_evaluated'] == 6
+    ranking = report['ranking']
+    assert [r['rank'] for r in ranking] == list(range(1, 7))
+    assert ranking[0]['unavailable_person_ids'] == ['rec_fac_001', 'rec_fac_002']
+    assert ranking[-1]['unavailable_person_ids'] == ['rec_fac_003']
+
+    # Single-person scenarios match the one-at-a-time analysis
+    with contextlib.redirect_stdout(io.StringIO()):
+        impact = engine.analyze_emergency_impact('rec_fac_001', start.isoformat(), end.isoformat(), '', '')
+        plan = engine.find_replacement_options(impact['affected_assignments'], 'rec_fac_001')
+    single = next(r for r in ranking if r['unavailable_person_ids'] == ['rec_fac_001'])
+    assert single['impact_score'] == impact['total_impact_score']
+    assert single['critical_gaps'] == len(impact['critical_service_gaps'])
+    assert single['escalations'] == len(plan['escalations'])
+
+    # With rec_fac_003 on leave, losing both others leaves nobody to cover
+    records = create_mock_records(start) + tagged('tblJvewumPqMBl6Ut', [
+        {'id': 'rec_leave_1', 'Faculty': ['rec_fac_003'],
+         'Leave Start': start.isoformat(), 'Leave End': end.isoformat()}
+    ])
+    on_leave = load_phase8(records)['engine'].simulate_unavailability_batch(
+        start.isoformat(), end.isoformat(), include_pairs=True)
+    pair = next(r for r in on_leave['ranking'] if r['unavailable_person_ids'] == ['rec_fac_001', 'rec_fac_002'])
+    assert pair['escalations'] == pair['critical_gaps'] > 0
+    assert single['escalations'] == 0
+
+    # The node only runs the batch when BATCH_WHAT_IF is switched on
+    assert namespace['BATCH_WHAT_IF'] is False
+    assert namespace['single_point_of_failure_report'] is None
+
+
+def test_batch_forked_workers_match_in_process():
+    start = date.today() + timedelta(days=7)
+    engine = load_phase8(create_mock_records(start))['engine']
+    end = start + timedelta(days=9)
+
+    in_process = engine.simulate_unavailability_batch(start.isoformat(), end.isoformat(), include_pairs=True)
+    forked = engine.simulate_unavailability_batch(start.isoformat(), end.isoformat(), include_pairs=True, workers=2)
+    assert forked == in_process
+
+
+def test_batch_falls_back_in_process_when_a_worker_fails():
+    start = date.today() + timedelta(days=7)
+    engine = load_phase8(create_mock_records(start))['engine']
+    end = start + timedelta(days=9)
+    in_process = engine.simulate_unavailability_batch(start.isoformat(), end.isoformat())
+
+    parent = os.getpid()
+    simulate = engine._simulate_scenario
+
+    def fail_in_worker(scenario, dates):
+        if os.getpid() != parent:
+            raise RuntimeError('worker crashed')
+        return simulate(scenario, dates)
+
+    engine._simulate_scenario = fail_in_worker
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        forked = engine.simulate_unavailability_batch(start.isoformat(), end.isoformat(), workers=2)
+
+    assert forked == in_process
+    assert 'running 3 scenarios in-process' in output.getvalue()
+    assert multiprocessing.active_children() == []
+
+
+def test_replacement_candidates_memoized_and_invalidated_on_commit():
+    start = date.today() + timedelta(days=7)
+    day = start.isoformat()
+    records = create_mock_records(start)
+    records[2].update({'Performs Procedures': True})
+    engine = load_phase8(records)['engine']
+
+    procedure = engine._activity_class("['Procedure Clinic']")
+    options = engine._replacement_candidates(day, procedure, {'rec_fac_001'})
+    assert [o['faculty_id'] for o in options] == ['rec_fac_003', 'rec_fac_002']
+    assert options[0]['qualification'] == 'HIGHLY_QUALIFIED'
+
+    # Assignments with the same date and activity class reuse one cached list
+    cached = engine._candidates_by_date[day][procedure]
+    engine._replacement_candidates(day, procedure, {'rec_fac_002'})
+    assert engine._candidates_by_date[day][procedure] is cached
+
+    # A committed replacement is no longer offered on that date only
+    engine.commit_replacement('rec_fac_003', day)
+    assert day not in engine._candidates_by_date
+    assert [o['faculty_id'] for o in engine._replacement_candidates(day, procedure, {'rec_fac_001'})] == ['rec_fac_002']
+    next_day = (start + timedelta(days=1)).isoformat()
+    assert engine._replacement_candidates(next_day, procedure, set())[0]['faculty_id'] == 'rec_fac_003'
+    assert engine.audit_trail[-1]['action'] == 'replacement_committed'
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the shared record envelopes (record-envelopes-python.py)
+One-pass dispatch by source table and schema version, the "Tag ..." node
+after every search node, and that the copies embedded in Phases 3, 7 and 8
+(and the JavaScript ports in Phases 0, 3 and 9) match the source
+"""
+
+import importlib.util
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+ENVELOPES_SCRIPT = REPO_ROOT / "record-envelopes-python.py"
+PHASE7_WORKFLOW = REPO_ROOT / "workflows/archive/phase7-python-powered.json"
+PHASE8_WORKFLOW = REPO_ROOT / "workflows/archive/phase8-python-powered-orchestrator-compatible.json"
+EMBEDDED_COPIES = [
+    (REPO_ROOT / "phase3-enhanced-faculty-assignment-python.py", None),
+    (PHASE7_WORKFLOW, "Python Validation Engine"),
+    (PHASE8_WORKFLOW, "Python Emergency Coverage Engine")
+]
+JS_PORTS = [
+    (REPO_ROOT / "UPDATED-phase0-absence-loader.json", "Phase 0: Absence Processing Engine"),
+    (REPO_ROOT / "phase3-processing-subworkflow.json", "Pyodide Faculty Assignment Engine"),
+    (REPO_ROOT / "workflows/archive/phase9-excel-export-engine.json", "Phase 9: Excel Format Engine")
+]
+SEARCH_WORKFLOWS = [
+    REPO_ROOT / "UPDATED-phase0-absence-loader.json",
+    REPO_ROOT / "phase3-main-v4.json",
+    PHASE7_WORKFLOW,
+    PHASE8_WORKFLOW
+]
+
+BLOCK_START = '# SHARED RECORD ENVELOPES (source: record-envelopes-python.py)'
+BLOCK_END = '# END SHARED RECORD ENVELOPES'
+JS_BLOCK_START = '// SHARED RECORD ENVELOPES (JavaScript port of record-envelopes-python.py)'
+JS_BLOCK_END = '// END SHARED RECORD ENVELOPES'
+
+ROUTES = {'phase-0': 'phase0', 'tbl17gcDUtXc14Rjv': 'master', 'tblmgzodmqTsJ5inf': 'faculty'}
+
+
+def load_envelopes():
+    spec = importlib.util.spec_from_file_location('record_envelopes', ENVELOPES_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def node_code(path, node_name, key):
+    workflow = json.loads(path.read_text())
+    node = next(n for n in workflow['nodes'] if n['name'] == node_name)
+    return node['parameters'][key]
+
+
+def extract_block(source, start_marker, end_marker):
+    start = source.index(start_marker)
+    return source[start:source.index(end_marker, start)]
+
+
+def mixed_records(envelopes):
+    """Records whose fields would fool the old probes, plus one of each rejection"""
+    return ([{'phase': 0, 'absence_data': {}}]
+            # A faculty record that also carries a resident lookup, and a master
+            # assignment that carries Faculty and Last Name
+            + envelopes.tag_records([{'id': 'rec_fac_1', 'Faculty': 'Smith', 'Last Name': 'Smith',
+                                      'Resident (from Residency Block Schedule)': ['rec_res_1']}],
+                                    'tblmgzodmqTsJ5inf')
+            + envelopes.tag_records([{'id': 'rec_ma_1', 'Faculty': ['rec_fac_1'], 'Last Name': ['Smith']}],
+                                    'tbl17gcDUtXc14Rjv')
+            + [{'id': 'rec_untagged', 'Faculty': 'Jones', 'Last Name': 'Jones'},
+               {'id': 'rec_call_1', '_source': 'tbl15U9cF0uig9IEo', '_schema': 1},
+               {'id': 'rec_old', '_source': 'tbl17gcDUtXc14Rjv', '_schema': 0}])
+
+
+def test_dispatch_buckets_by_tag_not_shape():
+    envelopes = load_envelopes()
+    buckets, rejected = envelopes.dispatch_records(mixed_records(envelopes), ROUTES)
+
+    assert [r['id'] for r in buckets['faculty']] == ['rec_fac_1']
+    assert [r['id'] for r in buckets['master']] == ['rec_ma_1']
+    assert buckets['phase0'] == [{'phase': 0, 'absence_data': {}}]
+    assert [(reason, r['id']) for reason, r in rejected] == [
+        ('untagged', 'rec_untagged'), ('unrouted', 'rec_call_1'), ('schema', 'rec_old')]
+    # Every routed bucket exists even when nothing arrives for it
+    assert envelopes.dispatch_records([], ROUTES) == ({'phase0': [], 'master': [], 'faculty': []}, [])
+
+
+def test_embedded_copies_match_source():
+    source_block = extract_block(ENVELOPES_SCRIPT.read_text(), BLOCK_START, BLOCK_END)
+
+    for path, node_name in EMBEDDED_COPIES:
+        code = path.read_text() if node_name is None else node_code(path, node_name, 'pythonCode')
+        assert extract_block(code, BLOCK_START, BLOCK_END) == source_block, path.name
+
+
+def test_javascript_ports_match():
+    if shutil.which('node') is None:
+        pytest.skip('node is not installed')
+
+    blocks = [extract_block(node_code(path, name, 'jsCode'), JS_BLOCK_START, JS_BLOCK_END) for path, name in JS_PORTS]
+    assert all(block == blocks[0] for block in blocks)
+
+    envelopes = load_envelopes()
+    records = mixed_records(envelopes)
+    script = (blocks[0] + '\nconst input = JSON.parse(require("fs").readFileSync(0, "utf8"));\n'
+              'const {buckets, rejected} = dispatchRecords(input.records, input.routes);\n'
+              'console.log(JSON.stringify({buckets, rejected, schemas: TABLE_SCHEMAS}));\n')
+    output = json.loads(subprocess.run(['node', '-e', script], input=json.dumps({'records': records, 'routes': ROUTES}),
+                                       capture_output=True, text=True, check=True).stdout)
+
+    buckets, rejected = envelopes.dispatch_records(records, ROUTES)
+    assert output['buckets'] == buckets
+    assert [tuple(pair) for pair in output['rejected']] == rejected
+    assert output['schemas'] == envelopes.TABLE_SCHEMAS
+
+
+def test_every_search_node_is_tagged():
+    envelopes = load_envelopes()
+
+    for path in SEARCH_WORKFLOWS:
+        workflow = json.loads(path.read_text())
+        nodes = {n['name']: n for n in workflow['nodes']}
+        for node in workflow['nodes']:
+            if node['type'] != 'n8n-nodes-base.airtable' or node['parameters'].get('operation') != 'search':
+                continue
+            table = node['parameters']['table']['value']
+            assert table in envelopes.TABLE_SCHEMAS, node['name']
+
+            # The search feeds only its tag node, which feeds the search's old merge input
+            targets = workflow['connections'][node['name']]['main']
+            assert [[t['node'] for t in output] for output in targets] == [[f"Tag {node['name'][len('Fetch '):]}"]]
+            tag = nodes[targets[0][0]['node']]
+            assert tag['parameters']['jsCode'] == envelopes.tag_node_code(table), tag['name']
+            merge, = workflow['connections'][tag['name']]['main'][0]
+            assert nodes[merge['node']]['type'] == 'n8n-nodes-base.merge', tag['name']